@@ -2,11 +2,27 @@
 Módulos de binning y visualización para datos BRPC
 """
 from .agrupamiento_optimo import agrupamiento_optimo
+from .agrupamiento_multiple import agrupamiento_multiple, PlanAgrupamiento
+from .agrupador_optimo import AgrupadorOptimo
+from .anova_f import AnovaF, anova_f_streaming
 from .analisis_dataset import analisis_dataset
+from .analisis_dataset_streaming import analisis_dataset_streaming
+from .cargador import cargar_dataset, DatasetCacheado
+from .cache_etapas import CacheEtapas, huella
 from .candidatos_analizados import candidatos_analizados
+from .correlaciones import pares_correlacionados
+from .estabilidad import estabilidad_por_particion, psi, ResultadoEstabilidad
 from .feature_selection import seleccionar_representantes_clustervers
-from .pca_analisis import pca_analisis
-from .procesado_dataset import procesado_dataset
+from .monitor_deriva import MonitorDeriva
+from .instrumentacion import (instrumentar, instrumentacion_activa, activar, desactivar, medir_etapa,
+                              SumideroMemoria, SumideroJSONL)
+from .pca_analisis import pca_analisis, proyectar_pca
+from .pipeline import ejecutar_pipeline, ejecutar_grafo, Etapa
+from .procesado_dataset import procesado_dataset, Preprocessor
+from .procesado_dataset_streaming import procesado_dataset_streaming
+from .scorecard import Scorecard, TablaPuntuacion
 from .select_mejor_k import select_mejor_k
+from .varclus import VarClus
 from .varclushi_analisis import varclushi_analisis
-from .woe_iv import woe_iv
\ No newline at end of file
+from .woe_iv import woe_iv
+from .woe_iv_multiple import woe_iv_multiple
\ No newline at end of file
@@ -0,0 +1,57 @@
+"""
+Ejecución del flujo de selección de variables desde la línea de comandos.
+
+Uso (desde AAO):
+    python -m BRPC dataset.csv --salida resultados/ [--config config.json] [--hilos 4] [--instrumentar]
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+from typing import Optional, Sequence
+
+from .instrumentacion import SumideroJSONL, activar, desactivar
+from .pipeline import CONFIG_DEFECTO, ejecutar_pipeline
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m BRPC',
+                                     description='Flujo de selección de variables de BRPC (perfilado, '
+                                                 'procesado, IV, VarClus, SelectKBest, PCA y scorecard).')
+    parser.add_argument('dataset', help='CSV de entrada.')
+    parser.add_argument('--salida', required=True, help='Carpeta de los artefactos.')
+    parser.add_argument('--config', help=f'JSON con claves de {sorted(CONFIG_DEFECTO)}.')
+    parser.add_argument('--hilos', type=int, help='Etapas ejecutadas a la vez (por defecto, los núcleos).')
+    parser.add_argument('--instrumentar', action='store_true',
+                        help='Guarda tiempos por función en <salida>/instrumentacion.jsonl.')
+    parser.add_argument('--nivel-log', default='INFO')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=args.nivel_log.upper(), format='%(asctime)s %(name)s %(levelname)s %(message)s')
+
+    config = {}
+    if args.config:
+        with open(args.config, encoding='utf-8') as f:
+            config = json.load(f)
+    if args.hilos is not None:
+        config['n_hilos'] = args.hilos
+
+    if args.instrumentar:
+        os.makedirs(args.salida, exist_ok=True)
+        # Sin tracemalloc: su pico es global al proceso y las etapas se solapan en hilos
+        activar(SumideroJSONL(os.path.join(args.salida, 'instrumentacion.jsonl')), memoria=False)
+    try:
+        estado = ejecutar_pipeline(args.dataset, args.salida, config)
+    finally:
+        desactivar()
+
+    fallidas = [nombre for nombre, e in estado.items() if e['estado'] != 'ok']
+    if fallidas:
+        logging.getLogger('BRPC.pipeline').error("Etapas sin completar: %s", fallidas)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
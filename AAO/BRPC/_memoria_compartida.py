@@ -0,0 +1,79 @@
+import numpy as np
+from multiprocessing import shared_memory
+from typing import Optional, Tuple
+
+
+class MatrizCompartida:
+    """
+    Copia un array NumPy a un bloque de memoria compartida para que varios procesos
+    lo lean sin recibir cada uno una copia serializada.
+
+    Se usa como context manager: al salir se libera el bloque.
+
+    Args:
+        array (np.ndarray): Array a compartir (se copia una única vez).
+    """
+
+    def __init__(self, array: np.ndarray):
+        array = np.ascontiguousarray(array)
+        self._shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        self.array = np.ndarray(array.shape, dtype=array.dtype, buffer=self._shm.buf)
+        self.array[...] = array
+        # Descriptor ligero (nombre, forma, dtype) que se envía a los procesos hijos
+        self.descriptor = (self._shm.name, array.shape, array.dtype.str)
+
+    def cerrar(self):
+        self.array = None
+        self._shm.close()
+        self._shm.unlink()
+
+    def __enter__(self) -> 'MatrizCompartida':
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+
+def adjuntar_matriz(descriptor: Tuple[str, tuple, str]) -> Tuple[shared_memory.SharedMemory, np.ndarray]:
+    """
+    Abre desde un proceso hijo la matriz creada por `MatrizCompartida`.
+
+    Args:
+        descriptor (Tuple[str, tuple, str]): Atributo `descriptor` de la matriz compartida.
+
+    Returns:
+        Tuple[SharedMemory, np.ndarray]: El bloque (hay que mantener la referencia viva)
+        y una vista de solo lectura del array.
+    """
+    nombre, forma, dtype = descriptor
+    try:
+        shm = shared_memory.SharedMemory(name=nombre, track=False)
+    except TypeError:
+        # Python < 3.13: al adjuntar, el hijo registraría el bloque en el
+        # resource_tracker y lo liberaría al terminar; solo el padre debe hacerlo.
+        from multiprocessing import resource_tracker
+        registrar = resource_tracker.register
+        resource_tracker.register = lambda *args, **kwargs: None
+        try:
+            shm = shared_memory.SharedMemory(name=nombre)
+        finally:
+            resource_tracker.register = registrar
+    array = np.ndarray(forma, dtype=np.dtype(dtype), buffer=shm.buf)
+    array.flags.writeable = False
+    return shm, array
+
+
+# Matriz adjuntada en cada proceso del pool (se inicializa una vez por proceso)
+_SHM: Optional[shared_memory.SharedMemory] = None
+_MATRIZ: Optional[np.ndarray] = None
+
+
+def inicializar_proceso(descriptor: Tuple[str, tuple, str]):
+    """Inicializador de `ProcessPoolExecutor`: adjunta la matriz compartida al proceso."""
+    global _SHM, _MATRIZ
+    _SHM, _MATRIZ = adjuntar_matriz(descriptor)
+
+
+def matriz_proceso() -> np.ndarray:
+    """Devuelve la matriz compartida adjuntada por `inicializar_proceso`."""
+    return _MATRIZ
@@ -0,0 +1,229 @@
+import json
+import pandas as pd
+import numpy as np
+from typing import Dict, List, Optional, Sequence
+
+from .agrupamiento_optimo import _codificar, _cortes_respaldo, _validar_formato, _validar_metodo
+from .agrupamiento_multiple import _cortes_multiple
+from .cargador import DatasetCacheado, _como_dataframe
+from .instrumentacion import instrumentar
+
+
+class AgrupadorOptimo:
+    """
+    Binning óptimo reutilizable: `fit` aprende los puntos de corte de cada variable con el mismo
+    algoritmo que `agrupamiento_optimo` y `transform` los aplica a datos nuevos sin reajustar.
+
+    Cada variable se codifica con enteros pequeños: el código 0 es 'Missing' y el código i
+    corresponde al bin i-ésimo ('Bin_i'). Los cortes se aplican con `np.searchsorted` sobre
+    intervalos cerrados por la derecha, igual que `pd.cut`.
+
+    Args:
+        max_bins (int): Número máximo de bins a crear.
+        min_bins (int): Número mínimo de bins a crear.
+        n_jobs (int, optional): Procesos usados en `fit` (ver `agrupamiento_multiple`).
+        metodo (str): Algoritmo de cortes, 'arbol' o 'dp' (ver `agrupamiento_optimo`).
+        monotonico (str, optional): Restricción de WoE monótono (solo con metodo='dp').
+
+    Attributes:
+        features_ (List[str]): Variables ajustadas, en orden.
+        cortes_ (Dict[str, np.ndarray]): Umbrales internos de cada variable.
+        etiquetas_ (Dict[str, List[str]]): Etiqueta de cada código (posición 0 = 'Missing').
+    """
+
+    def __init__(self, max_bins: int = 10, min_bins: int = 3, n_jobs: Optional[int] = None,
+                 metodo: str = 'arbol', monotonico: Optional[str] = None):
+        _validar_metodo(metodo, monotonico)
+        self.max_bins = max_bins
+        self.min_bins = min_bins
+        self.n_jobs = n_jobs
+        self.metodo = metodo
+        self.monotonico = monotonico
+
+    @instrumentar
+    def fit(self, df: pd.DataFrame, features: Sequence[str], target: str) -> 'AgrupadorOptimo':
+        """
+        Aprende los cortes de cada variable.
+
+        Args:
+            df (pd.DataFrame): DataFrame de entrenamiento.
+            features (Sequence[str]): Columnas numéricas a discretizar.
+            target (str): Nombre de la columna objetivo.
+
+        Returns:
+            AgrupadorOptimo: El propio objeto ajustado.
+        """
+        df = _como_dataframe(df)
+        features = [f for f in features if f != target]
+        no_numericas = [f for f in features if not pd.api.types.is_numeric_dtype(df[f])]
+        if no_numericas:
+            raise ValueError(f"AgrupadorOptimo solo admite columnas numéricas: {no_numericas}")
+
+        estados = _cortes_multiple(df, features, target, self.max_bins, self.min_bins, self.n_jobs,
+                                   self.metodo, self.monotonico)
+
+        self.target_ = target
+        self.features_ = features
+        self.cortes_: Dict[str, np.ndarray] = {}
+        self.etiquetas_: Dict[str, List[str]] = {}
+
+        for feature, (estado, umbrales) in zip(features, estados):
+            if estado == 'error':
+                # Mismo respaldo que la función serial (qcut o cortes equidistantes)
+                umbrales, etiquetas = _cortes_respaldo(df[feature], self.max_bins)
+            else:
+                # Sin filas válidas no hay cortes: todo valor observado cae en un único bin
+                umbrales = umbrales or []
+                etiquetas = [f'Bin_{i+1}' for i in range(len(umbrales) + 1)]
+
+            self.cortes_[feature] = np.asarray(umbrales, dtype=np.float64)
+            self.etiquetas_[feature] = ['Missing'] + etiquetas
+
+        return self
+
+    @property
+    def n_bins_(self) -> Dict[str, int]:
+        """Número de bins de cada variable (sin contar 'Missing')."""
+        return {f: len(self.cortes_[f]) + 1 for f in self.features_}
+
+    def _dtype_codigos(self) -> np.dtype:
+        max_codigo = max((len(c) + 1 for c in self.cortes_.values()), default=0)
+        return np.dtype(np.int8) if max_codigo <= np.iinfo(np.int8).max else np.dtype(np.int16)
+
+    @instrumentar
+    def transform_codigos(self, datos) -> np.ndarray:
+        """
+        Asigna a cada valor el código de su bin.
+
+        Args:
+            datos (pd.DataFrame | DatasetCacheado | np.ndarray): DataFrame o dataset cacheado con
+                las columnas `features_`, o matriz (filas x variables) con las columnas en el
+                orden de `features_`.
+
+        Returns:
+            np.ndarray: Matriz de códigos (filas x variables), con 0 para los nulos.
+        """
+        if isinstance(datos, DatasetCacheado):
+            datos = datos.matriz(self.features_)
+        if isinstance(datos, pd.DataFrame):
+            datos = datos[self.features_].to_numpy(dtype=np.float64)
+        else:
+            datos = np.asarray(datos, dtype=np.float64)
+
+        codigos = np.empty(datos.shape, dtype=self._dtype_codigos())
+        for j, feature in enumerate(self.features_):
+            codigos[:, j] = _codificar(datos[:, j], self.cortes_[feature])
+
+        return codigos
+
+    @instrumentar
+    def transform(self, df: pd.DataFrame, formato: str = 'texto') -> pd.DataFrame:
+        """
+        Discretiza las variables devolviendo las mismas etiquetas que `agrupamiento_optimo`.
+
+        Args:
+            df (pd.DataFrame): DataFrame con las columnas `features_`.
+            formato (str): 'texto' (por defecto) o 'categorico' (`pd.Categorical` sobre los
+                mismos códigos, sin crear una cadena por fila).
+
+        Returns:
+            pd.DataFrame: Una columna de etiquetas por variable, con el índice de `df`.
+        """
+        df = _como_dataframe(df)
+        _validar_formato(formato)
+        codigos = self.transform_codigos(df)
+        if formato == 'categorico':
+            agrupados = {
+                feature: pd.Categorical.from_codes(codigos[:, j], categories=self.etiquetas_[feature])
+                for j, feature in enumerate(self.features_)
+            }
+            return pd.DataFrame(agrupados, index=df.index)
+
+        agrupados = {
+            feature: np.asarray(self.etiquetas_[feature], dtype=object).take(codigos[:, j])
+            for j, feature in enumerate(self.features_)
+        }
+        return pd.DataFrame(agrupados, index=df.index)
+
+    def fit_transform(self, df: pd.DataFrame, features: Sequence[str], target: str) -> pd.DataFrame:
+        return self.fit(df, features, target).transform(df)
+
+    def seleccionar(self, features: Sequence[str]) -> 'AgrupadorOptimo':
+        """
+        Agrupador con los cortes de un subconjunto de variables, sin reajustar.
+
+        Args:
+            features (Sequence[str]): Variables a conservar, en el orden deseado.
+
+        Returns:
+            AgrupadorOptimo: Nuevo agrupador ajustado solo con esas variables.
+        """
+        features = list(features)
+        faltan = [f for f in features if f not in self.cortes_]
+        if faltan:
+            raise ValueError(f"El agrupador no tiene cortes para: {faltan}")
+
+        agrupador = AgrupadorOptimo(self.max_bins, self.min_bins, self.n_jobs, self.metodo, self.monotonico)
+        agrupador.target_ = self.target_
+        agrupador.features_ = features
+        agrupador.cortes_ = {f: self.cortes_[f] for f in features}
+        agrupador.etiquetas_ = {f: self.etiquetas_[f] for f in features}
+        return agrupador
+
+    def _a_arrays(self) -> Dict[str, np.ndarray]:
+        """Cortes, etiquetas y parámetros como arrays planos para `np.savez`."""
+        cortes = [self.cortes_[f] for f in self.features_]
+        etiquetas = [e for f in self.features_ for e in self.etiquetas_[f]]
+        meta = {'target': self.target_, 'max_bins': self.max_bins, 'min_bins': self.min_bins,
+                'metodo': self.metodo, 'monotonico': self.monotonico}
+        return {
+            'features': np.asarray(self.features_, dtype=str),
+            'cortes': np.concatenate(cortes) if cortes else np.empty(0),
+            'n_cortes': np.asarray([len(c) for c in cortes], dtype=np.int64),
+            'etiquetas': np.asarray(etiquetas, dtype=str),
+            'meta': np.asarray(json.dumps(meta))
+        }
+
+    @classmethod
+    def _desde_arrays(cls, datos) -> 'AgrupadorOptimo':
+        """Inversa de `_a_arrays` (acepta el objeto de `np.load`)."""
+        meta = json.loads(str(datos['meta']))
+        agrupador = cls(max_bins=meta['max_bins'], min_bins=meta['min_bins'],
+                        metodo=meta.get('metodo', 'arbol'), monotonico=meta.get('monotonico'))
+        agrupador.target_ = meta['target']
+        agrupador.features_ = datos['features'].tolist()
+        agrupador.cortes_ = {}
+        agrupador.etiquetas_ = {}
+
+        inicio_cortes, inicio_etiquetas = 0, 0
+        cortes, etiquetas = datos['cortes'], datos['etiquetas'].tolist()
+        for feature, n in zip(agrupador.features_, datos['n_cortes']):
+            agrupador.cortes_[feature] = cortes[inicio_cortes:inicio_cortes + n].copy()
+            agrupador.etiquetas_[feature] = etiquetas[inicio_etiquetas:inicio_etiquetas + n + 2]
+            inicio_cortes += n
+            inicio_etiquetas += n + 2
+
+        return agrupador
+
+    def guardar(self, ruta: str):
+        """
+        Guarda los cortes y etiquetas en un archivo `.npz` comprimido.
+
+        Args:
+            ruta (str): Ruta del archivo de salida.
+        """
+        np.savez_compressed(ruta, **self._a_arrays())
+
+    @classmethod
+    def cargar(cls, ruta: str) -> 'AgrupadorOptimo':
+        """
+        Carga un agrupador guardado con `guardar`.
+
+        Args:
+            ruta (str): Ruta del archivo `.npz`.
+
+        Returns:
+            AgrupadorOptimo: Agrupador listo para `transform`.
+        """
+        with np.load(ruta, allow_pickle=False) as datos:
+            return cls._desde_arrays(datos)
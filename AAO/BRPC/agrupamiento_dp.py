@@ -0,0 +1,170 @@
+import numpy as np
+from typing import List, Optional, Tuple
+
+
+def _prebins(x: np.ndarray, y: np.ndarray, n_prebins: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Ordena la variable una sola vez y la divide en pre-bins por cuantiles. Solo se ordenan
+    además los valores con evento (la clase minoritaria) para obtener los eventos acumulados.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+            - Valores ordenados.
+            - Límites de los pre-bins como posiciones en el array ordenado (0, ..., n).
+            - Conteo acumulado de filas en cada límite.
+            - Conteo acumulado de eventos en cada límite.
+    """
+    xs = np.sort(x)
+    xs_eventos = np.sort(x[y == 1])
+    n = len(xs)
+
+    # Posiciones de cuantiles; cada límite se lleva al final de su bloque de valores repetidos
+    # para que un mismo valor nunca quede repartido entre dos bins.
+    posiciones = np.unique(np.linspace(0, n, n_prebins + 1).astype(np.int64)[1:-1])
+    posiciones = posiciones[posiciones > 0]
+    limites = np.unique(np.searchsorted(xs, xs[posiciones - 1], side='right'))
+    limites = np.concatenate([[0], limites[limites < n], [n]])
+
+    # Eventos acumulados en cada límite: basta contar, en los eventos ordenados,
+    # cuántos quedan por debajo del último valor de cada pre-bin.
+    eventos = np.zeros(len(limites), dtype=np.float64)
+    eventos[1:] = np.searchsorted(xs_eventos, xs[limites[1:] - 1], side='right')
+    return xs, limites, limites.astype(np.float64), eventos
+
+
+def _costes(conteo: np.ndarray, eventos: np.ndarray, min_muestras: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Coste (impureza de Gini ponderada) y tasa de eventos de cada bin (i, j] entre límites.
+    Los bins no válidos (vacíos o con menos de `min_muestras` filas) tienen coste infinito.
+    """
+    n = conteo[None, :] - conteo[:, None]  # n[i, j] = filas entre el límite i y el j
+    ev = eventos[None, :] - eventos[:, None]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        tasa = ev / n
+        coste = 2.0 * ev * (n - ev) / n
+
+    validos = (n >= min_muestras) & (n > 0)
+    # El bin único (sin cortes) siempre es válido, igual que un árbol sin divisiones
+    validos[0, -1] = True
+    coste = np.where(validos, coste, np.inf)
+    return coste, tasa
+
+
+def _particion_libre(coste: np.ndarray, max_bins: int) -> Tuple[float, List[int]]:
+    """Programación dinámica sin restricciones: mejor partición en 1..max_bins bins."""
+    P = coste.shape[0] - 1
+    columnas = np.arange(P + 1)
+
+    dp = coste[0].copy()
+    retrocesos = []
+    mejor_coste, mejor_k = dp[P], 1
+
+    for k in range(2, max_bins + 1):
+        total = dp[:, None] + coste
+        arg = np.argmin(total, axis=0)
+        dp = total[arg, columnas]
+        retrocesos.append(arg)
+        # Solo se aceptan más bins si mejoran el coste (empates -> menos bins)
+        if dp[P] < mejor_coste - 1e-9 * max(abs(mejor_coste), 1.0):
+            mejor_coste, mejor_k = dp[P], k
+
+    cortes = []
+    j = P
+    for k in range(mejor_k, 1, -1):
+        j = retrocesos[k - 2][j]
+        cortes.append(int(j))
+    return mejor_coste, sorted(cortes)
+
+
+def _particion_monotona(coste: np.ndarray, tasa: np.ndarray, max_bins: int, ascendente: bool) -> Tuple[float, List[int]]:
+    """
+    Programación dinámica con tasa de eventos (y por tanto WoE) monótona entre bins consecutivos.
+    El estado es el último bin (i, j]; la transición exige orden entre su tasa y la del anterior.
+    """
+    P = coste.shape[0] - 1
+    tasa = np.where(np.isfinite(coste), tasa, np.nan)
+
+    D = np.full_like(coste, np.inf)
+    D[0] = coste[0]
+    # compatibles[h, i, j]: el bin (h, i] puede preceder al bin (i, j]
+    if ascendente:
+        compatibles = tasa[:, :, None] <= tasa[None, :, :]
+    else:
+        compatibles = tasa[:, :, None] >= tasa[None, :, :]
+
+    estados = [D]
+    retrocesos = []
+    mejor_coste, mejor_k = D[0, P], 1
+
+    for k in range(2, max_bins + 1):
+        candidatos = np.where(compatibles, D[:, :, None], np.inf)
+        arg = np.argmin(candidatos, axis=0)
+        D = np.take_along_axis(candidatos, arg[None], axis=0)[0] + coste
+        estados.append(D)
+        retrocesos.append(arg)
+        coste_k = D[:, P].min()
+        if coste_k < mejor_coste - 1e-9 * max(abs(mejor_coste), 1.0):
+            mejor_coste, mejor_k = coste_k, k
+
+    # Reconstrucción desde el último bin (i, P] de la mejor partición con mejor_k bins
+    cortes = []
+    j = P
+    i = int(np.argmin(estados[mejor_k - 1][:, P]))
+    for k in range(mejor_k, 1, -1):
+        cortes.append(i)
+        i, j = int(retrocesos[k - 2][i, j]), i
+    return mejor_coste, sorted(cortes)
+
+
+def cortes_optimos_dp(x: np.ndarray, y: np.ndarray, max_bins: int = 10, min_muestras: Optional[int] = None,
+                      monotonico: Optional[str] = None, n_prebins: int = 50) -> List[float]:
+    """
+    Calcula los puntos de corte óptimos de una variable con programación dinámica.
+
+    La variable se ordena una sola vez y se divide en `n_prebins` pre-bins por cuantiles. Con los
+    conteos acumulados de eventos y no eventos en cada límite, el coste de cualquier bin se obtiene
+    en O(1), y la programación dinámica elige la partición que minimiza la impureza de Gini
+    ponderada (el mismo criterio que el árbol de decisión), respetando el tamaño mínimo por bin.
+
+    Args:
+        x (np.ndarray): Valores de la variable sin nulos.
+        y (np.ndarray): Target binario (0/1) alineado con `x`; el evento es 1.
+        max_bins (int): Número máximo de bins.
+        min_muestras (int, optional): Filas mínimas por bin. Por defecto, max(5% de las filas, 100),
+            igual que `min_samples_leaf` en `agrupamiento_optimo`.
+        monotonico (str, optional): Restricción de WoE monótono: 'ascendente', 'descendente' o
+            'auto' (elige la dirección de menor coste). None para no restringir.
+        n_prebins (int): Número de pre-bins por cuantiles.
+
+    Returns:
+        List[float]: Umbrales ordenados (puntos medios entre valores consecutivos, como el árbol).
+    """
+    if monotonico not in (None, 'ascendente', 'descendente', 'auto'):
+        raise ValueError(f"monotonico debe ser None, 'ascendente', 'descendente' o 'auto': {monotonico}")
+
+    x = np.asarray(x, dtype=np.float64).ravel()
+    y = np.asarray(y, dtype=np.float64).ravel()
+    if min_muestras is None:
+        min_muestras = max(int(len(x) * 0.05), 100)
+
+    xs, limites, conteo, eventos = _prebins(x, y, n_prebins)
+    if len(limites) <= 2:
+        return []
+
+    coste, tasa = _costes(conteo, eventos, min_muestras)
+
+    if monotonico is None:
+        _, indices = _particion_libre(coste, max_bins)
+    elif monotonico == 'auto':
+        opciones = [_particion_monotona(coste, tasa, max_bins, asc) for asc in (True, False)]
+        _, indices = min(opciones, key=lambda o: o[0])
+    else:
+        _, indices = _particion_monotona(coste, tasa, max_bins, monotonico == 'ascendente')
+
+    # Umbral en el punto medio entre el último valor del bin izquierdo y el primero del derecho
+    posiciones = limites[indices]
+    izquierda, derecha = xs[posiciones - 1], xs[posiciones]
+    umbrales = (izquierda + derecha) / 2.0
+    umbrales = np.where(umbrales == derecha, izquierda, umbrales)
+    return umbrales.tolist()
@@ -0,0 +1,192 @@
+import os
+import pandas as pd
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .agrupamiento_optimo import (agrupamiento_optimo, _calcular_cortes, _aplicar_cortes, _agrupamiento_respaldo,
+                                  _categorica_respaldo, _etiquetas_bins, _serie_categorica, _validar_formato,
+                                  _validar_metodo, FORMATOS)
+from ._memoria_compartida import MatrizCompartida, inicializar_proceso, matriz_proceso
+from .cargador import _como_dataframe
+from .instrumentacion import instrumentar
+
+
+@dataclass
+class PlanAgrupamiento:
+    """
+    Plan de binning de varias variables calculado en una sola llamada.
+
+    Attributes:
+        target (str): Columna objetivo usada en el ajuste.
+        max_bins (int): Número máximo de bins solicitado.
+        min_bins (int): Número mínimo de bins solicitado.
+        metodo (str): Algoritmo de cortes usado ('arbol' o 'dp').
+        cortes (Dict[str, Optional[List[float]]]): Umbrales por variable. `None` indica que
+            la variable se agrupó con el método de respaldo (todo nulo, qcut o cortes equidistantes).
+        agrupados (pd.DataFrame): Variables discretizadas, idénticas a las de `agrupamiento_optimo`
+            (cadenas, categóricas o códigos enteros según el formato).
+        etiquetas (Dict[str, List[str]]): Etiqueta de cada código por variable (posición 0 = 'Missing').
+            Solo se rellena con formato 'categorico' o 'codigos'.
+    """
+    target: str
+    max_bins: int
+    min_bins: int
+    metodo: str = 'arbol'
+    cortes: Dict[str, Optional[List[float]]] = field(default_factory=dict)
+    agrupados: pd.DataFrame = field(default_factory=pd.DataFrame)
+    etiquetas: Dict[str, List[str]] = field(default_factory=dict)
+
+    @property
+    def features(self) -> List[str]:
+        return list(self.cortes)
+
+    def __getitem__(self, feature: str) -> pd.Series:
+        return self.agrupados[feature]
+
+
+def _cortes_columna(matriz: np.ndarray, j: int, max_bins: int, min_bins: int, metodo: str = 'arbol',
+                    monotonico: Optional[str] = None) -> Tuple[str, Optional[List[float]]]:
+    """
+    Calcula los cortes de la fila `j` de la matriz (variables x filas, target en la última fila).
+
+    Returns:
+        Tuple[str, Optional[List[float]]]: Estado ('cortes', 'vacio' o 'error') y umbrales.
+    """
+    x = matriz[j]
+    y = matriz[-1]
+    mask = ~(np.isnan(x) | np.isnan(y))
+
+    if not mask.any():
+        return 'vacio', None
+
+    try:
+        return 'cortes', _calcular_cortes(x[mask], y[mask], max_bins, min_bins, metodo, monotonico)
+    except Exception:
+        return 'error', None
+
+
+def _tarea_cortes(j: int, max_bins: int, min_bins: int, metodo: str,
+                  monotonico: Optional[str]) -> Tuple[str, Optional[List[float]]]:
+    # Ejecutada en los procesos del pool sobre la matriz compartida
+    return _cortes_columna(matriz_proceso(), j, max_bins, min_bins, metodo, monotonico)
+
+
+def _cortes_multiple(df: pd.DataFrame, numericas: List[str], target: str, max_bins: int,
+                     min_bins: int, n_jobs: Optional[int], metodo: str = 'arbol',
+                     monotonico: Optional[str] = None) -> List[Tuple[str, Optional[List[float]]]]:
+    """
+    Calcula los cortes de varias variables numéricas, en paralelo si `n_jobs` > 1.
+
+    Returns:
+        List[Tuple[str, Optional[List[float]]]]: Estado y umbrales de cada variable, en el
+        mismo orden que `numericas`.
+    """
+    # Matriz (variables + target) x filas: cada variable queda contigua en memoria
+    matriz = np.ascontiguousarray(df[numericas + [target]].to_numpy(dtype=np.float64).T)
+
+    if n_jobs is None:
+        n_jobs = os.cpu_count() or 1
+    n_jobs = max(1, min(n_jobs, len(numericas)))
+
+    if n_jobs == 1:
+        return [_cortes_columna(matriz, j, max_bins, min_bins, metodo, monotonico) for j in range(len(numericas))]
+
+    with MatrizCompartida(matriz) as compartida:
+        del matriz
+        tarea = partial(_tarea_cortes, max_bins=max_bins, min_bins=min_bins, metodo=metodo, monotonico=monotonico)
+        chunksize = max(1, len(numericas) // (4 * n_jobs))
+        with ProcessPoolExecutor(max_workers=n_jobs, initializer=inicializar_proceso,
+                                 initargs=(compartida.descriptor,)) as executor:
+            return list(executor.map(tarea, range(len(numericas)), chunksize=chunksize))
+
+
+@instrumentar
+def agrupamiento_multiple(df: pd.DataFrame, features: Sequence[str], target: str, max_bins: int = 10,
+                          min_bins: int = 3, n_jobs: Optional[int] = None, metodo: str = 'arbol',
+                          monotonico: Optional[str] = None, formato: str = 'texto') -> PlanAgrupamiento:
+    """
+    Aplica `agrupamiento_optimo` a varias variables en una sola llamada, repartiendo el ajuste
+    de los árboles entre un pool de procesos.
+
+    Las variables numéricas y el target se copian una única vez a una matriz de memoria compartida
+    de solo lectura; cada proceso recibe solo el índice de la variable a ajustar. El resultado de
+    cada variable es idéntico al de la función serial.
+
+    Args:
+        df (pd.DataFrame): DataFrame que contiene los datos.
+        features (Sequence[str]): Columnas a discretizar.
+        target (str): Nombre de la columna objetivo.
+        max_bins (int): Número máximo de bins a crear.
+        min_bins (int): Número mínimo de bins a crear.
+        n_jobs (int, optional): Número de procesos. Por defecto, todos los núcleos disponibles.
+            Con 1 se ejecuta en el proceso actual.
+        metodo (str): 'arbol' (por defecto) o 'dp' (ver `agrupamiento_optimo`).
+        monotonico (str, optional): Restricción de WoE monótono (solo con metodo='dp').
+        formato (str): 'texto' (por defecto, como `agrupamiento_optimo`), 'categorico' (columnas
+            `pd.Categorical`) o 'codigos' (enteros int8/int16 con la tabla `etiquetas` del plan).
+            En los dos últimos 'Missing' es siempre el código 0.
+
+    Returns:
+        PlanAgrupamiento: Plan con los cortes y las variables discretizadas.
+    """
+    df = _como_dataframe(df)
+    _validar_metodo(metodo, monotonico)
+    _validar_formato(formato, FORMATOS + ('codigos',))
+    texto = formato == 'texto'
+    features = [f for f in features if f != target]
+    numericas = [f for f in features if pd.api.types.is_numeric_dtype(df[f])]
+
+    estados = _cortes_multiple(df, numericas, target, max_bins, min_bins, n_jobs, metodo, monotonico)
+    resultado = dict(zip(numericas, estados))
+    cortes = {}
+    agrupados = {}
+
+    for feature in features:
+        estado, umbrales = resultado.get(feature, ('serial', None))
+        cortes[feature] = None
+
+        if estado == 'cortes':
+            try:
+                if texto:
+                    agrupados[feature] = _aplicar_cortes(df[feature], umbrales)
+                else:
+                    agrupados[feature] = _serie_categorica(df[feature], umbrales, _etiquetas_bins(len(umbrales)))
+                cortes[feature] = umbrales
+                continue
+            except Exception:
+                estado = 'error'
+
+        if estado == 'vacio':
+            if texto:
+                agrupados[feature] = pd.Series(['Missing'] * len(df), index=df.index)
+            else:
+                agrupados[feature] = pd.Series(pd.Categorical.from_codes(np.zeros(len(df), dtype=np.int8),
+                                                                         categories=['Missing']), index=df.index)
+        elif estado == 'error':
+            if texto:
+                agrupados[feature] = _agrupamiento_respaldo(df[feature], max_bins)
+            else:
+                agrupados[feature] = _categorica_respaldo(df[feature], max_bins)
+        else:
+            # Columnas no numéricas: se delega en la función serial
+            agrupados[feature] = agrupamiento_optimo(df, feature, target, max_bins, min_bins, metodo, monotonico,
+                                                     'texto' if texto else 'categorico')
+
+    etiquetas = {}
+    if not texto:
+        etiquetas = {f: list(serie.cat.categories) for f, serie in agrupados.items()}
+        if formato == 'codigos':
+            agrupados = {f: serie.cat.codes for f, serie in agrupados.items()}
+
+    return PlanAgrupamiento(
+        target=target,
+        max_bins=max_bins,
+        min_bins=min_bins,
+        metodo=metodo,
+        cortes=cortes,
+        agrupados=pd.DataFrame(agrupados, index=df.index),
+        etiquetas=etiquetas
+    )
@@ -1,12 +1,191 @@
 import pandas as pd
 import numpy as np
-from typing import Tuple, Union
+from typing import List, Optional, Tuple, Union
 from sklearn.tree import DecisionTreeClassifier
 
-def agrupamiento_optimo(df: pd.DataFrame, feature: str, target: str, max_bins: int = 10, min_bins: int = 3) -> pd.Series:
+from .agrupamiento_dp import cortes_optimos_dp
+from .cargador import _como_dataframe
+from .instrumentacion import instrumentar
+
+METODOS = ('arbol', 'dp')
+FORMATOS = ('texto', 'categorico')
+
+
+def _validar_metodo(metodo: str, monotonico: Optional[str]):
+    if metodo not in METODOS:
+        raise ValueError(f"metodo debe ser uno de {METODOS}: {metodo}")
+    if monotonico is not None and metodo != 'dp':
+        raise ValueError("La restricción monotónica solo está disponible con metodo='dp'")
+
+
+def _validar_formato(formato: str, formatos: Tuple[str, ...] = FORMATOS):
+    if formato not in formatos:
+        raise ValueError(f"formato debe ser uno de {formatos}: {formato}")
+
+
+def _cortes_arbol(x: np.ndarray, y: np.ndarray, max_bins: int = 10) -> List[float]:
+    """
+    Calcula los puntos de corte de una variable a partir de un árbol de decisión.
+    """
+    X = x.reshape(-1, 1)
+
+    # Determinar número óptimo de bins basado en la profundidad del árbol
+    # Usamos max_depth para limitar el número de splits
+    max_depth = int(np.log2(max_bins))
+
+    # Entrenar árbol de decisión para encontrar puntos de corte óptimos
+    tree = DecisionTreeClassifier(
+        max_depth=max_depth,
+        min_samples_leaf=max(int(len(x) * 0.05), 100),  # Al menos 5% o 100 muestras por hoja
+        random_state=42
+    )
+    tree.fit(X, y)
+
+    # Obtener los valores de corte del árbol
+    thresholds = []
+    def extract_thresholds(tree, node=0):
+        if tree.tree_.feature[node] != -2:  # No es hoja
+            thresholds.append(tree.tree_.threshold[node])
+            extract_thresholds(tree, tree.tree_.children_left[node])
+            extract_thresholds(tree, tree.tree_.children_right[node])
+
+    extract_thresholds(tree)
+    return sorted(set(thresholds))
+
+
+def _calcular_cortes(x: np.ndarray, y: np.ndarray, max_bins: int = 10, min_bins: int = 3,
+                     metodo: str = 'arbol', monotonico: Optional[str] = None) -> List[float]:
+    """
+    Calcula los puntos de corte óptimos de una variable.
+
+    Args:
+        x (np.ndarray): Valores de la variable sin nulos.
+        y (np.ndarray): Valores del target alineados con `x`.
+        max_bins (int): Número máximo de bins a crear.
+        min_bins (int): Número mínimo de bins a crear.
+        metodo (str): 'arbol' (árbol de decisión) o 'dp' (programación dinámica, ver `cortes_optimos_dp`).
+        monotonico (str, optional): Restricción de WoE monótono (solo con metodo='dp').
+
+    Returns:
+        List[float]: Umbrales ordenados (sin incluir -inf/inf).
+    """
+    if metodo == 'dp':
+        thresholds = cortes_optimos_dp(x, y, max_bins, monotonico=monotonico)
+    else:
+        thresholds = _cortes_arbol(x, y, max_bins)
+
+    # Asegurar que tenemos al menos min_bins-1 cortes
+    if len(thresholds) < min_bins - 1:
+        # Usar percentiles si el árbol no genera suficientes cortes
+        percentiles = np.linspace(0, 100, min_bins + 1)[1:-1]
+        thresholds = np.percentile(x, percentiles).tolist()
+        thresholds = sorted(set(thresholds))
+
+    return [float(t) for t in thresholds]
+
+
+def _aplicar_cortes(serie: pd.Series, thresholds: List[float]) -> pd.Series:
+    """
+    Asigna cada valor de la serie a su bin ('Bin_1', 'Bin_2', ...) según los umbrales dados.
+    Los valores nulos se etiquetan como 'Missing'.
+    """
+    # Crear los bins usando los umbrales
+    bins = [-np.inf] + list(thresholds) + [np.inf]
+    labels = [f'Bin_{i+1}' for i in range(len(bins)-1)]
+
+    # Aplicar a todo el dataset (incluyendo nulos)
+    result = pd.cut(serie, bins=bins, labels=labels, include_lowest=True, duplicates='drop')
+    result = result.astype(str)
+    result = result.replace('nan', 'Missing').fillna('Missing')
+    return result
+
+
+def _etiquetas_bins(n_cortes: int) -> List[str]:
+    """Etiquetas de cada código de bin: 'Missing' (código 0), 'Bin_1', ..., 'Bin_{n_cortes+1}'."""
+    return ['Missing'] + [f'Bin_{i+1}' for i in range(n_cortes + 1)]
+
+
+def _agrupamiento_respaldo(serie: pd.Series, max_bins: int = 10) -> pd.Series:
+    """
+    Binning de respaldo cuando el binning óptimo falla: qcut y, en último caso, cortes equidistantes.
+    """
+    try:
+        result = pd.qcut(serie, q=max_bins, duplicates='drop')
+        result = result.astype(str)
+        result = result.replace('nan', 'Missing').fillna('Missing')
+    except:
+        # Último recurso: usar cut con bins equidistantes
+        result = pd.cut(serie, bins=max_bins, duplicates='drop')
+        result = result.astype(str)
+        result = result.replace('nan', 'Missing').fillna('Missing')
+    return result
+
+
+def _cortes_respaldo(serie: pd.Series, max_bins: int = 10) -> Tuple[List[float], List[str]]:
+    """
+    Equivalente a `_agrupamiento_respaldo` que devuelve los cortes internos y las etiquetas
+    de cada bin en lugar de la serie discretizada.
+    """
+    try:
+        categorias, bins = pd.qcut(serie, q=max_bins, duplicates='drop', retbins=True)
+    except:
+        categorias, bins = pd.cut(serie, bins=max_bins, duplicates='drop', retbins=True)
+    etiquetas = [str(c) for c in categorias.cat.categories]
+    return [float(b) for b in bins[1:-1]], etiquetas
+
+
+def _codificar(valores: np.ndarray, cortes: np.ndarray) -> np.ndarray:
+    """
+    Código de bin de cada valor: 0 para los nulos e i para el bin i-ésimo (intervalos cerrados
+    por la derecha, como `pd.cut`). Usa int8 salvo que haya más de 127 bins.
+    """
+    dtype = np.int8 if len(cortes) + 1 <= np.iinfo(np.int8).max else np.int16
+    codigos = np.searchsorted(cortes, valores, side='left').astype(dtype)
+    codigos += 1
+    codigos[np.isnan(valores)] = 0
+    return codigos
+
+
+def _serie_categorica(serie: pd.Series, cortes: List[float], etiquetas: List[str]) -> pd.Series:
+    """
+    Discretiza la serie como `pd.Categorical` cuyo código 0 es 'Missing'.
+
+    Args:
+        serie (pd.Series): Variable a discretizar.
+        cortes (List[float]): Umbrales internos.
+        etiquetas (List[str]): Etiqueta de cada código, empezando por 'Missing'.
+    """
+    codigos = _codificar(serie.to_numpy(dtype=np.float64), np.asarray(cortes, dtype=np.float64))
+    categorico = pd.Categorical.from_codes(codigos, categories=etiquetas)
+    return pd.Series(categorico, index=serie.index, name=serie.name)
+
+
+def _categorica_respaldo(serie: pd.Series, max_bins: int = 10) -> pd.Series:
+    """Versión categórica de `_agrupamiento_respaldo`."""
+    cortes, etiquetas = _cortes_respaldo(serie, max_bins)
+    etiquetas = ['Missing'] + etiquetas
+    if len(set(etiquetas)) < len(etiquetas):
+        # Las etiquetas de intervalo se redondean y pueden repetirse: se usan las de texto
+        texto = _agrupamiento_respaldo(serie, max_bins).astype('category')
+        categorias = ['Missing'] + [c for c in texto.cat.categories if c != 'Missing']
+        return texto.cat.set_categories(categorias)
+    return _serie_categorica(serie, cortes, etiquetas)
+
+
+@instrumentar
+def agrupamiento_optimo(df: pd.DataFrame, feature: str, target: str, max_bins: int = 10, min_bins: int = 3,
+                        metodo: str = 'arbol', monotonico: Optional[str] = None,
+                        formato: str = 'texto') -> pd.Series:
     """
     Realiza un binning óptimo de una variable numérica basándose en un árbol de decisión.
     Esto asegura que los bins tengan una separación significativa en la variable target.
+
+    Con metodo='dp' los cortes se eligen con programación dinámica sobre conteos acumulados
+    (ver `cortes_optimos_dp`): respeta el mismo mínimo de 5% o 100 filas por bin, admite una
+    restricción de WoE monótono y es un orden de magnitud más rápido que ajustar el árbol.
+
+    Con formato='categorico' se devuelve un `pd.Categorical` (códigos int8 y tabla de etiquetas
+    'Missing', 'Bin_1', ...) en lugar de una cadena por fila; `woe_iv` lo consume directamente.
     
     Args:
         df (pd.DataFrame): DataFrame que contiene los datos.
@@ -14,71 +193,41 @@ def agrupamiento_optimo(df: pd.DataFrame, feature: str, target: str, max_bins: i
         target (str): Nombre de la columna objetivo.
         max_bins (int): Número máximo de bins a crear.
         min_bins (int): Número mínimo de bins a crear.
+        metodo (str): 'arbol' (por defecto) o 'dp'.
+        monotonico (str, optional): 'ascendente', 'descendente' o 'auto' para forzar un WoE
+            monótono (solo con metodo='dp').
+        formato (str): 'texto' (por defecto) o 'categorico'. En ambos 'Missing' es la categoría
+            de los nulos; en el categórico tiene siempre el código 0.
         
     Returns:
         pd.Series: Serie con las categorías binned.
     """
+    df = _como_dataframe(df)
+    _validar_metodo(metodo, monotonico)
+    _validar_formato(formato)
+
     # Eliminar valores nulos temporalmente para el ajuste
     df_clean = df[[feature, target]].dropna()
     
     if len(df_clean) == 0:
         # Si todos son nulos, retornar categoría 'Missing'
+        if formato == 'categorico':
+            return pd.Series(pd.Categorical.from_codes(np.zeros(len(df), dtype=np.int8), categories=['Missing']),
+                             index=df.index)
         return pd.Series(['Missing'] * len(df), index=df.index)
     
-    X = df_clean[[feature]].values
-    y = df_clean[target].values
-    
-    # Determinar número óptimo de bins basado en la profundidad del árbol
-    # Usamos max_depth para limitar el número de splits
-    max_depth = int(np.log2(max_bins))
-    
     try:
-        # Entrenar árbol de decisión para encontrar puntos de corte óptimos
-        tree = DecisionTreeClassifier(
-            max_depth=max_depth,
-            min_samples_leaf=max(int(len(df_clean) * 0.05), 100),  # Al menos 5% o 100 muestras por hoja
-            random_state=42
-        )
-        tree.fit(X, y)
-        
-        # Obtener los valores de corte del árbol
-        thresholds = []
-        def extract_thresholds(tree, node=0):
-            if tree.tree_.feature[node] != -2:  # No es hoja
-                thresholds.append(tree.tree_.threshold[node])
-                extract_thresholds(tree, tree.tree_.children_left[node])
-                extract_thresholds(tree, tree.tree_.children_right[node])
-        
-        extract_thresholds(tree)
-        thresholds = sorted(set(thresholds))
-        
-        # Asegurar que tenemos al menos min_bins-1 cortes
-        if len(thresholds) < min_bins - 1:
-            # Usar percentiles si el árbol no genera suficientes cortes
-            percentiles = np.linspace(0, 100, min_bins + 1)[1:-1]
-            thresholds = np.percentile(df_clean[feature].values, percentiles).tolist()
-            thresholds = sorted(set(thresholds))
-        
-        # Crear los bins usando los umbrales
-        bins = [-np.inf] + thresholds + [np.inf]
-        labels = [f'Bin_{i+1}' for i in range(len(bins)-1)]
-        
-        # Aplicar a todo el dataset (incluyendo nulos)
-        result = pd.cut(df[feature], bins=bins, labels=labels, include_lowest=True, duplicates='drop')
-        result = result.astype(str)
-        result = result.replace('nan', 'Missing')
-        
+        thresholds = _calcular_cortes(df_clean[feature].values, df_clean[target].values, max_bins, min_bins,
+                                      metodo, monotonico)
+        if formato == 'categorico':
+            result = _serie_categorica(df[feature], thresholds, _etiquetas_bins(len(thresholds)))
+        else:
+            result = _aplicar_cortes(df[feature], thresholds)
     except Exception as e:
         # Si falla el binning óptimo, usar qcut con manejo de duplicados
-        try:
-            result = pd.qcut(df[feature], q=max_bins, duplicates='drop')
-            result = result.astype(str)
-            result = result.replace('nan', 'Missing')
-        except:
-            # Último recurso: usar cut con bins equidistantes
-            result = pd.cut(df[feature], bins=max_bins, duplicates='drop')
-            result = result.astype(str)
-            result = result.replace('nan', 'Missing')
+        if formato == 'categorico':
+            result = _categorica_respaldo(df[feature], max_bins)
+        else:
+            result = _agrupamiento_respaldo(df[feature], max_bins)
     
     return result
-
@@ -1,17 +1,89 @@
 import pandas as pd
 import numpy as np
 
-def analisis_dataset(df: pd.DataFrame) -> pd.DataFrame:
+from .bosquejos import HyperLogLog
+from .cargador import _como_dataframe
+from .instrumentacion import instrumentar
+
+
+def _es_numerica(dtype) -> bool:
+    # Los booleanos no se consideran numéricos (np.issubdtype(bool, np.number) es False)
+    return pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)
+
+
+def _distintos_exactos(matriz: np.ndarray) -> np.ndarray:
+    """Número de valores distintos (sin NaN) de cada columna, ordenando el bloque una sola vez."""
+    if matriz.shape[0] == 0:
+        return np.zeros(matriz.shape[1], dtype=np.int64)
+    ordenada = np.sort(matriz, axis=0)  # los NaN quedan al final
+    cambios = (ordenada[1:] != ordenada[:-1]) & ~np.isnan(ordenada[1:])
+    return cambios.sum(axis=0) + ~np.isnan(ordenada[0])
+
+
+def _momentos(matriz: np.ndarray):
+    """
+    Conteo de valores válidos, media y suma de cuadrados centrada (M2) de cada columna,
+    ignorando NaN. Son los estadísticos que se fusionan al procesar por trozos.
+    """
+    nulos = np.isnan(matriz)
+    validos = matriz.shape[0] - nulos.sum(axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        media = np.where(nulos, 0.0, matriz).sum(axis=0) / validos
+        centrada = np.where(nulos, 0.0, matriz - media)
+    m2 = np.einsum('ij,ij->j', centrada, centrada)
+    return validos, media, m2
+
+
+def _varianza(validos: np.ndarray, m2: np.ndarray) -> np.ndarray:
+    """Varianza muestral (ddof=1) a partir de M2; NaN con menos de dos valores, como pandas."""
+    with np.errstate(invalid='ignore', divide='ignore'):
+        var = m2 / (validos - 1)
+    return np.where(validos > 1, var, np.nan)
+
+
+def _construir_resumen(columnas, tipos, numericas: np.ndarray, n: int, null_count: np.ndarray,
+                       variance: np.ndarray, distintos: np.ndarray, distintos_aproximados: bool) -> pd.DataFrame:
+    """Arma el DataFrame resumen común a `analisis_dataset` y `analisis_dataset_streaming`."""
+    # Clasificación automática (Continua/Discreta)
+    # Heurística: Si es float o tiene muchos valores únicos (>20), asumimos continua.
+    # Si son pocos valores únicos, asumimos discreta (o categórica numérica).
+    # Si no es numérica, la tratamos como Discreta (Categórica)
+    es_float = np.array([pd.api.types.is_float_dtype(t) for t in tipos], dtype=bool)
+    continua = numericas & (es_float | (distintos > 20))
+
+    summary_df = pd.DataFrame({
+        'Null Count': null_count,
+        'Completeness (%)': np.round((n - null_count) / n * 100, 2),
+        'Data Type': [str(t) for t in tipos],
+        'Std': np.round(np.sqrt(variance), 4),
+        'Variance': np.round(variance, 4),
+        'Type': np.where(continua, 'Continua', 'Discreta')
+    }, index=pd.Index(columnas, name='Column'))
+
+    if distintos_aproximados:
+        summary_df['Approx. Unique'] = np.round(distintos)
+
+    return summary_df
+
+
+@instrumentar
+def analisis_dataset(df: pd.DataFrame, distintos_aproximados: bool = False, precision: int = 12) -> pd.DataFrame:
     """
     Función general para verificar la completitud y calidad de los datos.
-    
+
     Esta función analiza un DataFrame de pandas y genera un reporte con estadísticas
     clave sobre la calidad de los datos, incluyendo valores nulos, tipos de datos,
     y estadísticas de dispersión para variables numéricas.
-    
+
+    Las columnas numéricas se procesan como un único bloque: nulos, media y varianza salen de
+    operaciones vectorizadas sobre la matriz subyacente, sin un recorrido por columna.
+
     Args:
         df (pd.DataFrame): El DataFrame de entrada a analizar.
-        
+        distintos_aproximados (bool): Si es True, los valores distintos se estiman con un bosquejo
+            HyperLogLog (útil con miles de columnas) y se añade la columna 'Approx. Unique'.
+        precision (int): Precisión del bosquejo HyperLogLog (error típico 1.04 / sqrt(2^precision)).
+
     Returns:
         pd.DataFrame: Un DataFrame resumen con las siguientes columnas:
             - 'Null Count': Cantidad de valores nulos.
@@ -20,63 +92,40 @@ def analisis_dataset(df: pd.DataFrame) -> pd.DataFrame:
             - 'Std': Desviación estándar (solo para numéricos).
             - 'Variance': Varianza (solo para numéricos).
             - 'Type': Clasificación automática (Continua/Discreta).
+            - 'Approx. Unique': Valores distintos estimados (solo con distintos_aproximados=True).
     """
-    
-    # Inicializamos una lista para guardar los resultados de cada columna
-    summary_data = []
-    
-    for col in df.columns:
-        # Obtenemos la serie de datos de la columna actual
-        series = df[col]
-        
-        # 1. Conteo de Nulos
-        null_count = series.isnull().sum()
-        
-        # 2. Porcentaje de completitud
-        # Calculamos (Total - Nulos) / Total * 100
-        completeness = ((len(df) - null_count) / len(df)) * 100
-        
-        # 3. Tipo de Datos
-        dtype = series.dtype
-        
-        # Inicializamos estadísticos de dispersión
-        std_dev = np.nan
-        variance = np.nan
-        data_class = "Unknown"
-        
-        # Verificamos si la columna es numérica para calcular estadísticas
-        if np.issubdtype(dtype, np.number):
-            # 4. Estadísticos de Dispersión
-            std_dev = series.std()
-            variance = series.var()
-            
-            # 5. Clasificación automática (Continua/Discreta)
-            # Heurística: Si es float o tiene muchos valores únicos (>20), asumimos continua.
-            # Si son pocos valores únicos, asumimos discreta (o categórica numérica).
-            # Para este dataset financiero, la mayoría serán continuas.
-            if pd.api.types.is_float_dtype(dtype) or series.nunique() > 20:
-                data_class = "Continua"
-            else:
-                data_class = "Discreta"
+    df = _como_dataframe(df)
+    n = len(df)
+    columnas = df.columns
+    numericas = np.array([_es_numerica(df[col].dtype) for col in columnas], dtype=bool)
+
+    null_count = np.zeros(len(columnas), dtype=np.int64)
+    variance = np.full(len(columnas), np.nan)
+    distintos = np.full(len(columnas), np.nan)
+
+    # 1. Bloque numérico: una sola matriz float64 para todas las columnas
+    if numericas.any():
+        matriz = df.iloc[:, np.flatnonzero(numericas)].to_numpy(dtype=np.float64, na_value=np.nan)
+        validos, _, m2 = _momentos(matriz)
+        null_count[numericas] = n - validos
+
+        # 2. Estadísticos de dispersión: la varianza se calcula una vez y la desviación es su raíz
+        variance[numericas] = _varianza(validos, m2)
+
+        if distintos_aproximados:
+            distintos[numericas] = HyperLogLog(matriz.shape[1], precision).actualizar(matriz).estimar()
         else:
-            # Si no es numérica, la tratamos como Discreta (Categórica)
-            data_class = "Discreta"
-            
-        # Agregamos la fila al resumen
-        summary_data.append({
-            'Column': col,
-            'Null Count': null_count,
-            'Completeness (%)': round(completeness, 2),
-            'Data Type': str(dtype),
-            'Std': round(std_dev, 4) if not np.isnan(std_dev) else np.nan,
-            'Variance': round(variance, 4) if not np.isnan(variance) else np.nan,
-            'Type': data_class
-        })
-    
-    # Convertimos la lista de diccionarios a DataFrame
-    summary_df = pd.DataFrame(summary_data)
-    
-    # Establecemos la columna 'Column' como índice para mejor legibilidad
-    summary_df.set_index('Column', inplace=True)
-    
-    return summary_df
+            # Solo hace falta contar distintos en las columnas numéricas no float
+            enteras = np.array([not pd.api.types.is_float_dtype(df[col].dtype)
+                                for col in columnas[numericas]], dtype=bool)
+            if enteras.any():
+                indices = np.flatnonzero(numericas)[enteras]
+                distintos[indices] = _distintos_exactos(matriz[:, enteras])
+
+    if (~numericas).any():
+        null_count[~numericas] = df.iloc[:, np.flatnonzero(~numericas)].isnull().sum().to_numpy()
+
+    # 3. Clasificación automática (Continua/Discreta) y resumen
+    tipos = [df[col].dtype for col in columnas]
+    return _construir_resumen(columnas, tipos, numericas, n, null_count, variance, distintos,
+                              distintos_aproximados)
@@ -0,0 +1,93 @@
+import pandas as pd
+import numpy as np
+
+from .analisis_dataset import _construir_resumen, _es_numerica, _momentos, _varianza
+from .bosquejos import HyperLogLog
+from .cargador import _leer_trozos
+from .instrumentacion import instrumentar
+
+
+def _tipo_combinado(tipo_actual, tipo_trozo):
+    """Tipo de una columna tras ver un nuevo trozo (int + float -> float; cualquier no numérico -> object)."""
+    if tipo_actual is None:
+        return tipo_trozo
+    if tipo_actual == tipo_trozo:
+        return tipo_actual
+    if _es_numerica(tipo_actual) and _es_numerica(tipo_trozo):
+        try:
+            return np.result_type(tipo_actual, tipo_trozo)
+        except TypeError:
+            return np.dtype(np.float64)
+    return np.dtype(object)
+
+
+@instrumentar
+def analisis_dataset_streaming(ruta: str, chunksize: int = 100_000, precision: int = 12,
+                               **kwargs_csv) -> pd.DataFrame:
+    """
+    Versión por trozos de `analisis_dataset` para CSV que no caben en memoria.
+
+    El archivo se lee una sola vez, secuencialmente, en trozos de `chunksize` filas. Por cada
+    trozo se calculan nulos, media y M2 de las columnas numéricas y se fusionan con los acumulados
+    (fórmula de Chan para medias y varianzas), y se actualiza un bosquejo HyperLogLog con los valores
+    distintos. La memoria depende de `chunksize` y del número de columnas, no del tamaño del archivo.
+
+    Args:
+        ruta (str | DatasetCacheado): Ruta del archivo CSV o dataset de `cargar_dataset`.
+        chunksize (int): Filas por trozo.
+        precision (int): Precisión del bosquejo HyperLogLog.
+        **kwargs_csv: Argumentos adicionales para `pd.read_csv` (sep, usecols, ...).
+
+    Returns:
+        pd.DataFrame: El mismo resumen que `analisis_dataset(df, distintos_aproximados=True)`.
+    """
+    columnas = None
+    tipos = None
+    n = 0
+
+    for trozo in _leer_trozos(ruta, chunksize, **kwargs_csv):
+        if columnas is None:
+            columnas = trozo.columns
+            k = len(columnas)
+            tipos = [None] * k
+            null_count = np.zeros(k, dtype=np.int64)
+            validos = np.zeros(k, dtype=np.int64)
+            media = np.zeros(k)
+            m2 = np.zeros(k)
+            bosquejo = HyperLogLog(k, precision)
+
+        tipos = [_tipo_combinado(t, trozo[col].dtype) for t, col in zip(tipos, columnas)]
+        numericas = np.array([_es_numerica(trozo[col].dtype) for col in columnas], dtype=bool)
+        n += len(trozo)
+
+        if (~numericas).any():
+            null_count[~numericas] += trozo.iloc[:, np.flatnonzero(~numericas)].isnull().sum().to_numpy()
+        if not numericas.any():
+            continue
+
+        matriz = trozo.iloc[:, np.flatnonzero(numericas)].to_numpy(dtype=np.float64, na_value=np.nan)
+        n_b, media_b, m2_b = _momentos(matriz)
+        null_count[numericas] += len(trozo) - n_b
+
+        # Fusión de Chan: combina (n, media, M2) acumulados con los del trozo
+        n_a, media_a = validos[numericas], media[numericas]
+        total = n_a + n_b
+        with np.errstate(invalid='ignore', divide='ignore'):
+            delta = np.where(n_b > 0, media_b - media_a, 0.0)
+            media[numericas] = np.where(total > 0, media_a + delta * n_b / total, 0.0)
+            m2[numericas] += np.where(total > 0, np.where(n_b > 0, m2_b, 0.0) + delta ** 2 * n_a * n_b / total, 0.0)
+        validos[numericas] = total
+
+        trozo_bosquejo = HyperLogLog(matriz.shape[1], precision).actualizar(matriz)
+        bosquejo.registros[numericas] = np.maximum(bosquejo.registros[numericas], trozo_bosquejo.registros)
+
+    if columnas is None:
+        raise ValueError(f"El archivo {ruta} no contiene filas")
+
+    # Una columna que en algún trozo no fue numérica se trata como no numérica
+    numericas = np.array([_es_numerica(t) for t in tipos], dtype=bool)
+    variance = np.where(numericas, _varianza(validos, m2), np.nan)
+    distintos = np.where(numericas, bosquejo.estimar(), np.nan)
+
+    return _construir_resumen(columnas, tipos, numericas, n, null_count, variance, distintos,
+                              distintos_aproximados=True)
@@ -0,0 +1,183 @@
+import warnings
+
+import pandas as pd
+import numpy as np
+from scipy import special
+from typing import Iterable, List, Optional, Sequence, Union
+
+from .cargador import DatasetCacheado, _leer_trozos
+from .instrumentacion import instrumentar
+
+
+class AnovaF:
+    """
+    Estadístico F de ANOVA (el mismo que `sklearn.feature_selection.f_classif`) calculado de
+    forma incremental a partir de estadísticos suficientes.
+
+    Por cada clase y variable se acumulan el número de valores, su suma y su suma de cuadrados,
+    así que los datos pueden llegar por trozos o por particiones (p. ej. por año) y dos
+    acumuladores se fusionan sumándolos. Los nulos se ignoran por variable. Una vez acumulado,
+    `tabla()` devuelve el ranking completo de todas las variables, del que se lee cualquier `k`
+    sin volver a recorrer los datos.
+
+    Args:
+        features (Sequence[str]): Nombres de las variables, en el orden de las columnas.
+    """
+
+    def __init__(self, features: Sequence[str]):
+        self.features = list(features)
+        self.clases: List = []
+        p = len(self.features)
+        self.conteos = np.zeros((0, p))
+        self.sumas = np.zeros((0, p))
+        self.cuadrados = np.zeros((0, p))
+
+    def _filas_clases(self, clases) -> np.ndarray:
+        """Fila de cada clase en los acumuladores, añadiendo las clases nuevas."""
+        filas = []
+        for clase in clases:
+            if clase not in self.clases:
+                self.clases.append(clase)
+                vacia = np.zeros((1, len(self.features)))
+                self.conteos = np.vstack([self.conteos, vacia])
+                self.sumas = np.vstack([self.sumas, vacia])
+                self.cuadrados = np.vstack([self.cuadrados, vacia])
+            filas.append(self.clases.index(clase))
+        return np.array(filas, dtype=np.int64)
+
+    def actualizar(self, X, y) -> 'AnovaF':
+        """
+        Añade un bloque de filas.
+
+        Args:
+            X (pd.DataFrame | np.ndarray): Bloque (filas x variables) en el orden de `features`.
+            y (array-like): Clase de cada fila. Las filas con clase nula se ignoran.
+        """
+        if isinstance(X, pd.DataFrame):
+            X = X[self.features]
+        X = np.asarray(X, dtype=np.float64)
+        y = pd.Series(np.asarray(y))
+        validas = y.notna().to_numpy()
+        if not validas.all():
+            X, y = X[validas], y[validas]
+
+        codigos, clases = pd.factorize(y, sort=True)
+        filas = self._filas_clases(clases)
+
+        # Indicadora clase x fila: los tres acumuladores salen de productos matriciales
+        indicadora = np.zeros((len(clases), len(codigos)))
+        indicadora[codigos, np.arange(len(codigos))] = 1.0
+        nulos = np.isnan(X)
+        X = np.where(nulos, 0.0, X)
+
+        self.conteos[filas] += indicadora @ ~nulos
+        self.sumas[filas] += indicadora @ X
+        self.cuadrados[filas] += indicadora @ (X * X)
+        return self
+
+    def fusionar(self, otro: 'AnovaF') -> 'AnovaF':
+        """Suma los estadísticos de otro acumulador con las mismas variables."""
+        if otro.features != self.features:
+            raise ValueError("Solo se pueden fusionar acumuladores con las mismas variables")
+        filas = self._filas_clases(otro.clases)
+        self.conteos[filas] += otro.conteos
+        self.sumas[filas] += otro.sumas
+        self.cuadrados[filas] += otro.cuadrados
+        return self
+
+    def puntuaciones(self):
+        """
+        Estadístico F y p-valor de cada variable (mismas fórmulas que `scipy.stats.f_oneway`
+        aplicadas por `f_classif`).
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: F y p-valor, en el orden de `features`.
+        """
+        n = self.conteos.sum(axis=0)
+        suma_total = self.sumas.sum(axis=0)
+        presentes = self.conteos > 0
+        n_clases = presentes.sum(axis=0)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            sstot = self.cuadrados.sum(axis=0) - suma_total ** 2 / n
+            ssbn = np.where(presentes, self.sumas ** 2 / self.conteos, 0.0).sum(axis=0) - suma_total ** 2 / n
+            sswn = sstot - ssbn
+            dfbn = n_clases - 1
+            dfwn = n - n_clases
+            f = (ssbn / dfbn) / (sswn / dfwn)
+        p_valor = special.fdtrc(dfbn, dfwn, f)
+        return f, p_valor
+
+    def tabla(self) -> pd.DataFrame:
+        """
+        Ranking completo de variables, de mayor a menor F.
+
+        Las filas están en el mismo orden en que `SelectKBest(f_classif)` elige variables (un F
+        nulo cuenta como el menor posible y, a igual F, gana la columna posterior), de modo que
+        las k primeras filas son la selección para cualquier k.
+
+        Returns:
+            pd.DataFrame: Columnas 'Feature', 'F_Score', 'P_Value' y 'Rank' (1 = mejor).
+        """
+        f, p_valor = self.puntuaciones()
+        limpias = np.where(np.isnan(f), np.finfo(np.float64).min, f)
+        orden = np.argsort(limpias, kind='mergesort')[::-1]
+        return pd.DataFrame({
+            'Feature': np.asarray(self.features, dtype=object)[orden],
+            'F_Score': f[orden],
+            'P_Value': p_valor[orden],
+            'Rank': np.arange(1, len(orden) + 1)
+        })
+
+    def mejores(self, k: Union[int, str]) -> List[str]:
+        """
+        Las `k` mejores variables, en el orden original de las columnas.
+
+        Mismo contrato que `SelectKBest`: k='all' devuelve todas las variables y un `k` mayor que
+        su número avisa y también las devuelve todas.
+        """
+        if isinstance(k, str):
+            if k != 'all':
+                raise ValueError(f"k debe ser un entero no negativo o 'all', no '{k}'")
+            return list(self.features)
+        if isinstance(k, bool) or not isinstance(k, (int, np.integer)) or k < 0:
+            raise ValueError(f"k debe ser un entero no negativo o 'all', no {k!r}")
+        if k > len(self.features):
+            warnings.warn(f"k={k} es mayor que el número de variables ({len(self.features)}). "
+                          "Se devuelven todas las variables.")
+        seleccion = set(self.tabla()['Feature'].iloc[:k])
+        return [f for f in self.features if f in seleccion]
+
+
+@instrumentar
+def anova_f_streaming(origen: Union[str, DatasetCacheado, Iterable[pd.DataFrame]], target: str,
+                      features: Optional[Sequence[str]] = None, chunksize: int = 100_000,
+                      **kwargs_csv) -> AnovaF:
+    """
+    Acumula el ANOVA F de un CSV, un dataset cacheado o cualquier iterable de DataFrames
+    (p. ej. particiones por año) recorriéndolo una sola vez.
+
+    Args:
+        origen: Ruta del CSV, `DatasetCacheado` o iterable de trozos.
+        target (str): Columna objetivo.
+        features (Sequence[str], optional): Variables a puntuar. Por defecto, todas las numéricas
+            del primer trozo salvo el target.
+        chunksize (int): Filas por trozo al leer un CSV o un dataset cacheado.
+        **kwargs_csv: Argumentos adicionales para `pd.read_csv`.
+
+    Returns:
+        AnovaF: El acumulador, del que se obtiene `tabla()` o `mejores(k)`.
+    """
+    trozos = _leer_trozos(origen, chunksize, **kwargs_csv) if isinstance(origen, (str, DatasetCacheado)) else origen
+
+    acumulador = None
+    for trozo in trozos:
+        if acumulador is None:
+            if features is None:
+                features = [c for c in trozo.select_dtypes(include=['number']).columns if c != target]
+            acumulador = AnovaF(features)
+        acumulador.actualizar(trozo[list(features)], trozo[target])
+
+    if acumulador is None:
+        raise ValueError("No hay datos para calcular el ANOVA F")
+    return acumulador
@@ -0,0 +1,191 @@
+import numpy as np
+from typing import List, Optional
+
+# Constantes de splitmix64 para mezclar los bits de cada valor
+_SEMILLA = np.uint64(0x9E3779B97F4A7C15)
+_MEZCLA_1 = np.uint64(0xBF58476D1CE4E5B9)
+_MEZCLA_2 = np.uint64(0x94D049BB133111EB)
+
+
+def _hash64(valores: np.ndarray) -> np.ndarray:
+    """
+    Hash de 64 bits de cada valor numérico (los valores se tratan como float64).
+    """
+    valores = np.asarray(valores, dtype=np.float64) + 0.0  # -0.0 y 0.0 tienen el mismo hash
+    z = valores.view(np.uint64)
+    z += _SEMILLA
+    z ^= z >> np.uint64(30)
+    z *= _MEZCLA_1
+    z ^= z >> np.uint64(27)
+    z *= _MEZCLA_2
+    z ^= z >> np.uint64(31)
+    return z
+
+
+class HyperLogLog:
+    """
+    Bosquejo HyperLogLog para estimar el número de valores distintos de varias columnas a la vez.
+
+    Los registros de todas las columnas se guardan en una sola matriz (columnas x 2^precision),
+    de modo que actualizar con un bloque de filas es una única operación vectorizada. Dos bosquejos
+    con la misma precisión se fusionan con un máximo elemento a elemento, lo que permite procesar
+    los datos por trozos. El error relativo típico es 1.04 / sqrt(2^precision).
+
+    Args:
+        n_columnas (int): Número de columnas a seguir.
+        precision (int): Bits usados para elegir el registro (entre 4 y 18).
+    """
+
+    def __init__(self, n_columnas: int, precision: int = 12):
+        if not 4 <= precision <= 18:
+            raise ValueError(f"precision debe estar entre 4 y 18: {precision}")
+        self.precision = precision
+        self.m = 1 << precision
+        self.registros = np.zeros((n_columnas, self.m), dtype=np.uint8)
+
+    def actualizar(self, matriz: np.ndarray) -> 'HyperLogLog':
+        """
+        Añade un bloque de filas al bosquejo. Los NaN se ignoran.
+
+        Args:
+            matriz (np.ndarray): Bloque (filas x columnas), en el mismo orden de columnas.
+        """
+        matriz = np.asarray(matriz, dtype=np.float64)
+        if matriz.ndim == 1:
+            matriz = matriz.reshape(-1, 1)
+
+        hashes = _hash64(matriz)
+        indice = (hashes & np.uint64(self.m - 1)).astype(np.int64)
+        indice += np.arange(matriz.shape[1], dtype=np.int64) * self.m
+        resto = hashes >> np.uint64(self.precision)
+
+        # Rango = posición del primer bit a 1 (ceros finales + 1), aislando el bit más bajo
+        bit_bajo = resto & (~resto + np.uint64(1))
+        rango = np.frexp(bit_bajo.astype(np.float64))[1].astype(np.uint8)
+        rango[resto == 0] = 64 - self.precision + 1
+        # Un rango 0 no modifica el registro: así se ignoran los NaN sin copiar la matriz
+        rango[np.isnan(matriz)] = 0
+
+        np.maximum.at(self.registros.reshape(-1), indice.ravel(), rango.ravel())
+        return self
+
+    def fusionar(self, otro: 'HyperLogLog') -> 'HyperLogLog':
+        """Combina con otro bosquejo de las mismas columnas y precisión."""
+        if otro.registros.shape != self.registros.shape:
+            raise ValueError("Solo se pueden fusionar bosquejos con las mismas columnas y precisión")
+        np.maximum(self.registros, otro.registros, out=self.registros)
+        return self
+
+    def estimar(self) -> np.ndarray:
+        """
+        Estima el número de valores distintos de cada columna.
+
+        Returns:
+            np.ndarray: Estimación por columna.
+        """
+        m = self.m
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimacion = alpha * m * m / np.sum(np.exp2(-self.registros.astype(np.float64)), axis=1)
+
+        # Corrección para cardinalidades pequeñas (conteo lineal)
+        vacios = np.sum(self.registros == 0, axis=1)
+        with np.errstate(divide='ignore'):
+            lineal = m * np.log(m / np.maximum(vacios, 1))
+        pequenas = (estimacion <= 2.5 * m) & (vacios > 0)
+        return np.where(pequenas, lineal, estimacion)
+
+
+class KLL:
+    """
+    Bosquejo de cuantiles KLL para una columna numérica.
+
+    Guarda una jerarquía de compactadores: el nivel h contiene muestras de peso 2^h y, cuando
+    supera su capacidad, se ordena y se promueve la mitad de sus elementos (pares o impares, al
+    azar) al nivel siguiente. Dos bosquejos se fusionan concatenando sus niveles, lo que permite
+    procesar los datos por trozos. La memoria es O(k) independientemente del número de valores.
+
+    Args:
+        error (float): Error de rango aproximado de los cuantiles (p. ej. 0.01 = 1% de las filas).
+        semilla (int, optional): Semilla del generador usado al compactar.
+    """
+
+    def __init__(self, error: float = 0.01, semilla: Optional[int] = 0):
+        if not 0 < error < 1:
+            raise ValueError(f"error debe estar entre 0 y 1: {error}")
+        self.error = error
+        self.k = max(8, int(np.ceil(3.3 / error)))
+        self.n = 0
+        self.niveles: List[np.ndarray] = [np.empty(0)]
+        self._rng = np.random.default_rng(semilla)
+
+    def _capacidad(self, nivel: int) -> int:
+        profundidad = len(self.niveles) - nivel - 1
+        return max(2, int(np.ceil(self.k * (2 / 3) ** profundidad)))
+
+    def _compactar(self):
+        h = 0
+        while h < len(self.niveles):
+            nivel = self.niveles[h]
+            if len(nivel) > self._capacidad(h):
+                if h + 1 == len(self.niveles):
+                    self.niveles.append(np.empty(0))
+                nivel = np.sort(nivel)
+                # Con un número impar de elementos el mayor se queda en el nivel
+                sobrante = nivel[len(nivel) - len(nivel) % 2:]
+                promovidos = nivel[self._rng.integers(2):len(nivel) - len(sobrante):2]
+                self.niveles[h] = sobrante
+                self.niveles[h + 1] = np.concatenate([self.niveles[h + 1], promovidos])
+            h += 1
+
+    def actualizar(self, valores: np.ndarray) -> 'KLL':
+        """Añade valores al bosquejo. Los NaN se ignoran."""
+        valores = np.asarray(valores, dtype=np.float64).ravel()
+        valores = valores[~np.isnan(valores)]
+        self.n += len(valores)
+        self.niveles[0] = np.concatenate([self.niveles[0], valores])
+        self._compactar()
+        return self
+
+    def fusionar(self, otro: 'KLL') -> 'KLL':
+        """Combina con otro bosquejo (el resultado conserva el `k` de este)."""
+        for h, nivel in enumerate(otro.niveles):
+            if h == len(self.niveles):
+                self.niveles.append(np.empty(0))
+            self.niveles[h] = np.concatenate([self.niveles[h], nivel])
+        self.n += otro.n
+        self._compactar()
+        return self
+
+    def cuantiles(self, q, valor_extra: float = np.nan, peso_extra: int = 0) -> np.ndarray:
+        """
+        Cuantiles aproximados con interpolación lineal, como `np.quantile`. Mientras no se haya
+        compactado nada el resultado es exacto.
+
+        Args:
+            q (array-like): Cuantiles a calcular, entre 0 y 1.
+            valor_extra (float): Valor que se añade `peso_extra` veces a los datos antes de
+                consultar (p. ej. la mediana con la que se imputarán los nulos).
+            peso_extra (int): Número de repeticiones de `valor_extra`.
+
+        Returns:
+            np.ndarray: Un valor por cuantil (NaN si el bosquejo está vacío).
+        """
+        q = np.asarray(q, dtype=np.float64)
+        valores = [nivel for nivel in self.niveles]
+        pesos = [np.full(len(nivel), 2 ** h, dtype=np.int64) for h, nivel in enumerate(self.niveles)]
+        if peso_extra > 0 and not np.isnan(valor_extra):
+            valores.append(np.array([valor_extra]))
+            pesos.append(np.array([peso_extra], dtype=np.int64))
+
+        valores = np.concatenate(valores)
+        if len(valores) == 0:
+            return np.full(q.shape, np.nan)
+        pesos = np.concatenate(pesos)
+        orden = np.argsort(valores, kind='stable')
+        valores, pesos = valores[orden], pesos[orden]
+
+        # Cada muestra ocupa los rangos [inicio, inicio + peso - 1] de los datos completos
+        fin = np.cumsum(pesos) - 1
+        inicio = fin - pesos + 1
+        rangos = np.column_stack([inicio, fin]).ravel().astype(np.float64)
+        return np.interp(q * fin[-1], rangos, np.repeat(valores, 2))
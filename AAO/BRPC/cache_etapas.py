@@ -0,0 +1,273 @@
+import functools
+import hashlib
+import inspect
+import os
+import pickle
+import threading
+import types
+from typing import Any, Callable, Dict, Optional, Set
+
+import pandas as pd
+import numpy as np
+
+from .cargador import DatasetCacheado
+
+
+def _alimentar(h, obj: Any):
+    """Añade `obj` al hash. Los arrays y DataFrames se recorren por sus bytes, sin serializarlos."""
+    if isinstance(obj, DatasetCacheado):
+        # El contenido ya está identificado por el hash del CSV de origen
+        h.update(b'dataset')
+        h.update(repr((obj.meta['sha256'], obj.meta['kwargs_csv'], obj.float32)).encode())
+    elif isinstance(obj, np.ndarray):
+        h.update(b'ndarray')
+        h.update(repr((obj.dtype.str, obj.shape)).encode())
+        if obj.dtype.hasobject:
+            _alimentar(h, pd.util.hash_array(obj.ravel()))
+        else:
+            h.update(np.ascontiguousarray(obj).view(np.uint8).data)
+    elif isinstance(obj, pd.DataFrame):
+        h.update(b'dataframe')
+        _alimentar(h, list(obj.columns))
+        _alimentar(h, obj.index)
+        for col in obj.columns:
+            _alimentar(h, obj[col])
+    elif isinstance(obj, pd.Series):
+        h.update(b'series')
+        _alimentar(h, (obj.name, str(obj.dtype)))
+        if isinstance(obj.dtype, np.dtype) and not obj.dtype.hasobject:
+            _alimentar(h, obj.to_numpy())
+        else:
+            _alimentar(h, pd.util.hash_pandas_object(obj, index=False).to_numpy())
+    elif isinstance(obj, pd.Index):
+        h.update(b'index')
+        if isinstance(obj, pd.RangeIndex):
+            h.update(repr((obj.start, obj.stop, obj.step)).encode())
+        else:
+            _alimentar(h, pd.util.hash_pandas_object(obj).to_numpy())
+    elif isinstance(obj, (list, tuple)):
+        h.update(type(obj).__name__.encode())
+        h.update(str(len(obj)).encode())
+        for elemento in obj:
+            _alimentar(h, elemento)
+    elif isinstance(obj, dict):
+        h.update(b'dict')
+        for clave in sorted(obj, key=repr):
+            _alimentar(h, clave)
+            _alimentar(h, obj[clave])
+    elif obj is None or isinstance(obj, (str, bytes, int, float, bool, np.generic)):
+        h.update(repr((type(obj).__name__, obj)).encode())
+    else:
+        h.update(pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def huella(*args, **kwargs) -> str:
+    """
+    Huella (BLAKE2b de 128 bits) del contenido de los argumentos.
+
+    Returns:
+        str: La huella en hexadecimal.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    _alimentar(h, args)
+    _alimentar(h, kwargs)
+    return h.hexdigest()
+
+
+def _identidad_codigo(codigo: types.CodeType) -> tuple:
+    """Bytecode, constantes (con los objetos de código anidados) y nombres usados por el código."""
+    constantes = tuple(_identidad_codigo(c) if isinstance(c, types.CodeType) else c for c in codigo.co_consts)
+    return codigo.co_code, constantes, codigo.co_names
+
+
+_TIPOS_SIMPLES = (str, bytes, int, float, bool, complex, type(None), tuple, frozenset)
+
+
+def _identidad_funcion(funcion: Callable, vistos: Optional[Set[int]] = None) -> tuple:
+    """
+    Identidad de una función para la clave de la caché: su código, sus valores por defecto y,
+    recursivamente, las funciones y constantes globales que usa.
+    """
+    vistos = set() if vistos is None else vistos
+    # Las funciones decoradas (p. ej. con `instrumentar`) se identifican por su código original
+    funcion = inspect.unwrap(funcion)
+    nombre = (getattr(funcion, '__module__', ''), getattr(funcion, '__qualname__', repr(funcion)))
+    codigo = getattr(funcion, '__code__', None)
+    if codigo is None or id(funcion) in vistos:
+        return nombre
+    vistos.add(id(funcion))
+
+    globales = getattr(funcion, '__globals__', {})
+    usados = []
+    for n in codigo.co_names:
+        if n not in globales:
+            continue
+        valor = globales[n]
+        if isinstance(valor, types.FunctionType):
+            usados.append((n, _identidad_funcion(valor, vistos)))
+        elif isinstance(valor, _TIPOS_SIMPLES):
+            usados.append((n, repr(valor)))
+
+    return (nombre, _identidad_codigo(codigo), repr(getattr(funcion, '__defaults__', None)),
+            repr(getattr(funcion, '__kwdefaults__', None)), tuple(usados))
+
+
+@functools.lru_cache(maxsize=None)
+def _huella_fuentes_brpc() -> str:
+    """Huella de los fuentes del paquete: cualquier cambio interno de BRPC invalida la caché."""
+    h = hashlib.blake2b(digest_size=16)
+    raiz = os.path.dirname(os.path.abspath(__file__))
+    for carpeta, subcarpetas, archivos in os.walk(raiz):
+        subcarpetas[:] = sorted(d for d in subcarpetas if d != '__pycache__')
+        for archivo in sorted(archivos):
+            if archivo.endswith('.py'):
+                ruta = os.path.join(carpeta, archivo)
+                h.update(os.path.relpath(ruta, raiz).encode())
+                with open(ruta, 'rb') as f:
+                    h.update(f.read())
+    return h.hexdigest()
+
+
+def _huella_modulo(funcion: Callable) -> str:
+    """Huella del archivo fuente donde se define la función ('' si no tiene, p. ej. en un notebook)."""
+    try:
+        ruta = inspect.getsourcefile(inspect.unwrap(funcion))
+    except TypeError:
+        return ''
+    if not ruta or not os.path.isfile(ruta):
+        return ''
+    with open(ruta, 'rb') as f:
+        return hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+
+
+class CacheEtapas:
+    """
+    Caché en disco de resultados de etapas de BRPC, direccionada por contenido.
+
+    La clave de cada resultado es la huella del código de la función (bytecode, constantes, valores
+    por defecto y las funciones y constantes globales que usa), del archivo donde está definida,
+    de los fuentes de BRPC, de los datos de entrada y de los parámetros, así que un cambio en
+    cualquiera de ellos produce una clave nueva y no se devuelve un resultado obsoleto. Las
+    entradas que no se pueden leer (p. ej. de una clase renombrada) se tratan como fallos y se
+    borran. Los resultados se guardan con pickle (protocolo binario más reciente) y, cuando el
+    tamaño total supera `max_bytes`, se eliminan los menos usados recientemente.
+
+    Args:
+        directorio (str): Carpeta de la caché.
+        max_bytes (int): Tamaño máximo de la caché en disco.
+
+    Example:
+        >>> cache = CacheEtapas()
+        >>> df_proc = cache.ejecutar(procesado_dataset, df)
+        >>> rsquare = cache.memoizar(varclushi_analisis)(df_proc)
+        >>> cache.estadisticas()
+    """
+
+    EXTENSION = '.pkl'
+
+    def __init__(self, directorio: str = os.path.join('.cache_brpc', 'etapas'), max_bytes: int = 2 * 1024 ** 3):
+        self.directorio = directorio
+        self.max_bytes = max_bytes
+        self.aciertos = 0
+        self.fallos = 0
+        self.desalojos = 0
+        self._lock = threading.Lock()
+        os.makedirs(directorio, exist_ok=True)
+
+    def _ruta(self, clave: str) -> str:
+        return os.path.join(self.directorio, clave + self.EXTENSION)
+
+    def clave(self, funcion: Callable, args: tuple = (), kwargs: Optional[dict] = None) -> str:
+        """Clave de una llamada: identidad de la función y de su código, argumentos y parámetros."""
+        identidad = (_identidad_funcion(funcion), _huella_modulo(funcion), _huella_fuentes_brpc())
+        return huella(identidad, args, kwargs or {})
+
+    def obtener(self, clave: str):
+        """
+        Devuelve (True, resultado) si la clave está en caché y (False, None) si no.
+        """
+        ruta = self._ruta(clave)
+        try:
+            with open(ruta, 'rb') as f:
+                resultado = pickle.load(f)
+        except OSError:
+            with self._lock:
+                self.fallos += 1
+            return False, None
+        except Exception:
+            # Entrada corrupta o guardada con clases que ya no existen: se descarta
+            try:
+                os.remove(ruta)
+            except OSError:
+                pass
+            with self._lock:
+                self.fallos += 1
+            return False, None
+
+        os.utime(ruta)  # la fecha de modificación marca el último uso (LRU)
+        with self._lock:
+            self.aciertos += 1
+        return True, resultado
+
+    def guardar(self, clave: str, resultado):
+        """Guarda un resultado (escritura atómica) y aplica el límite de tamaño."""
+        ruta = self._ruta(clave)
+        temporal = f'{ruta}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(temporal, 'wb') as f:
+            pickle.dump(resultado, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporal, ruta)
+        self._desalojar()
+
+    def _desalojar(self):
+        entradas = []
+        for entrada in os.scandir(self.directorio):
+            if entrada.name.endswith(self.EXTENSION):
+                estado = entrada.stat()
+                entradas.append((estado.st_mtime_ns, estado.st_size, entrada.path))
+
+        total = sum(tamano for _, tamano, _ in entradas)
+        for _, tamano, ruta in sorted(entradas):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(ruta)
+            except OSError:
+                continue
+            total -= tamano
+            with self._lock:
+                self.desalojos += 1
+
+    def ejecutar(self, funcion: Callable, *args, **kwargs):
+        """Llama a `funcion(*args, **kwargs)` o devuelve el resultado guardado de la misma llamada."""
+        clave = self.clave(funcion, args, kwargs)
+        encontrado, resultado = self.obtener(clave)
+        if not encontrado:
+            resultado = funcion(*args, **kwargs)
+            self.guardar(clave, resultado)
+        return resultado
+
+    def memoizar(self, funcion: Callable) -> Callable:
+        """Decorador: versión de `funcion` que pasa por la caché."""
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            return self.ejecutar(funcion, *args, **kwargs)
+        return envoltura
+
+    def estadisticas(self) -> Dict[str, float]:
+        """Aciertos, fallos, tasa de aciertos, desalojos, número de entradas y bytes en disco."""
+        tamanos = [e.stat().st_size for e in os.scandir(self.directorio) if e.name.endswith(self.EXTENSION)]
+        consultas = self.aciertos + self.fallos
+        return {
+            'aciertos': self.aciertos,
+            'fallos': self.fallos,
+            'tasa_aciertos': self.aciertos / consultas if consultas else 0.0,
+            'desalojos': self.desalojos,
+            'entradas': len(tamanos),
+            'bytes': sum(tamanos)
+        }
+
+    def limpiar(self):
+        """Elimina todas las entradas de la caché."""
+        for entrada in os.scandir(self.directorio):
+            if entrada.name.endswith(self.EXTENSION):
+                os.remove(entrada.path)
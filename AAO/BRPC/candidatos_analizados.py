@@ -1,22 +1,23 @@
 import pandas as pd
-import numpy as np
 
-from .analisis_dataset import analisis_dataset
+from .cargador import _como_dataframe, cargar_dataset
+from .correlaciones import pares_correlacionados
+from .instrumentacion import instrumentar
 
+@instrumentar
 def candidatos_analizados(df: pd.DataFrame = None):
     if df is None:
         print("Cargando datos...")
         try:
-            df = pd.read_csv('../dataset/bankruptcy_polish_companies.csv')
+            df = cargar_dataset('../dataset/bankruptcy_polish_companies.csv')
         except FileNotFoundError:
             print("Dataset no encontrado en ../dataset/, intentando ruta local")
             return
+    df = _como_dataframe(df)
 
-    # Procesamiento de datos para manejar NaNs
-    df_clean = analisis_dataset(df)
-    
     # Eliminacion de variables no numericas y objetivo
-    numeric_df = df_clean.select_dtypes(include=['number'])
+    # (el análisis se hace sobre los datos, no sobre el resumen de `analisis_dataset`)
+    numeric_df = df.select_dtypes(include=['number'])
     if 'class' in numeric_df.columns:
         numeric_df = numeric_df.drop(columns=['class'])
     if 'year' in numeric_df.columns:
@@ -30,21 +31,20 @@ def candidatos_analizados(df: pd.DataFrame = None):
     print(f"\nVariables con varianza muy baja (< 0.01): {len(low_variance)}")
     print(low_variance.head())
 
-    # 2. Analisis de correlacion
-    corr_matrix = numeric_df.corr().abs()
-    upper = corr_matrix.where(np.triu(np.ones(corr_matrix.shape), k=1).astype(bool))
-    
-    # Buscar variables con correlacion > 0.9
-    to_drop = [column for column in upper.columns if any(upper[column] > 0.9)]
+    # 2. Analisis de correlacion: solo los pares por encima del umbral y el top 10,
+    # calculados por bloques sin construir la matriz completa
+    aristas, top = pares_correlacionados(numeric_df, umbral=0.9, top_k=10)
+
+    # Variables con correlacion > 0.9 con alguna variable anterior
+    to_drop = numeric_df.columns[numeric_df.columns.isin(aristas['Variable_2'])].tolist()
     print(f"\nVariables con correlacion > 0.9: {len(to_drop)}")
     print(to_drop[:10]) # Show first 10
 
     # 3. Pares específicos
     print("\nTop 10 pares correlacionados:")
-    pairs = (corr_matrix.where(np.triu(np.ones(corr_matrix.shape), k=1).astype(bool))
-             .stack()
-             .sort_values(ascending=False))
-    print(pairs.head(10))
+    pairs = pd.Series(top['Correlacion'].abs().to_numpy(),
+                      index=pd.MultiIndex.from_frame(top[['Variable_1', 'Variable_2']]))
+    print(pairs)
 
 if __name__ == "__main__":
     candidatos_analizados()
@@ -0,0 +1,243 @@
+import hashlib
+import json
+import os
+import shutil
+from typing import Iterator, List, Optional, Sequence, Union
+
+import pandas as pd
+import numpy as np
+
+from .instrumentacion import instrumentar
+
+# Versión del formato de la caché: si cambia, las cachés antiguas se regeneran
+VERSION_CACHE = 1
+ARCHIVO_META = 'meta.json'
+ARCHIVO_FLOTANTES = 'flotantes.npy'
+ARCHIVO_FLOTANTES_32 = 'flotantes_f32.npy'
+
+
+def _sha256(ruta: str, bloque: int = 1 << 20) -> str:
+    h = hashlib.sha256()
+    with open(ruta, 'rb') as f:
+        for trozo in iter(lambda: f.read(bloque), b''):
+            h.update(trozo)
+    return h.hexdigest()
+
+
+def _directorio_por_defecto(ruta: str) -> str:
+    carpeta, nombre = os.path.split(os.path.abspath(ruta))
+    return os.path.join(carpeta, '.cache_brpc', os.path.splitext(nombre)[0])
+
+
+def _leer_meta(directorio: str) -> Optional[dict]:
+    try:
+        with open(os.path.join(directorio, ARCHIVO_META), encoding='utf-8') as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return meta if meta.get('version') == VERSION_CACHE else None
+
+
+def _escribir_meta(directorio: str, meta: dict):
+    temporal = os.path.join(directorio, ARCHIVO_META + '.tmp')
+    with open(temporal, 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False, indent=1)
+    os.replace(temporal, os.path.join(directorio, ARCHIVO_META))
+
+
+def _kwargs_serializables(kwargs_csv: dict) -> dict:
+    # Los argumentos de lectura forman parte de la huella: otros argumentos, otra caché
+    return json.loads(json.dumps(kwargs_csv, default=str, sort_keys=True))
+
+
+def _construir_cache(ruta: str, directorio: str, huella: dict, **kwargs_csv) -> dict:
+    """Parsea el CSV una vez y guarda cada columna en formato .npy."""
+    df = pd.read_csv(ruta, **kwargs_csv)
+
+    if os.path.isdir(directorio):
+        shutil.rmtree(directorio)
+    os.makedirs(directorio)
+
+    columnas = []
+    flotantes = [col for col in df.columns if pd.api.types.is_float_dtype(df[col].dtype)]
+    if flotantes:
+        # Orden Fortran: cada columna es contigua y se puede leer sin copiar
+        matriz = np.asfortranarray(df[flotantes].to_numpy(dtype=np.float64))
+        np.save(os.path.join(directorio, ARCHIVO_FLOTANTES), matriz)
+
+    for i, col in enumerate(df.columns):
+        serie = df[col]
+        if col in flotantes:
+            columnas.append({'nombre': col, 'tipo': 'flotante', 'indice': flotantes.index(col)})
+        elif pd.api.types.is_numeric_dtype(serie.dtype) or pd.api.types.is_bool_dtype(serie.dtype):
+            archivo = f'col_{i}.npy'
+            np.save(os.path.join(directorio, archivo), serie.to_numpy())
+            columnas.append({'nombre': col, 'tipo': 'numerica', 'archivo': archivo})
+        else:
+            # Columnas de texto: códigos enteros (-1 = nulo) + categorías en el meta
+            codigos, categorias = pd.factorize(serie, sort=True)
+            archivo = f'col_{i}_codigos.npy'
+            np.save(os.path.join(directorio, archivo), codigos.astype(np.int32))
+            columnas.append({'nombre': col, 'tipo': 'categorica', 'archivo': archivo,
+                             'categorias': [str(c) for c in categorias]})
+
+    meta = dict(huella, version=VERSION_CACHE, n_filas=len(df), columnas=columnas,
+                kwargs_csv=_kwargs_serializables(kwargs_csv))
+    _escribir_meta(directorio, meta)
+    return meta
+
+
+class DatasetCacheado:
+    """
+    Dataset guardado en una caché columnar de archivos .npy que se abren como memmap.
+
+    Las columnas float64 forman una única matriz en orden Fortran, de modo que tanto una columna
+    suelta como el bloque numérico completo se obtienen sin copiar datos. Se crea con
+    `cargar_dataset`; todas las funciones de BRPC que reciben un DataFrame aceptan también
+    este objeto.
+
+    Args:
+        directorio (str): Carpeta de la caché.
+        meta (dict): Metadatos de la caché.
+        float32 (bool): Si es True las columnas float se leen de la copia en float32.
+    """
+
+    def __init__(self, directorio: str, meta: dict, float32: bool = False):
+        self.directorio = directorio
+        self.meta = meta
+        self.float32 = float32
+        self.n_filas: int = meta['n_filas']
+        self._info = {c['nombre']: c for c in meta['columnas']}
+        self.columnas = pd.Index([c['nombre'] for c in meta['columnas']])
+        self._flotantes = None
+
+    def __len__(self) -> int:
+        return self.n_filas
+
+    @property
+    def shape(self):
+        return self.n_filas, len(self.columnas)
+
+    def _matriz_flotantes(self) -> np.ndarray:
+        if self._flotantes is None:
+            archivo = ARCHIVO_FLOTANTES_32 if self.float32 else ARCHIVO_FLOTANTES
+            self._flotantes = np.load(os.path.join(self.directorio, archivo), mmap_mode='r')
+        return self._flotantes
+
+    def columna(self, nombre: str) -> np.ndarray:
+        """
+        Valores de una columna. Las numéricas se devuelven como memmap de solo lectura; las de
+        texto como códigos enteros (-1 = nulo), con las categorías en `categorias(nombre)`.
+        """
+        info = self._info[nombre]
+        if info['tipo'] == 'flotante':
+            return self._matriz_flotantes()[:, info['indice']]
+        return np.load(os.path.join(self.directorio, info['archivo']), mmap_mode='r')
+
+    def categorias(self, nombre: str) -> List[str]:
+        return self._info[nombre].get('categorias', [])
+
+    def matriz(self, columnas: Optional[Sequence[str]] = None) -> np.ndarray:
+        """
+        Matriz (filas x columnas) de columnas numéricas. Si se piden todas las columnas float
+        (opción por defecto) se devuelve el memmap sin copiar.
+        """
+        flotantes = [c['nombre'] for c in self.meta['columnas'] if c['tipo'] == 'flotante']
+        if columnas is None or list(columnas) == flotantes:
+            return self._matriz_flotantes()
+        return np.column_stack([self.columna(col) for col in columnas])
+
+    def _serie(self, nombre: str, inicio: int = 0, fin: Optional[int] = None) -> pd.Series:
+        valores = self.columna(nombre)[inicio:fin]
+        if self._info[nombre]['tipo'] == 'categorica':
+            valores = pd.Categorical.from_codes(np.asarray(valores), categories=self.categorias(nombre))
+        return pd.Series(valores, name=nombre, copy=False)
+
+    def __getitem__(self, nombre: str) -> pd.Series:
+        return self._serie(nombre)
+
+    def to_frame(self, columnas: Optional[Sequence[str]] = None, inicio: int = 0,
+                 fin: Optional[int] = None) -> pd.DataFrame:
+        """
+        DataFrame con las columnas pedidas (todas por defecto). Las columnas numéricas apuntan
+        directamente al memmap; las de texto se devuelven como categóricas.
+        """
+        columnas = self.columnas if columnas is None else list(columnas)
+        datos = {col: self._serie(col, inicio, fin) for col in columnas}
+        return pd.DataFrame(datos, columns=columnas, copy=False)
+
+    def iter_chunks(self, chunksize: int = 100_000,
+                    columnas: Optional[Sequence[str]] = None) -> Iterator[pd.DataFrame]:
+        """Recorre el dataset en trozos de `chunksize` filas, como `pd.read_csv(chunksize=...)`."""
+        for inicio in range(0, self.n_filas, chunksize):
+            trozo = self.to_frame(columnas, inicio, inicio + chunksize)
+            trozo.index = pd.RangeIndex(inicio, inicio + len(trozo))
+            yield trozo
+
+
+@instrumentar
+def cargar_dataset(ruta: str, float32: bool = False, directorio_cache: Optional[str] = None,
+                   refrescar: bool = False, **kwargs_csv) -> DatasetCacheado:
+    """
+    Carga un CSV a través de una caché columnar en disco.
+
+    La primera vez el CSV se parsea y cada columna se guarda como .npy; las siguientes cargas
+    solo abren los archivos como memmap, sin leer los datos. La caché se invalida si cambia el
+    contenido del archivo: si el tamaño y la fecha de modificación coinciden se reutiliza
+    directamente y, si no, se compara el hash SHA-256 antes de regenerarla.
+
+    Args:
+        ruta (str): Ruta del CSV.
+        float32 (bool): Si es True las columnas float se sirven en float32 (la mitad de memoria).
+        directorio_cache (str, optional): Carpeta de la caché. Por defecto
+            '<carpeta del csv>/.cache_brpc/<nombre del csv>'.
+        refrescar (bool): Fuerza la regeneración de la caché.
+        **kwargs_csv: Argumentos adicionales para `pd.read_csv` (solo se usan al construirla).
+
+    Returns:
+        DatasetCacheado: El dataset cacheado.
+    """
+    directorio = directorio_cache or _directorio_por_defecto(ruta)
+    estado = os.stat(ruta)
+    huella = {'tamano': estado.st_size, 'mtime_ns': estado.st_mtime_ns}
+
+    meta = None if refrescar else _leer_meta(directorio)
+    if meta is not None and meta.get('kwargs_csv') != _kwargs_serializables(kwargs_csv):
+        meta = None
+    if meta is not None and (meta['tamano'], meta['mtime_ns']) != (huella['tamano'], huella['mtime_ns']):
+        sha256 = _sha256(ruta)
+        if meta['sha256'] == sha256:
+            # Mismo contenido (p. ej. el archivo se copió o se tocó): se actualiza la fecha
+            meta.update(huella)
+            _escribir_meta(directorio, meta)
+        else:
+            meta = None
+        huella['sha256'] = sha256
+
+    if meta is None:
+        huella.setdefault('sha256', _sha256(ruta))
+        meta = _construir_cache(ruta, directorio, huella, **kwargs_csv)
+
+    if float32 and not os.path.exists(os.path.join(directorio, ARCHIVO_FLOTANTES_32)):
+        ruta_64 = os.path.join(directorio, ARCHIVO_FLOTANTES)
+        if os.path.exists(ruta_64):
+            np.save(os.path.join(directorio, ARCHIVO_FLOTANTES_32),
+                    np.load(ruta_64, mmap_mode='r').astype(np.float32, order='F'))
+
+    return DatasetCacheado(directorio, meta, float32=float32)
+
+
+def _como_dataframe(datos: Union[pd.DataFrame, DatasetCacheado, str]) -> pd.DataFrame:
+    """Convierte la entrada de las funciones de BRPC en DataFrame (un CSV se carga vía caché)."""
+    if isinstance(datos, DatasetCacheado):
+        return datos.to_frame()
+    if isinstance(datos, (str, os.PathLike)):
+        return cargar_dataset(datos).to_frame()
+    return datos
+
+
+def _leer_trozos(origen: Union[str, DatasetCacheado], chunksize: int, **kwargs_csv) -> Iterator[pd.DataFrame]:
+    """Trozos de un CSV o de un dataset cacheado, para las funciones por trozos."""
+    if isinstance(origen, DatasetCacheado):
+        return origen.iter_chunks(chunksize, columnas=kwargs_csv.get('usecols'))
+    return pd.read_csv(origen, chunksize=chunksize, **kwargs_csv)
@@ -0,0 +1,116 @@
+import pandas as pd
+import numpy as np
+from typing import Iterator, Optional, Tuple
+
+from .cargador import _como_dataframe
+from .instrumentacion import instrumentar
+
+
+def _estandarizar(matriz: np.ndarray, dtype=np.float32) -> np.ndarray:
+    """
+    Centra cada columna y la divide por su norma, de modo que Z.T @ Z es la matriz de correlación.
+    Los nulos se imputan con la media (aportan 0) y las columnas constantes quedan a NaN.
+    """
+    matriz = np.asarray(matriz, dtype=np.float64)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        media = np.nanmean(matriz, axis=0)
+        z = np.where(np.isnan(matriz), 0.0, matriz - media)
+        norma = np.sqrt(np.einsum('ij,ij->j', z, z))
+        z /= np.where(norma > 0, norma, np.nan)
+    return z.astype(dtype, copy=False)
+
+
+def _bloques_correlacion(z: np.ndarray, tam_bloque: int) -> Iterator[Tuple[int, int, np.ndarray]]:
+    """
+    Recorre el triángulo superior de la matriz de correlación por bloques (un GEMM por bloque),
+    sin materializar la matriz completa. Las posiciones de la diagonal y por debajo valen NaN.
+    """
+    p = z.shape[1]
+    for i0 in range(0, p, tam_bloque):
+        zi = z[:, i0:i0 + tam_bloque]
+        for j0 in range(i0, p, tam_bloque):
+            bloque = zi.T @ z[:, j0:j0 + tam_bloque]
+            if i0 == j0:
+                bloque[np.tril_indices(bloque.shape[0], m=bloque.shape[1])] = np.nan
+            yield i0, j0, bloque
+
+
+@instrumentar
+def pares_correlacionados(df: pd.DataFrame, umbral: Optional[float] = 0.9, top_k: int = 10,
+                          tam_bloque: int = 1024, dtype=np.float32) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Busca los pares de variables numéricas con correlación alta sin construir la matriz completa.
+
+    Los datos se estandarizan una vez y las correlaciones se calculan por bloques de columnas
+    con productos matriciales (BLAS) en `dtype`. De cada bloque solo se guardan los pares que
+    superan el umbral (lista de aristas dispersa) y los `top_k` mejores mediante selección
+    parcial (`np.argpartition`), sin ordenar todos los pares. Los nulos se imputan con la media
+    de la columna, por lo que con datos incompletos el resultado se aproxima al de
+    `df.corr()` (que usa los pares completos).
+
+    Args:
+        df (pd.DataFrame): DataFrame con variables numéricas (el resto de columnas se ignora).
+        umbral (float, optional): Correlación absoluta mínima de las aristas. None para no
+            devolver aristas.
+        top_k (int): Número de pares con mayor correlación absoluta a devolver.
+        tam_bloque (int): Columnas por bloque; la memoria de trabajo es tam_bloque^2 valores.
+        dtype: Precisión del cálculo (float32 por defecto, float64 para resultados exactos).
+
+    Returns:
+        Tuple[pd.DataFrame, pd.DataFrame]:
+            - Aristas con |correlación| > umbral: columnas 'Variable_1', 'Variable_2' y
+              'Correlacion' (con signo), con Variable_1 antes que Variable_2 en `df`.
+            - Los `top_k` pares de mayor |correlación|, mismas columnas, ordenados de mayor a menor.
+    """
+    df = _como_dataframe(df)
+    numeric_df = df.select_dtypes(include=['number'])
+    columnas = numeric_df.columns
+    z = _estandarizar(numeric_df.to_numpy(dtype=np.float64, na_value=np.nan), dtype)
+
+    filas, cols, valores = [], [], []
+    mejor_fila = np.empty(0, dtype=np.int64)
+    mejor_col = np.empty(0, dtype=np.int64)
+    mejor_valor = np.empty(0, dtype=dtype)
+
+    for i0, j0, bloque in _bloques_correlacion(z, tam_bloque):
+        absoluto = np.abs(bloque)
+        absoluto[np.isnan(absoluto)] = -1.0
+
+        if umbral is not None:
+            fi, fj = np.nonzero(absoluto > umbral)
+            filas.append(fi + i0)
+            cols.append(fj + j0)
+            valores.append(bloque[fi, fj])
+
+        if top_k > 0:
+            # Candidatos del bloque + mejores hasta ahora, y nos quedamos con los top_k
+            plano = absoluto.ravel()
+            n_cand = min(top_k, plano.size)
+            cand = np.argpartition(plano, plano.size - n_cand)[plano.size - n_cand:]
+            cand = cand[plano[cand] >= 0]
+            fi, fj = np.divmod(cand, bloque.shape[1])
+            mejor_fila = np.concatenate([mejor_fila, fi + i0])
+            mejor_col = np.concatenate([mejor_col, fj + j0])
+            mejor_valor = np.concatenate([mejor_valor, bloque[fi, fj]])
+            if len(mejor_valor) > top_k:
+                quedan = np.argpartition(np.abs(mejor_valor), len(mejor_valor) - top_k)[-top_k:]
+                mejor_fila, mejor_col, mejor_valor = mejor_fila[quedan], mejor_col[quedan], mejor_valor[quedan]
+
+    def _tabla(fi: np.ndarray, fj: np.ndarray, valor: np.ndarray) -> pd.DataFrame:
+        return pd.DataFrame({
+            'Variable_1': columnas[fi],
+            'Variable_2': columnas[fj],
+            'Correlacion': valor.astype(np.float64)
+        })
+
+    if filas:
+        aristas = _tabla(np.concatenate(filas), np.concatenate(cols), np.concatenate(valores))
+        aristas = aristas.sort_values(['Variable_1', 'Variable_2'], key=lambda s: columnas.get_indexer(s),
+                                      ignore_index=True)
+    else:
+        aristas = _tabla(np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), np.empty(0))
+
+    orden = np.argsort(-np.abs(mejor_valor), kind='stable')
+    top = _tabla(mejor_fila[orden], mejor_col[orden], mejor_valor[orden])
+
+    return aristas, top
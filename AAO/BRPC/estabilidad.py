@@ -0,0 +1,234 @@
+import os
+import pandas as pd
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from ._memoria_compartida import MatrizCompartida, inicializar_proceso, matriz_proceso
+from .agrupador_optimo import AgrupadorOptimo
+from .anova_f import AnovaF
+from .cargador import _como_dataframe
+from .instrumentacion import instrumentar
+from .woe_iv_multiple import EPSILON, _conteos_por_bin, _resultado_woe
+
+# Umbrales habituales del PSI: < 0.1 estable, 0.1-0.25 cambio moderado, > 0.25 cambio significativo
+UMBRALES_PSI = (0.1, 0.25)
+REFERENCIAS = ('global', 'primera')
+
+
+def contribuciones_psi(esperado, actual, epsilon: float = EPSILON) -> np.ndarray:
+    """
+    Aportación de cada bin al PSI: (q - p) * ln(q / p), con p y q las proporciones del bin en la
+    referencia y en la población comparada (más `epsilon` para que los bins vacíos no den log(0)).
+
+    Args:
+        esperado (array-like): Conteos de referencia (..., bins).
+        actual (array-like): Conteos a comparar, con la misma forma o difundible a ella.
+        epsilon (float): Suavizado de las proporciones.
+
+    Returns:
+        np.ndarray: Aportaciones con la forma de la difusión de ambos. NaN si alguna de las dos
+        distribuciones no tiene observaciones.
+    """
+    esperado = np.asarray(esperado, dtype=np.float64)
+    actual = np.asarray(actual, dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        p = esperado / esperado.sum(axis=-1, keepdims=True)
+        q = actual / actual.sum(axis=-1, keepdims=True)
+        return (q - p) * np.log((q + epsilon) / (p + epsilon))
+
+
+def psi(esperado, actual, epsilon: float = EPSILON) -> np.ndarray:
+    """
+    Population Stability Index entre dos distribuciones de conteos por bin: la suma de
+    `contribuciones_psi` en la última dimensión.
+
+    Returns:
+        np.ndarray: PSI de cada distribución. NaN si alguna de las dos no tiene observaciones.
+    """
+    return contribuciones_psi(esperado, actual, epsilon).sum(axis=-1)
+
+
+def clasificar_psi(valores) -> np.ndarray:
+    """Etiqueta 'estable', 'moderada' o 'inestable' según `UMBRALES_PSI` (NaN -> None)."""
+    valores = np.asarray(valores, dtype=np.float64)
+    etiquetas = np.asarray(['estable', 'moderada', 'inestable'], dtype=object)
+    clasificadas = etiquetas[np.searchsorted(UMBRALES_PSI, np.nan_to_num(valores), side='right')]
+    clasificadas[np.isnan(valores)] = None
+    return clasificadas
+
+
+class ResultadoEstabilidad(NamedTuple):
+    """
+    Resultado de `estabilidad_por_particion`.
+
+    Attributes:
+        particiones (List): Valores de la columna de partición, en orden.
+        agrupador (AgrupadorOptimo): Agrupador con los cortes globales aplicados a todas las particiones.
+        tablas (Dict): Por partición, tablas de WoE por variable (mismo formato que `woe_iv_multiple`).
+        iv (pd.DataFrame): IV de cada variable (filas) por partición, más la columna 'Global'.
+        f_score (pd.DataFrame): F de ANOVA de cada variable por partición, más la columna 'Global'.
+        psi (pd.DataFrame): PSI de la distribución de bins de cada partición frente a la referencia.
+        resumen (pd.DataFrame): Una fila por variable con IV global, deriva del IV (mínimo, máximo,
+            rango y desviación entre particiones), PSI máximo, su clasificación y F global;
+            ordenado de mayor a menor IV global.
+    """
+    particiones: List
+    agrupador: AgrupadorOptimo
+    tablas: Dict[object, Dict[str, pd.DataFrame]]
+    iv: pd.DataFrame
+    f_score: pd.DataFrame
+    psi: pd.DataFrame
+    resumen: pd.DataFrame
+
+
+def _estadisticos_particion(matriz: np.ndarray, inicio: int, fin: int, agrupador: AgrupadorOptimo,
+                            n_bins: int) -> Tuple[np.ndarray, np.ndarray, AnovaF]:
+    """
+    Conteos por bin y acumulador del ANOVA de las filas [inicio, fin) de la matriz
+    (filas x (variables + target), ordenada por partición).
+    """
+    bloque = matriz[inicio:fin]
+    y = bloque[:, -1]
+    validas = ~np.isnan(y)
+    X = bloque[:, :-1]
+
+    codigos = agrupador.transform_codigos(X)
+    if validas.all():
+        no_eventos, eventos = _conteos_por_bin(codigos, y, n_bins)
+    else:
+        no_eventos, eventos = _conteos_por_bin(codigos[validas], y[validas], n_bins)
+    anova = AnovaF(agrupador.features_).actualizar(X, y)
+    return no_eventos, eventos, anova
+
+
+def _tarea_particion(limites: Tuple[int, int], agrupador: AgrupadorOptimo,
+                     n_bins: int) -> Tuple[np.ndarray, np.ndarray, AnovaF]:
+    # Ejecutada en los procesos del pool: solo recibe los límites de la partición
+    return _estadisticos_particion(matriz_proceso(), *limites, agrupador, n_bins)
+
+
+@instrumentar
+def estabilidad_por_particion(df: pd.DataFrame, features: Sequence[str], target: str,
+                              particion: str = 'year', agrupador: Optional[AgrupadorOptimo] = None,
+                              max_bins: int = 10, min_bins: int = 3, metodo: str = 'dp',
+                              monotonico: Optional[str] = None, referencia: str = 'global',
+                              n_jobs: Optional[int] = None, tablas: bool = True) -> ResultadoEstabilidad:
+    """
+    Binning, WoE/IV y F de ANOVA por partición (p. ej. por año) con un único juego de cortes,
+    junto con el PSI y la deriva del IV de cada variable.
+
+    Los cortes se ajustan una sola vez sobre todas las filas (o se toman de `agrupador`). Las
+    filas se ordenan por partición y se copian una vez a una matriz de memoria compartida; cada
+    proceso recibe solo los límites (inicio, fin) de su partición, codifica esas filas con los
+    cortes globales y devuelve los conteos por bin y los estadísticos suficientes del ANOVA. Los
+    resultados globales salen de sumar los de las particiones, así que el coste total es el de
+    un ajuste más una pasada de conteo.
+
+    Args:
+        df (pd.DataFrame): DataFrame con las variables, el target y la columna de partición.
+        features (Sequence[str]): Variables numéricas a analizar.
+        target (str): Nombre de la columna objetivo (0/1).
+        particion (str): Columna que define las particiones. Las filas con partición nula se
+            ignoran. Ningún valor puede ser 'Global', que es la columna de los valores globales.
+        agrupador (AgrupadorOptimo, optional): Agrupador ya ajustado cuyos cortes se reutilizan.
+            Si no se indica, se ajusta uno con `max_bins`, `min_bins`, `metodo` y `monotonico`.
+        max_bins (int): Número máximo de bins a crear.
+        min_bins (int): Número mínimo de bins a crear.
+        metodo (str): Algoritmo de cortes, 'arbol' o 'dp' (ver `agrupamiento_optimo`).
+        monotonico (str, optional): Restricción de WoE monótono (solo con metodo='dp').
+        referencia (str): Distribución contra la que se calcula el PSI: 'global' (todas las
+            particiones juntas) o 'primera' (la primera partición en orden).
+        n_jobs (int, optional): Procesos usados en el ajuste y en las particiones. Por defecto,
+            todos los núcleos disponibles. Con 1 se ejecuta en el proceso actual.
+        tablas (bool): Si es False no se construyen las tablas de WoE por partición.
+
+    Returns:
+        ResultadoEstabilidad: Tablas por partición, IV, F y PSI por partición y resumen de estabilidad.
+    """
+    if referencia not in REFERENCIAS:
+        raise ValueError(f"referencia debe ser uno de {REFERENCIAS}, no '{referencia}'")
+
+    df = _como_dataframe(df)
+    features = [f for f in features if f not in (target, particion)]
+    if df[particion].isna().any():
+        df = df[df[particion].notna()]
+    if (df[particion] == 'Global').any():
+        raise ValueError(f"La columna '{particion}' tiene una partición 'Global', nombre reservado "
+                         "para la columna de los valores globales")
+
+    if agrupador is None:
+        agrupador = AgrupadorOptimo(max_bins, min_bins, n_jobs, metodo, monotonico).fit(df, features, target)
+    else:
+        # Solo viajan a cada proceso los cortes de `features`
+        agrupador = agrupador.seleccionar(features)
+    n_bins = max((len(c) + 2 for c in agrupador.cortes_.values()), default=1)
+
+    # Filas ordenadas por partición: cada partición es un bloque contiguo [inicio, fin)
+    codigos_particion, particiones = pd.factorize(df[particion], sort=True)
+    orden = np.argsort(codigos_particion, kind='stable')
+    fines = np.cumsum(np.bincount(codigos_particion, minlength=len(particiones)))
+    limites = list(zip([0, *fines[:-1].tolist()], fines.tolist()))
+
+    matriz = df[features + [target]].to_numpy(dtype=np.float64)[orden]
+
+    if n_jobs is None:
+        n_jobs = os.cpu_count() or 1
+    n_jobs = max(1, min(n_jobs, len(limites)))
+
+    if n_jobs == 1:
+        parciales = [_estadisticos_particion(matriz, inicio, fin, agrupador, n_bins) for inicio, fin in limites]
+    else:
+        with MatrizCompartida(matriz) as compartida:
+            del matriz
+            tarea = partial(_tarea_particion, agrupador=agrupador, n_bins=n_bins)
+            with ProcessPoolExecutor(max_workers=n_jobs, initializer=inicializar_proceso,
+                                     initargs=(compartida.descriptor,)) as executor:
+                parciales = list(executor.map(tarea, limites))
+
+    particiones = particiones.tolist()
+    no_eventos = np.stack([p[0] for p in parciales])
+    eventos = np.stack([p[1] for p in parciales])
+
+    # IV y tablas por partición, y el global sumando los conteos
+    iv = {}
+    tablas_woe = {}
+    for i, valor in enumerate(particiones):
+        tablas_woe[valor], resumen_iv = _resultado_woe(no_eventos[i], eventos[i], features,
+                                                       agrupador.etiquetas_, tablas)
+        iv[valor] = resumen_iv.set_index('Feature')['IV']
+    _, resumen_iv = _resultado_woe(no_eventos.sum(axis=0), eventos.sum(axis=0), features, tablas=False)
+    iv['Global'] = resumen_iv.set_index('Feature')['IV']
+    iv = pd.DataFrame(iv).reindex(features).rename_axis('Feature')
+
+    # F de ANOVA por partición; el global fusiona los acumuladores
+    global_anova = AnovaF(features)
+    f_score = {}
+    for valor, (_, _, anova) in zip(particiones, parciales):
+        f_score[valor] = anova.puntuaciones()[0]
+        global_anova.fusionar(anova)
+    f_score['Global'] = global_anova.puntuaciones()[0]
+    f_score = pd.DataFrame(f_score, index=pd.Index(features, name='Feature'))
+
+    # PSI de la distribución de bins (eventos + no eventos) de cada partición
+    poblacion = no_eventos + eventos
+    base = poblacion.sum(axis=0) if referencia == 'global' else poblacion[0]
+    psi_particion = pd.DataFrame(psi(base, poblacion).T, index=pd.Index(features, name='Feature'),
+                                 columns=particiones)
+
+    iv_particiones = iv[particiones]
+    psi_max = psi_particion.max(axis=1)
+    resumen = pd.DataFrame({
+        'Feature': features,
+        'IV_Global': iv['Global'].to_numpy(),
+        'IV_Min': iv_particiones.min(axis=1).to_numpy(),
+        'IV_Max': iv_particiones.max(axis=1).to_numpy(),
+        'IV_Rango': (iv_particiones.max(axis=1) - iv_particiones.min(axis=1)).to_numpy(),
+        'IV_Desv': iv_particiones.std(axis=1, ddof=0).to_numpy(),
+        'PSI_Max': psi_max.to_numpy(),
+        'Estabilidad': clasificar_psi(psi_max),
+        'F_Global': f_score['Global'].to_numpy()
+    }).sort_values(by='IV_Global', ascending=False).reset_index(drop=True)
+
+    return ResultadoEstabilidad(particiones, agrupador, tablas_woe, iv, f_score, psi_particion, resumen)
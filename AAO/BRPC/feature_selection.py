@@ -1,6 +1,8 @@
 import pandas as pd
 from typing import List
+from .instrumentacion import instrumentar
 
+@instrumentar
 def seleccionar_representantes_clustervers(rsquare_df: pd.DataFrame) -> List[str]:
     """
     Selecciona la variable representativa de cada clúster basándose en el ratio 1-R².
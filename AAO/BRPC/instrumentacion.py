@@ -0,0 +1,237 @@
+import contextlib
+import datetime
+import functools
+import json
+import logging
+import sys
+import threading
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional
+
+import pandas as pd
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+logger = logging.getLogger('BRPC.instrumentacion')
+
+
+class _Estado:
+    activa = False
+    memoria = False
+    inicio_tracemalloc = False
+    sumideros: List[Callable[[Dict], None]] = []
+
+
+_estado = _Estado()
+_pila = threading.local()
+
+
+def rss_maximo() -> Optional[int]:
+    """Pico de memoria residente del proceso en bytes (None si el sistema no lo expone)."""
+    if resource is None:
+        return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux lo da en KiB y macOS en bytes
+    return pico if sys.platform == 'darwin' else pico * 1024
+
+
+def _forma(args: tuple) -> tuple:
+    """(filas, columnas) del primer argumento tabular (DataFrame, Series, array, dataset cacheado)."""
+    for arg in args[:2]:
+        forma = getattr(arg, 'shape', None)
+        if isinstance(forma, tuple) and forma:
+            return forma[0], (forma[1] if len(forma) > 1 else 1)
+    return None, None
+
+
+class SumideroMemoria:
+    """Guarda los registros en una lista (`registros`); `tabla()` los devuelve como DataFrame."""
+
+    def __init__(self):
+        self.registros: List[Dict] = []
+        self._lock = threading.Lock()
+
+    def __call__(self, registro: Dict):
+        with self._lock:
+            self.registros.append(registro)
+
+    def tabla(self) -> pd.DataFrame:
+        return pd.DataFrame(self.registros)
+
+    def limpiar(self):
+        with self._lock:
+            self.registros.clear()
+
+
+class SumideroJSONL:
+    """Añade cada registro como una línea JSON al archivo `ruta`."""
+
+    def __init__(self, ruta: str):
+        self.ruta = ruta
+        self._lock = threading.Lock()
+
+    def __call__(self, registro: Dict):
+        linea = json.dumps(registro, ensure_ascii=False, default=str)
+        with self._lock, open(self.ruta, 'a', encoding='utf-8') as f:
+            f.write(linea + '\n')
+
+
+def activar(*sumideros: Callable[[Dict], None], memoria: bool = True):
+    """
+    Activa la instrumentación de las etapas de BRPC.
+
+    Cada etapa registra tiempo real y de CPU, forma de la entrada, filas por segundo, pico de RSS
+    del proceso y, con `memoria`, la variación y el pico de memoria trazada por `tracemalloc`
+    (que tiene un coste apreciable). Los registros se emiten por el logger
+    'BRPC.instrumentacion' (nivel INFO) y se pasan a cada sumidero.
+
+    Args:
+        *sumideros: Funciones que reciben cada registro (dict), p. ej. `SumideroMemoria()` o
+            `SumideroJSONL(ruta)`.
+        memoria (bool): Si se mide la memoria con `tracemalloc`.
+    """
+    _estado.sumideros = list(sumideros)
+    _estado.memoria = memoria
+    if memoria and not tracemalloc.is_tracing():
+        tracemalloc.start()
+        _estado.inicio_tracemalloc = True
+    _estado.activa = True
+
+
+def desactivar():
+    """Desactiva la instrumentación (y `tracemalloc` si la activó `activar`)."""
+    _estado.activa = False
+    if _estado.inicio_tracemalloc and tracemalloc.is_tracing():
+        tracemalloc.stop()
+    _estado.inicio_tracemalloc = False
+    _estado.sumideros = []
+    _estado.memoria = False
+
+
+def esta_activa() -> bool:
+    return _estado.activa
+
+
+@contextlib.contextmanager
+def instrumentacion_activa(*sumideros: Callable[[Dict], None], memoria: bool = True):
+    """
+    Activa la instrumentación dentro de un bloque `with`.
+
+    Example:
+        >>> sumidero = SumideroMemoria()
+        >>> with instrumentacion_activa(sumidero):
+        ...     df_proc = procesado_dataset(df)
+        >>> sumidero.tabla()[['etapa', 'segundos', 'filas_por_segundo']]
+    """
+    activar(*sumideros, memoria=memoria)
+    try:
+        yield
+    finally:
+        desactivar()
+
+
+@contextlib.contextmanager
+def medir_etapa(nombre: str, filas: Optional[int] = None, columnas: Optional[int] = None):
+    """
+    Mide un bloque de código como una etapa. Sin instrumentación activa no hace nada.
+
+    Las etapas anidadas registran su etapa padre y su nivel; el pico de memoria de cada etapa
+    incluye el de sus etapas internas.
+
+    Args:
+        nombre (str): Nombre de la etapa.
+        filas (int, optional): Filas procesadas (para el rendimiento en filas por segundo).
+        columnas (int, optional): Columnas de la entrada.
+    """
+    if not _estado.activa:
+        yield
+        return
+
+    pila = getattr(_pila, 'etapas', None)
+    if pila is None:
+        pila = _pila.etapas = []
+    memoria = _estado.memoria and tracemalloc.is_tracing()
+    marco = {'pico': 0}
+    if memoria:
+        actual, pico = tracemalloc.get_traced_memory()
+        if pila:
+            # Antes de reiniciar el pico se guarda el de la etapa padre hasta este momento
+            pila[-1]['pico'] = max(pila[-1]['pico'], pico)
+        tracemalloc.reset_peak()
+        marco['memoria_inicial'] = actual
+    padre = pila[-1]['nombre'] if pila else None
+    marco['nombre'] = nombre
+    pila.append(marco)
+
+    inicio = datetime.datetime.now().isoformat(timespec='milliseconds')
+    t0, c0 = time.perf_counter(), time.process_time()
+    error = None
+    try:
+        yield
+    except BaseException as e:
+        error = type(e).__name__
+        raise
+    finally:
+        segundos = time.perf_counter() - t0
+        registro = {
+            'etapa': nombre,
+            'padre': padre,
+            'nivel': len(pila) - 1,
+            'inicio': inicio,
+            'segundos': segundos,
+            'segundos_cpu': time.process_time() - c0,
+            'filas': filas,
+            'columnas': columnas,
+            'filas_por_segundo': filas / segundos if filas and segundos > 0 else None,
+            'rss_max_bytes': rss_maximo()
+        }
+        pila.pop()
+        if memoria and tracemalloc.is_tracing():
+            actual, pico = tracemalloc.get_traced_memory()
+            pico = max(pico, marco['pico'])
+            if pila:
+                pila[-1]['pico'] = max(pila[-1]['pico'], pico)
+            registro['memoria_delta_bytes'] = actual - marco['memoria_inicial']
+            registro['pico_incremento_bytes'] = pico - marco['memoria_inicial']
+        if error is not None:
+            registro['error'] = error
+        _emitir(registro)
+
+
+def _emitir(registro: Dict):
+    logger.info("%s: %.3f s (CPU %.3f s), filas=%s, columnas=%s", registro['etapa'], registro['segundos'],
+                registro['segundos_cpu'], registro['filas'], registro['columnas'], extra={'etapa': registro})
+    for sumidero in _estado.sumideros:
+        try:
+            sumidero(registro)
+        except Exception:
+            logger.exception("Error en el sumidero de instrumentación %r", sumidero)
+
+
+def instrumentar(funcion: Callable = None, *, nombre: Optional[str] = None) -> Callable:
+    """
+    Decorador que mide cada llamada a `funcion` como una etapa (ver `medir_etapa`).
+
+    La forma de la entrada se toma del primer argumento tabular. Con la instrumentación
+    desactivada el coste es una comprobación de un atributo por llamada.
+
+    Args:
+        funcion (Callable): Función o método a instrumentar.
+        nombre (str, optional): Nombre de la etapa. Por defecto, el nombre cualificado.
+    """
+    if funcion is None:
+        return functools.partial(instrumentar, nombre=nombre)
+    etapa = nombre or funcion.__qualname__
+
+    @functools.wraps(funcion)
+    def envoltura(*args, **kwargs):
+        if not _estado.activa:
+            return funcion(*args, **kwargs)
+        filas, columnas = _forma(args)
+        with medir_etapa(etapa, filas, columnas):
+            return funcion(*args, **kwargs)
+    return envoltura
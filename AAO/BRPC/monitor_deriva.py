@@ -0,0 +1,207 @@
+import pandas as pd
+import numpy as np
+from typing import Iterator, Optional
+
+from .agrupador_optimo import AgrupadorOptimo
+from .cargador import DatasetCacheado, _leer_trozos
+from .estabilidad import clasificar_psi, contribuciones_psi, psi
+from .instrumentacion import instrumentar
+from .scorecard import Scorecard, _logit_bloque
+
+
+class MonitorDeriva:
+    """
+    Monitor incremental de deriva sobre los bins de un `AgrupadorOptimo` ya ajustado.
+
+    Solo guarda, por variable, el histograma de conteos por bin (código 0 = 'Missing') de la
+    referencia y de los datos recibidos desde el último `reiniciar`: cada lote se codifica con
+    los cortes fijos, se cuenta con un único `np.bincount` y se descarta. El coste de
+    `actualizar` es lineal en el tamaño del lote y la memoria no crece con el número de lotes.
+
+    `informe` compara ambos histogramas: CSI (el PSI de cada variable), tasa de nulos de la
+    referencia y de los datos actuales y su diferencia. Si se indica una `scorecard`, también se
+    vigila la distribución de su puntuación (`psi_puntuacion`), sobre cuantiles fijados con la
+    referencia.
+
+    Args:
+        agrupador (AgrupadorOptimo): Agrupador ajustado con los cortes a vigilar.
+        scorecard (Scorecard, optional): Scorecard ajustada cuyas variables estén entre las del agrupador.
+        bins_puntuacion (int): Número de cuantiles de la puntuación de referencia.
+
+    Attributes:
+        referencia_ (np.ndarray): Conteos (variables x bins) de la referencia.
+        actual_ (np.ndarray): Conteos (variables x bins) acumulados desde el último `reiniciar`.
+        n_lotes_ (int): Lotes acumulados en `actual_`.
+    """
+
+    def __init__(self, agrupador: AgrupadorOptimo, scorecard: Optional[Scorecard] = None,
+                 bins_puntuacion: int = 10):
+        self.agrupador = agrupador
+        self.features = list(agrupador.features_)
+        self.n_bins = max((len(agrupador.cortes_[f]) + 2 for f in self.features), default=1)
+
+        self.scorecard = scorecard
+        self.bins_puntuacion = bins_puntuacion
+        if scorecard is not None:
+            faltan = [f for f in scorecard.features_ if f not in self.features]
+            if faltan:
+                raise ValueError(f"Variables de la scorecard que no están en el agrupador: {faltan}")
+            self._columnas_scorecard = [self.features.index(f) for f in scorecard.features_]
+
+        self.referencia_: Optional[np.ndarray] = None
+        self.cortes_puntuacion_: Optional[np.ndarray] = None
+        self.referencia_puntuacion_: Optional[np.ndarray] = None
+        self.reiniciar()
+
+    def reiniciar(self) -> 'MonitorDeriva':
+        """Vacía los conteos actuales (p. ej. al empezar una nueva ventana), sin tocar la referencia."""
+        self.actual_ = np.zeros((len(self.features), self.n_bins), dtype=np.int64)
+        self.actual_puntuacion_ = np.zeros(self.bins_puntuacion, dtype=np.int64)
+        self.n_lotes_ = 0
+        return self
+
+    def _lotes(self, datos, chunksize: int) -> Iterator[np.ndarray]:
+        """Matrices (filas x variables) en el orden de `features`."""
+        if isinstance(datos, (str, DatasetCacheado)):
+            for trozo in _leer_trozos(datos, chunksize, usecols=self.features):
+                yield trozo[self.features].to_numpy(dtype=np.float64)
+        elif isinstance(datos, pd.DataFrame):
+            yield datos[self.features].to_numpy(dtype=np.float64)
+        else:
+            yield np.asarray(datos, dtype=np.float64)
+
+    def _histograma(self, lote: np.ndarray) -> np.ndarray:
+        """Conteos (variables x bins) de un lote con un único `np.bincount`."""
+        plano = self.agrupador.transform_codigos(lote).astype(np.int64)
+        plano += np.arange(len(self.features), dtype=np.int64) * self.n_bins
+        conteos = np.bincount(plano.ravel(), minlength=len(self.features) * self.n_bins)
+        return conteos.reshape(len(self.features), self.n_bins)
+
+    def _logit(self, lote: np.ndarray) -> np.ndarray:
+        return _logit_bloque(lote, self.scorecard.tabla_, self._columnas_scorecard)
+
+    @instrumentar
+    def fijar_referencia(self, datos, chunksize: int = 100_000) -> 'MonitorDeriva':
+        """
+        Calcula los histogramas de referencia (normalmente, los datos de entrenamiento).
+
+        Args:
+            datos (pd.DataFrame | DatasetCacheado | np.ndarray | str): Datos de referencia; un CSV
+                o un dataset cacheado se recorren por trozos.
+            chunksize (int): Filas por trozo al leer un CSV o un dataset cacheado.
+
+        Returns:
+            MonitorDeriva: El propio monitor.
+        """
+        referencia = np.zeros((len(self.features), self.n_bins), dtype=np.int64)
+        logits = []
+        for lote in self._lotes(datos, chunksize):
+            referencia += self._histograma(lote)
+            if self.scorecard is not None:
+                logits.append(self._logit(lote))
+        self.referencia_ = referencia
+
+        if self.scorecard is not None:
+            # Los cuantiles necesitan toda la puntuación de referencia (un float por fila, una sola vez)
+            logits = np.concatenate(logits)
+            cuantiles = np.linspace(0, 1, self.bins_puntuacion + 1)[1:-1]
+            self.cortes_puntuacion_ = np.quantile(logits, cuantiles)
+            self.referencia_puntuacion_ = self._histograma_puntuacion(logits)
+        return self
+
+    def _histograma_puntuacion(self, logits: np.ndarray) -> np.ndarray:
+        return np.bincount(np.searchsorted(self.cortes_puntuacion_, logits, side='left'),
+                           minlength=self.bins_puntuacion)
+
+    @instrumentar
+    def actualizar(self, datos, chunksize: int = 100_000) -> 'MonitorDeriva':
+        """
+        Añade un lote de datos nuevos a los conteos actuales.
+
+        Args:
+            datos (pd.DataFrame | DatasetCacheado | np.ndarray | str): Lote con las columnas
+                `features` (una matriz, en ese orden).
+            chunksize (int): Filas por trozo al leer un CSV o un dataset cacheado.
+
+        Returns:
+            MonitorDeriva: El propio monitor.
+        """
+        for lote in self._lotes(datos, chunksize):
+            self.actual_ += self._histograma(lote)
+            if self.scorecard is not None and self.cortes_puntuacion_ is not None:
+                self.actual_puntuacion_ += self._histograma_puntuacion(self._logit(lote))
+        self.n_lotes_ += 1
+        return self
+
+    def fusionar(self, otro: 'MonitorDeriva') -> 'MonitorDeriva':
+        """Suma los conteos actuales de otro monitor con las mismas variables (p. ej. de otro proceso)."""
+        if otro.features != self.features or otro.actual_.shape != self.actual_.shape:
+            raise ValueError("Solo se pueden fusionar monitores con las mismas variables y bins")
+        self.actual_ += otro.actual_
+        self.actual_puntuacion_ += otro.actual_puntuacion_
+        self.n_lotes_ += otro.n_lotes_
+        return self
+
+    def _comprobar(self):
+        if self.referencia_ is None:
+            raise ValueError("Falta la referencia: llama antes a fijar_referencia")
+
+    @property
+    def filas(self) -> int:
+        """Filas acumuladas desde el último `reiniciar`."""
+        return int(self.actual_[0].sum()) if len(self.features) else 0
+
+    def informe(self) -> pd.DataFrame:
+        """
+        Deriva de cada variable frente a la referencia.
+
+        Returns:
+            pd.DataFrame: Columnas 'Feature', 'CSI', 'Estabilidad' ('estable', 'moderada' o
+            'inestable'), 'Nulos_Referencia', 'Nulos_Actual' y 'Cambio_Nulos' (tasas en tanto
+            por uno), ordenado de mayor a menor CSI. Sin datos actuales, CSI y tasas son NaN.
+        """
+        self._comprobar()
+        csi = psi(self.referencia_, self.actual_)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            nulos_referencia = self.referencia_[:, 0] / self.referencia_.sum(axis=1)
+            nulos_actual = self.actual_[:, 0] / self.actual_.sum(axis=1)
+
+        return (pd.DataFrame({
+            'Feature': self.features,
+            'CSI': csi,
+            'Estabilidad': clasificar_psi(csi),
+            'Nulos_Referencia': nulos_referencia,
+            'Nulos_Actual': nulos_actual,
+            'Cambio_Nulos': nulos_actual - nulos_referencia
+        }).sort_values(by='CSI', ascending=False).reset_index(drop=True))
+
+    def tabla(self, feature: str) -> pd.DataFrame:
+        """
+        Distribución por bin de una variable en la referencia y en los datos actuales.
+
+        Returns:
+            pd.DataFrame: Columnas 'Bin', 'Referencia', 'Actual', 'Dist_Referencia',
+            'Dist_Actual' y 'Contribucion' (aportación del bin al CSI).
+        """
+        self._comprobar()
+        j = self.features.index(feature)
+        n = len(self.agrupador.etiquetas_[feature])
+        referencia, actual = self.referencia_[j, :n], self.actual_[j, :n]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            dist_referencia = referencia / referencia.sum()
+            dist_actual = actual / actual.sum()
+        return pd.DataFrame({
+            'Bin': self.agrupador.etiquetas_[feature],
+            'Referencia': referencia,
+            'Actual': actual,
+            'Dist_Referencia': dist_referencia,
+            'Dist_Actual': dist_actual,
+            'Contribucion': contribuciones_psi(referencia, actual)
+        })
+
+    def psi_puntuacion(self) -> float:
+        """PSI de la puntuación de la scorecard frente a la referencia (NaN sin datos actuales)."""
+        self._comprobar()
+        if self.scorecard is None:
+            raise ValueError("El monitor no tiene scorecard")
+        return float(psi(self.referencia_puntuacion_, self.actual_puntuacion_))
@@ -1,19 +1,108 @@
 import pandas as pd
 import numpy as np
-from sklearn.decomposition import PCA
+from sklearn.decomposition import PCA, IncrementalPCA
 from sklearn.preprocessing import StandardScaler
-from typing import Tuple
+from typing import Iterator, Optional, Tuple, Union
+from .cargador import _como_dataframe, _leer_trozos
+from .instrumentacion import instrumentar
 
-def pca_analisis(df: pd.DataFrame, n_components: int = 2) -> Tuple[pd.DataFrame, PCA, np.ndarray]:
+METODOS_PCA = ('completo', 'incremental', 'aleatorio')
+
+# Columnas que no entran en el PCA (target, identificadores)
+COLUMNAS_EXCLUIDAS = ['class', 'year', 'id', 'ID']
+
+
+def _trozos(datos, tam_lote: int) -> Iterator[pd.DataFrame]:
+    """Trozos de un DataFrame, un dataset cacheado o un CSV."""
+    if isinstance(datos, pd.DataFrame):
+        for inicio in range(0, len(datos), tam_lote):
+            yield datos.iloc[inicio:inicio + tam_lote]
+    else:
+        yield from _leer_trozos(datos, tam_lote)
+
+
+def _pca_incremental(datos, n_components: int, tam_lote: int) -> Tuple[pd.DataFrame, IncrementalPCA]:
+    """
+    PCA por trozos: una pasada para el escalado, otra para `IncrementalPCA.partial_fit` y otra
+    para proyectar. En memoria solo hay un trozo y la matriz de componentes (filas x n_components).
+    """
+    scaler = StandardScaler()
+    columnas = None
+    for trozo in _trozos(datos, tam_lote):
+        if columnas is None:
+            columnas = [c for c in trozo.select_dtypes(include=['number']).columns
+                        if c not in COLUMNAS_EXCLUIDAS]
+        scaler.partial_fit(trozo[columnas])
+
+    if columnas is None:
+        raise ValueError("No hay datos para el PCA")
+
+    # partial_fit necesita al menos n_components filas: un último trozo pequeño se une al anterior
+    pca = IncrementalPCA(n_components=n_components)
+    anterior = None
+    for trozo in _trozos(datos, tam_lote):
+        escalado = scaler.transform(trozo[columnas])
+        if anterior is not None and len(escalado) < n_components:
+            anterior = np.vstack([anterior, escalado])
+            continue
+        if anterior is not None:
+            pca.partial_fit(anterior)
+        anterior = escalado
+    pca.partial_fit(anterior)
+
+    pca.scaler_ = scaler
+    pca.columnas_ = columnas
+
+    partes = []
+    for trozo in _trozos(datos, tam_lote):
+        componentes = pca.transform(scaler.transform(trozo[columnas]))
+        parte = pd.DataFrame(componentes, columns=[f'PC{i+1}' for i in range(n_components)], index=trozo.index)
+        if 'class' in trozo.columns:
+            parte['class'] = trozo['class'].values
+        partes.append(parte)
+
+    return pd.concat(partes), pca
+
+
+@instrumentar
+def proyectar_pca(pca: Union[PCA, IncrementalPCA], df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Proyecta un nuevo lote con el escalado y el PCA ajustados por `pca_analisis`.
+
+    Args:
+        pca: Objeto devuelto por `pca_analisis` (lleva `scaler_` y `columnas_`).
+        df (pd.DataFrame): Lote con las mismas columnas usadas en el ajuste.
+
+    Returns:
+        pd.DataFrame: Componentes (PC1, PC2, ...) con el índice de `df`.
+    """
+    df = _como_dataframe(df)
+    componentes = pca.transform(pca.scaler_.transform(df[pca.columnas_]))
+    return pd.DataFrame(componentes, columns=[f'PC{i+1}' for i in range(pca.n_components_)], index=df.index)
+
+
+@instrumentar
+def pca_analisis(df: pd.DataFrame, n_components: int = 2, metodo: str = 'completo',
+                 tam_lote: Optional[int] = None) -> Tuple[pd.DataFrame, PCA, np.ndarray]:
     """
     Realiza un Análisis de Componentes Principales (PCA) para reducir la dimensionalidad.
     
     PCA transforma las variables originales en un nuevo conjunto de variables no correlacionadas
     (componentes principales) que capturan la máxima varianza de los datos.
+
+    Las primeras componentes no dependen de cuántas se pidan: para los gráficos 2D y 3D basta con
+    ajustar una vez con n_components=3 y usar PC1-PC2 o PC1-PC3 del mismo resultado. El objeto PCA
+    devuelto lleva el escalado (`scaler_`) y las columnas (`columnas_`) para proyectar nuevos
+    lotes con `proyectar_pca`.
     
     Args:
-        df (pd.DataFrame): DataFrame con variables numéricas.
+        df (pd.DataFrame): DataFrame con variables numéricas. Con metodo='incremental' también
+            puede ser un `DatasetCacheado` o la ruta de un CSV, que se leen por trozos.
         n_components (int): Número de componentes principales a retener (2 o 3 para visualización).
+        metodo (str): 'completo' (SVD exacta, por defecto), 'incremental' (`IncrementalPCA` por
+            trozos, para datos que no caben en memoria) o 'aleatorio' (SVD aleatorizada, para
+            tablas muy anchas).
+        tam_lote (int, optional): Filas por trozo con metodo='incremental' (100.000 por defecto).
         
     Returns:
         Tuple[pd.DataFrame, PCA, np.ndarray]:
@@ -21,6 +110,17 @@ def pca_analisis(df: pd.DataFrame, n_components: int = 2) -> Tuple[pd.DataFrame,
             - Objeto PCA ajustado (contiene explained_variance_ratio_, components_, etc.)
             - Array con la varianza explicada por cada componente
     """
+    if metodo not in METODOS_PCA:
+        raise ValueError(f"metodo debe ser uno de {METODOS_PCA}: {metodo}")
+
+    if metodo == 'incremental':
+        df_pca, pca = _pca_incremental(df, n_components, tam_lote or 100_000)
+        print(f"Dimensiones del dataset antes de PCA: {(len(df_pca), len(pca.columnas_))} (Filas, Columnas)")
+        print(f"Dimensiones del dataset después de PCA: {(len(df_pca), n_components)} (Filas, Componentes)")
+        print(f"Reducción: {len(pca.columnas_)} variables -> {n_components} componentes")
+        return df_pca, pca, pca.explained_variance_ratio_
+
+    df = _como_dataframe(df)
     # Filtrar solo columnas numéricas y eliminar target/year si existen
     df_numeric = df.select_dtypes(include=['number']).copy()
     
@@ -28,7 +128,7 @@ def pca_analisis(df: pd.DataFrame, n_components: int = 2) -> Tuple[pd.DataFrame,
     original_columns = df_numeric.columns.tolist()
     
     # Eliminar columnas no deseadas (target, identificadores)
-    cols_to_drop = [col for col in ['class', 'year', 'id', 'ID'] if col in df_numeric.columns]
+    cols_to_drop = [col for col in COLUMNAS_EXCLUIDAS if col in df_numeric.columns]
     if cols_to_drop:
         df_numeric = df_numeric.drop(columns=cols_to_drop)
     
@@ -40,8 +140,15 @@ def pca_analisis(df: pd.DataFrame, n_components: int = 2) -> Tuple[pd.DataFrame,
     print(f"Dimensiones del dataset antes de PCA: {df_numeric.shape} (Filas, Columnas)")
     
     # Aplicar PCA
-    pca = PCA(n_components=n_components)
+    if metodo == 'aleatorio':
+        pca = PCA(n_components=n_components, svd_solver='randomized', random_state=0)
+    else:
+        pca = PCA(n_components=n_components)
     components = pca.fit_transform(df_scaled)
+
+    # Guardar el escalado y las columnas para proyectar nuevos lotes (`proyectar_pca`)
+    pca.scaler_ = scaler
+    pca.columnas_ = df_numeric.columns.tolist()
     
     # Crear DataFrame con los componentes
     component_names = [f'PC{i+1}' for i in range(n_components)]
@@ -0,0 +1,253 @@
+import json
+import logging
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Dict, NamedTuple, Optional, Sequence
+
+import pandas as pd
+
+from .agrupador_optimo import AgrupadorOptimo
+from .analisis_dataset import analisis_dataset
+from .cargador import cargar_dataset
+from .feature_selection import seleccionar_representantes_clustervers
+from .pca_analisis import pca_analisis
+from .procesado_dataset import Preprocessor
+from .scorecard import Scorecard
+from .select_mejor_k import select_mejor_k
+from .varclushi_analisis import varclushi_analisis
+from .woe_iv_multiple import woe_iv_multiple
+
+logger = logging.getLogger('BRPC.pipeline')
+
+CONFIG_DEFECTO = {
+    'target': 'class',
+    'excluir': ['year', 'id', 'ID'],
+    'umbral_nulos': 0.2,
+    'factor_iqr': 1.5,
+    'max_bins': 10,
+    'min_bins': 3,
+    'metodo_binning': 'dp',
+    'monotonico': None,
+    'max_eigval2': 1.0,
+    'k': 7,
+    'n_components': 3,
+    'C': 1.0,
+    'n_hilos': None,
+    'n_jobs': None,
+    # Caché columnar del CSV; por defecto, <directorio_salida>/.cache_brpc
+    'directorio_cache': None
+}
+
+
+class Etapa(NamedTuple):
+    nombre: str
+    funcion: Callable[[Dict[str, object]], object]
+    dependencias: Sequence[str] = ()
+
+
+def ejecutar_grafo(etapas: Sequence[Etapa], n_hilos: Optional[int] = None) -> Dict[str, Dict]:
+    """
+    Ejecuta un grafo de etapas en un pool de hilos.
+
+    Cada etapa se lanza en cuanto han terminado todas sus dependencias y recibe el diccionario
+    con los resultados de las etapas ya terminadas. Las etapas independientes se ejecutan a la
+    vez. Si una etapa falla, las que dependen de ella se omiten y el resto sigue.
+
+    Args:
+        etapas (Sequence[Etapa]): Etapas con nombre único; las dependencias deben estar en la lista.
+        n_hilos (int, optional): Hilos del pool. Por defecto, los núcleos disponibles.
+
+    Returns:
+        Dict[str, Dict]: Por etapa, 'estado' ('ok', 'error' u 'omitida'), 'resultado',
+        'segundos' y, si falló, 'error'.
+    """
+    por_nombre = {e.nombre: e for e in etapas}
+    for etapa in etapas:
+        faltan = [d for d in etapa.dependencias if d not in por_nombre]
+        if faltan:
+            raise ValueError(f"La etapa '{etapa.nombre}' depende de etapas inexistentes: {faltan}")
+
+    resultados: Dict[str, object] = {}
+    estado: Dict[str, Dict] = {}
+    pendientes = dict(por_nombre)
+    en_curso: Dict[Future, str] = {}
+
+    def _ejecutar(etapa: Etapa):
+        logger.info("Inicio de la etapa '%s'", etapa.nombre)
+        inicio = time.perf_counter()
+        resultado = etapa.funcion(resultados)
+        return resultado, time.perf_counter() - inicio
+
+    with ThreadPoolExecutor(max_workers=n_hilos or os.cpu_count() or 1) as pool:
+        while pendientes or en_curso:
+            for nombre, etapa in list(pendientes.items()):
+                deps = [estado.get(d, {}).get('estado') for d in etapa.dependencias]
+                if any(d in ('error', 'omitida') for d in deps):
+                    estado[nombre] = {'estado': 'omitida', 'resultado': None, 'segundos': 0.0}
+                    logger.warning("Etapa '%s' omitida: falló una dependencia", nombre)
+                    del pendientes[nombre]
+                elif all(d == 'ok' for d in deps):
+                    en_curso[pool.submit(_ejecutar, etapa)] = nombre
+                    del pendientes[nombre]
+
+            if not en_curso:
+                if pendientes:
+                    raise ValueError(f"Dependencias circulares entre: {sorted(pendientes)}")
+                break
+
+            terminados, _ = wait(en_curso, return_when=FIRST_COMPLETED)
+            for futuro in terminados:
+                nombre = en_curso.pop(futuro)
+                try:
+                    resultado, segundos = futuro.result()
+                except Exception as e:
+                    logger.exception("Error en la etapa '%s'", nombre)
+                    estado[nombre] = {'estado': 'error', 'resultado': None, 'segundos': None,
+                                      'error': f'{type(e).__name__}: {e}'}
+                else:
+                    resultados[nombre] = resultado
+                    estado[nombre] = {'estado': 'ok', 'resultado': resultado, 'segundos': segundos}
+                    logger.info("Fin de la etapa '%s' (%.2f s)", nombre, segundos)
+
+    return estado
+
+
+def _guardar_json(datos, ruta: str):
+    with open(ruta, 'w', encoding='utf-8') as f:
+        json.dump(datos, f, indent=2, ensure_ascii=False, default=str)
+
+
+def etapas_seleccion(ruta_dataset: str, directorio_salida: str, config: Dict) -> Sequence[Etapa]:
+    """
+    Etapas del flujo de selección de variables de `demostracion.ipynb`, con sus dependencias:
+
+        carga -> perfil
+        carga -> procesado -> iv ---------------------> scorecard
+                           -> varclus -> seleccion -> scorecard
+                                                   -> pca
+
+    Cada etapa escribe sus artefactos en `directorio_salida`.
+    """
+    target = config['target']
+
+    def ruta(nombre: str) -> str:
+        return os.path.join(directorio_salida, nombre)
+
+    def carga(_):
+        directorio_cache = config['directorio_cache'] or ruta('.cache_brpc')
+        return cargar_dataset(ruta_dataset, directorio_cache=directorio_cache).to_frame()
+
+    def perfil(r):
+        tabla = analisis_dataset(r['carga'])
+        tabla.to_csv(ruta('perfil.csv'), index=False)
+        return tabla
+
+    def procesado(r):
+        preprocesador = Preprocessor(config['umbral_nulos'], target, config['factor_iqr'])
+        df = preprocesador.fit_transform(r['carga'])
+        _guardar_json({
+            'columnas_eliminadas': preprocesador.columnas_eliminadas_,
+            'medianas': preprocesador.medianas_.to_dict(),
+            'limites_inferiores': preprocesador.limites_inferiores_.to_dict(),
+            'limites_superiores': preprocesador.limites_superiores_.to_dict()
+        }, ruta('preprocesado.json'))
+        features = [c for c in df.select_dtypes(include=['number']).columns
+                    if c != target and c not in config['excluir']]
+        return df, features
+
+    def iv(r):
+        df, features = r['procesado']
+        agrupador = AgrupadorOptimo(config['max_bins'], config['min_bins'], config['n_jobs'],
+                                    config['metodo_binning'], config['monotonico'])
+        agrupador.fit(df, features, target)
+        agrupador.guardar(ruta('agrupador.npz'))
+        tablas, resumen = woe_iv_multiple(agrupador.transform_codigos(df), df[target], features,
+                                          agrupador.etiquetas_)
+        resumen.to_csv(ruta('iv.csv'), index=False)
+        woe = pd.concat([t.rename(columns={f: 'Bin'}) for f, t in tablas.items()], keys=list(tablas),
+                        names=['Feature', None]).reset_index(level=0)
+        woe.to_csv(ruta('woe.csv'), index=False)
+        return resumen, agrupador
+
+    def varclus(r):
+        df, features = r['procesado']
+        rsquare = varclushi_analisis(df[features], max_eigval2=config['max_eigval2'], n_jobs=config['n_jobs'])
+        rsquare.to_csv(ruta('clusters.csv'), index=False)
+        return rsquare
+
+    def seleccion(r):
+        df, _ = r['procesado']
+        representantes = seleccionar_representantes_clustervers(r['varclus'])
+        k = min(config['k'], len(representantes))
+        finales = select_mejor_k(df[representantes], df[target], k=k, solo_nombres=True)
+        _guardar_json({'representantes': representantes, 'seleccionadas': finales},
+                      ruta('seleccion.json'))
+        return finales
+
+    def pca(r):
+        df, _ = r['procesado']
+        finales = r['seleccion']
+        n_components = min(config['n_components'], len(finales))
+        _, modelo, varianza = pca_analisis(df[finales], n_components=n_components)
+        nombres = [f'PC{i + 1}' for i in range(n_components)]
+        pd.DataFrame(modelo.components_.T, index=modelo.columnas_, columns=nombres).rename_axis(
+            'Variable').to_csv(ruta('pca_cargas.csv'))
+        pd.DataFrame({'Componente': nombres, 'Varianza_Explicada': varianza}).to_csv(
+            ruta('pca_varianza.csv'), index=False)
+        return varianza
+
+    def scorecard(r):
+        df, _ = r['procesado']
+        _, agrupador = r['iv']
+        modelo = Scorecard(agrupador, C=config['C']).fit(df, r['seleccion'], target)
+        modelo.guardar(ruta('scorecard.npz'))
+        modelo.tabla().to_csv(ruta('scorecard.csv'), index=False)
+        return modelo
+
+    return [
+        Etapa('carga', carga),
+        Etapa('perfil', perfil, ('carga',)),
+        Etapa('procesado', procesado, ('carga',)),
+        Etapa('iv', iv, ('procesado',)),
+        Etapa('varclus', varclus, ('procesado',)),
+        Etapa('seleccion', seleccion, ('varclus',)),
+        Etapa('pca', pca, ('seleccion',)),
+        Etapa('scorecard', scorecard, ('procesado', 'iv', 'seleccion'))
+    ]
+
+
+def ejecutar_pipeline(ruta_dataset: str, directorio_salida: str, config: Optional[Dict] = None) -> Dict[str, Dict]:
+    """
+    Ejecuta el flujo completo de selección de variables sin Jupyter.
+
+    El perfilado del dataset original se ejecuta a la vez que el procesado, y la pantalla de IV y
+    VarClus a la vez sobre el dataset procesado (ver `etapas_seleccion`). La caché del CSV se
+    guarda en `config['directorio_cache']` (por defecto, dentro de `directorio_salida`). En
+    `directorio_salida` quedan los artefactos: perfil.csv, preprocesado.json, agrupador.npz,
+    iv.csv, woe.csv, clusters.csv, seleccion.json, pca_cargas.csv, pca_varianza.csv,
+    scorecard.npz (ver `Scorecard.cargar`), scorecard.csv y resumen.json (configuración, estado y
+    duración de cada etapa).
+
+    Args:
+        ruta_dataset (str): CSV de entrada.
+        directorio_salida (str): Carpeta de los artefactos (se crea si no existe).
+        config (Dict, optional): Claves de `CONFIG_DEFECTO` a sobrescribir.
+
+    Returns:
+        Dict[str, Dict]: Estado de cada etapa (ver `ejecutar_grafo`).
+    """
+    desconocidas = set(config or {}) - set(CONFIG_DEFECTO)
+    if desconocidas:
+        raise ValueError(f"Claves de configuración desconocidas: {sorted(desconocidas)}")
+    config = {**CONFIG_DEFECTO, **(config or {})}
+    os.makedirs(directorio_salida, exist_ok=True)
+
+    estado = ejecutar_grafo(etapas_seleccion(ruta_dataset, directorio_salida, config), config['n_hilos'])
+
+    _guardar_json({
+        'dataset': os.path.abspath(ruta_dataset),
+        'config': config,
+        'etapas': {nombre: {k: v for k, v in e.items() if k != 'resultado'} for nombre, e in estado.items()}
+    }, os.path.join(directorio_salida, 'resumen.json'))
+    return estado
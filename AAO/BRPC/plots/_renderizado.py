@@ -0,0 +1,176 @@
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import plotly.colors
+from plotly.basedatatypes import BaseTraceType
+from typing import List, Optional, Tuple
+
+MODOS = ('auto', 'svg', 'webgl', 'densidad')
+
+# Con más puntos que UMBRAL_WEBGL se usa WebGL; con más que UMBRAL_DENSIDAD, capas de densidad
+UMBRAL_WEBGL = 5_000
+UMBRAL_DENSIDAD = 200_000
+
+
+def elegir_modo(n_puntos: int, modo: str = 'auto', umbral_webgl: int = UMBRAL_WEBGL,
+                umbral_densidad: int = UMBRAL_DENSIDAD) -> str:
+    """Modo de renderizado concreto ('svg', 'webgl' o 'densidad') para `n_puntos`."""
+    if modo not in MODOS:
+        raise ValueError(f"modo debe ser uno de {MODOS}: {modo}")
+    if modo != 'auto':
+        return modo
+    if n_puntos > umbral_densidad:
+        return 'densidad'
+    if n_puntos > umbral_webgl:
+        return 'webgl'
+    return 'svg'
+
+
+def clases_ordenadas(etiquetas: pd.Series) -> Tuple[list, list]:
+    """
+    Clases de `etiquetas` de la más a la menos frecuente (las minoritarias se dibujan encima)
+    y la lista de clases minoritarias, que se dibujan siempre como puntos individuales.
+    Con una sola clase no hay minoritarias.
+    """
+    conteos = etiquetas.value_counts(sort=True, dropna=True)
+    clases = conteos.index.tolist()
+    minoritarias = clases[-1:] if len(clases) > 1 else []
+    return clases, minoritarias
+
+
+def color_clase(i: int) -> str:
+    paleta = plotly.colors.qualitative.Plotly
+    return paleta[i % len(paleta)]
+
+
+def _capa_densidad(x: np.ndarray, y: np.ndarray, bordes_x: np.ndarray, bordes_y: np.ndarray,
+                   nombre: str, color: str) -> go.Heatmap:
+    """Histograma 2D calculado aquí (solo viaja la rejilla, no los puntos) como capa de un color."""
+    conteos, _, _ = np.histogram2d(x, y, bins=[bordes_x, bordes_y])
+    z = np.log1p(conteos.T)
+    z[conteos.T == 0] = np.nan  # las celdas vacías son transparentes
+    r, g, b = plotly.colors.hex_to_rgb(color)
+    return go.Heatmap(
+        x=((bordes_x[:-1] + bordes_x[1:]) / 2).astype(np.float32),
+        y=((bordes_y[:-1] + bordes_y[1:]) / 2).astype(np.float32),
+        z=z.astype(np.float32),
+        colorscale=[[0, f'rgba({r},{g},{b},0.15)'], [1, f'rgba({r},{g},{b},0.9)']],
+        showscale=False,
+        name=nombre,
+        showlegend=True,
+        hoverinfo='skip'
+    )
+
+
+def trazas_dispersion(x, y, etiquetas: Optional[pd.Series] = None, modo: str = 'auto',
+                      marker: Optional[dict] = None, bins: int = 200,
+                      umbral_webgl: int = UMBRAL_WEBGL,
+                      umbral_densidad: int = UMBRAL_DENSIDAD) -> List[BaseTraceType]:
+    """
+    Trazas de Plotly para un gráfico de dispersión 2D, eligiendo el renderizado según el tamaño.
+
+    - 'svg': un `go.Scatter` por clase (comportamiento original).
+    - 'webgl': un `go.Scattergl` por clase; el navegador dibuja con la GPU.
+    - 'densidad': las clases mayoritarias se agregan en un histograma 2D por clase (una capa de
+      color cada una) y la clase minoritaria se dibuja como puntos `go.Scattergl`.
+
+    Los valores se envían como arrays float32, que Plotly codifica en binario.
+
+    Args:
+        x, y (array-like): Coordenadas.
+        etiquetas (pd.Series, optional): Clase de cada punto.
+        modo (str): 'auto', 'svg', 'webgl' o 'densidad'.
+        marker (dict, optional): Estilo de los marcadores.
+        bins (int): Celdas por eje de los histogramas 2D.
+
+    Returns:
+        List[BaseTraceType]: Trazas listas para `fig.add_traces`.
+    """
+    x = np.asarray(x, dtype=np.float32)
+    y = np.asarray(y, dtype=np.float32)
+    marker = marker or dict(size=8, opacity=0.7)
+    modo = elegir_modo(len(x), modo, umbral_webgl, umbral_densidad)
+    Puntos = go.Scatter if modo == 'svg' else go.Scattergl
+
+    if etiquetas is None:
+        if modo == 'densidad':
+            bordes_x = np.histogram_bin_edges(x[np.isfinite(x)], bins)
+            bordes_y = np.histogram_bin_edges(y[np.isfinite(y)], bins)
+            return [_capa_densidad(x, y, bordes_x, bordes_y, 'densidad', '#008080')]
+        return [Puntos(x=x, y=y, mode='markers', marker=dict(marker, color='teal'))]
+
+    etiquetas = pd.Series(np.asarray(etiquetas))
+    clases, minoritarias = clases_ordenadas(etiquetas)
+    codigos = etiquetas.to_numpy()
+
+    if modo == 'densidad':
+        finitos = np.isfinite(x) & np.isfinite(y)
+        bordes_x = np.histogram_bin_edges(x[finitos], bins)
+        bordes_y = np.histogram_bin_edges(y[finitos], bins)
+
+    trazas = []
+    for i, clase in enumerate(clases):
+        mascara = codigos == clase
+        if modo == 'densidad' and clase not in minoritarias:
+            trazas.append(_capa_densidad(x[mascara], y[mascara], bordes_x, bordes_y, str(clase), color_clase(i)))
+        else:
+            trazas.append(Puntos(x=x[mascara], y=y[mascara], mode='markers', name=str(clase),
+                                 marker=dict(marker, color=color_clase(i))))
+    return trazas
+
+
+def muestra_estratificada(etiquetas: Optional[pd.Series], n_total: int, max_puntos: int,
+                          semilla: int = 0) -> np.ndarray:
+    """
+    Posiciones (ordenadas) de una muestra de como mucho `max_puntos` filas, estratificada por clase.
+
+    Las clases minoritarias se conservan completas y el presupuesto restante se reparte entre las
+    demás en proporción a su tamaño. Si las minoritarias solas no caben, todas las clases se
+    muestrean en proporción a su tamaño. Cada clase con filas recibe al menos un punto (salvo que
+    haya más clases que puntos) y el total no supera `max_puntos`. El muestreo es vectorizado:
+    cada fila recibe una clave aleatoria, se ordena por (clase, clave) y de cada clase se toman
+    las primeras filas de su cupo.
+
+    Args:
+        etiquetas (pd.Series, optional): Clase de cada fila. None para un muestreo uniforme.
+        n_total (int): Número de filas.
+        max_puntos (int): Presupuesto de puntos.
+        semilla (int): Semilla del generador aleatorio.
+
+    Returns:
+        np.ndarray: Posiciones de las filas elegidas, en orden creciente.
+    """
+    if n_total <= max_puntos:
+        return np.arange(n_total)
+
+    rng = np.random.default_rng(semilla)
+    if etiquetas is None:
+        return np.sort(rng.choice(n_total, size=max_puntos, replace=False))
+
+    etiquetas = pd.Series(np.asarray(etiquetas))
+    _, minoritarias = clases_ordenadas(etiquetas)
+    codigos, clases = pd.factorize(etiquetas, use_na_sentinel=False)
+    tamanos = np.bincount(codigos, minlength=len(clases))
+
+    es_minoritaria = np.isin(np.asarray(clases, dtype=object), np.asarray(minoritarias, dtype=object))
+    n_minoria = int(tamanos[es_minoritaria].sum())
+    if n_minoria + int((~es_minoritaria).sum()) <= max_puntos:
+        restante = max_puntos - n_minoria
+        n_mayoria = tamanos[~es_minoritaria].sum()
+        cupos = np.where(es_minoritaria, tamanos, np.floor(tamanos * restante / max(n_mayoria, 1)))
+    else:
+        cupos = np.floor(tamanos * max_puntos / n_total)
+    cupos = np.minimum(np.maximum(cupos.astype(np.int64), 1), tamanos)
+
+    # El mínimo de un punto por clase puede pasarse del presupuesto: se descuenta de las mayores
+    for j in np.argsort(-cupos, kind='stable'):
+        exceso = int(cupos.sum()) - max_puntos
+        if exceso <= 0:
+            break
+        cupos[j] -= min(exceso, cupos[j] - 1)
+
+    orden = np.lexsort((rng.random(n_total), codigos))
+    inicio = np.concatenate([[0], np.cumsum(tamanos)[:-1]])
+    codigos_ordenados = codigos[orden]
+    rango = np.arange(n_total) - inicio[codigos_ordenados]
+    return np.sort(orden[rango < cupos[codigos_ordenados]])
@@ -1,18 +1,101 @@
+import warnings
 import pandas as pd
+import numpy as np
 import seaborn as sns
 import matplotlib.pyplot as plt
+from typing import Dict, List
+from ..cargador import _como_dataframe
+from ..instrumentacion import instrumentar
 
-def plot_boxplots(df: pd.DataFrame, columns: list[str] = None):
+MODOS_BOXPLOT = ('resumen', 'seaborn')
+
+
+def calcular_resumen_boxplot(df: pd.DataFrame, columns: list[str] = None, whis: float = 1.5,
+                             max_outliers: int = 50, tam_bloque: int = 16) -> List[Dict]:
     """
-    Genera diagramas de caja (boxplots) estáticos usando Seaborn.
-    
+    Estadísticos de los boxplots de varias columnas, en el formato de `matplotlib.axes.Axes.bxp`.
+
+    Las columnas se procesan por bloques de `tam_bloque`: cuartiles y mediana salen de una sola
+    llamada a `np.nanquantile` por bloque, y los bigotes (último valor dentro de
+    [Q1 - whis·IQR, Q3 + whis·IQR], como matplotlib y seaborn) y el número de outliers se calculan
+    vectorizados. Solo se guardan como mucho `max_outliers` outliers por columna (repartidos por
+    su rango, incluidos los extremos), así que el resultado ocupa O(columnas) y la memoria de
+    trabajo es la de un bloque.
+
+    Args:
+        df (pd.DataFrame): El DataFrame con los datos.
+        columns (list[str], optional): Columnas a resumir. Por defecto, todas las numéricas.
+        whis (float): Longitud de los bigotes en múltiplos del IQR.
+        max_outliers (int): Outliers por columna que se guardan para dibujar (0 para ninguno).
+        tam_bloque (int): Columnas por bloque.
+
+    Returns:
+        List[Dict]: Por columna, 'label', 'q1', 'med', 'q3', 'whislo', 'whishi', 'fliers' y
+        'n_outliers'.
+    """
+    df = _como_dataframe(df)
+    if columns is None:
+        columns = df.select_dtypes(include=['number']).columns.tolist()
+    columns = list(columns)
+
+    resumen = []
+    for inicio in range(0, len(columns), tam_bloque):
+        bloque = columns[inicio:inicio + tam_bloque]
+        X = df[bloque].to_numpy(dtype=np.float64, na_value=np.nan)
+        X = np.where(np.isfinite(X), X, np.nan)
+
+        with np.errstate(invalid='ignore'), warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)  # columnas sin valores finitos
+            q1, med, q3 = np.nanquantile(X, [0.25, 0.5, 0.75], axis=0) if len(X) else np.full((3, len(bloque)), np.nan)
+            iqr = q3 - q1
+            limite_inf, limite_sup = q1 - whis * iqr, q3 + whis * iqr
+            bajos, altos = X < limite_inf, X > limite_sup
+            whislo = np.nanmin(np.where(bajos, np.nan, X), axis=0) if len(X) else q1
+            whishi = np.nanmax(np.where(altos, np.nan, X), axis=0) if len(X) else q3
+        outliers = bajos | altos
+        n_outliers = outliers.sum(axis=0)
+
+        for j, col in enumerate(bloque):
+            fliers = np.empty(0)
+            if max_outliers > 0 and n_outliers[j]:
+                fliers = np.sort(X[outliers[:, j], j])
+                if len(fliers) > max_outliers:
+                    fliers = fliers[np.linspace(0, len(fliers) - 1, max_outliers).round().astype(np.int64)]
+            resumen.append({
+                'label': col,
+                'q1': q1[j], 'med': med[j], 'q3': q3[j],
+                'whislo': whislo[j], 'whishi': whishi[j],
+                'fliers': fliers,
+                'n_outliers': int(n_outliers[j])
+            })
+    return resumen
+
+
+@instrumentar
+def plot_boxplots(df: pd.DataFrame, columns: list[str] = None, modo: str = 'resumen',
+                  mostrar_outliers: bool = True, max_outliers: int = 50):
+    """
+    Genera diagramas de caja (boxplots) estáticos.
+
+    En modo 'resumen' (por defecto) las cajas se dibujan con `ax.bxp` a partir de los estadísticos
+    de `calcular_resumen_boxplot`, sin pasar los datos a formato largo, así que se pueden dibujar
+    todas las variables numéricas; cada etiqueta indica el número total de outliers de la columna.
+    El modo 'seaborn' mantiene el dibujo original con `sns.boxplot` (limitado a las 5 primeras
+    columnas numéricas si no se indican columnas).
+
     Args:
         df (pd.DataFrame): El DataFrame con los datos.
         columns (list[str], optional): Lista de nombres de columnas a graficar.
+        modo (str, optional): 'resumen' o 'seaborn'.
+        mostrar_outliers (bool, optional): Si se dibujan los outliers (modo 'resumen').
+        max_outliers (int, optional): Máximo de outliers dibujados por columna (modo 'resumen').
     """
+    df = _como_dataframe(df)
+    if modo not in MODOS_BOXPLOT:
+        raise ValueError(f"modo debe ser uno de {MODOS_BOXPLOT}: {modo}")
     if columns is None:
         columns = df.select_dtypes(include=['number']).columns.tolist()
-        if len(columns) > 5:
+        if modo == 'seaborn' and len(columns) > 5:
             print("Nota: Se graficarán solo las primeras 5 columnas numéricas por defecto.")
             columns = columns[:5]
             
@@ -21,6 +104,25 @@ def plot_boxplots(df: pd.DataFrame, columns: list[str] = None):
         return None
 
     try:
+        if modo == 'resumen':
+            resumen = calcular_resumen_boxplot(df, columns, max_outliers=max_outliers if mostrar_outliers else 0)
+            # Solo se dibujan `max_outliers` por columna: la etiqueta lleva el total
+            resumen = [dict(r, label=f"{r['label']} (n_out={r['n_outliers']})") for r in resumen]
+            fig, ax = plt.subplots(figsize=(max(10, 0.4 * len(columns)), 6))
+            cajas = ax.bxp(resumen, showfliers=mostrar_outliers, patch_artist=True,
+                           medianprops=dict(color='black'),
+                           flierprops=dict(marker='o', markersize=3, alpha=0.5))
+            for caja, color in zip(cajas['boxes'], sns.color_palette('Set2', len(columns))):
+                caja.set_facecolor(color)
+            if len(columns) > 5:
+                ax.tick_params(axis='x', labelrotation=90)
+            ax.set_xlabel('Variable')
+            ax.set_ylabel('Valor')
+            ax.set_title('Distribución y Outliers (Boxplots)')
+            ax.grid(True, alpha=0.3)
+            fig.tight_layout()
+            return ax
+
         # Configurar el tamaño de la figura
         plt.figure(figsize=(10, 6))
         
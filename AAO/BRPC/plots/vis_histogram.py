@@ -1,55 +1,191 @@
+import math
+import warnings
 import pandas as pd
+import numpy as np
 import seaborn as sns
 import matplotlib.pyplot as plt
+from typing import List, NamedTuple
+from ..cargador import _como_dataframe
+from ..instrumentacion import instrumentar
 
-def plot_histograms(df: pd.DataFrame, columns: list[str] = None):
+MODOS_HISTOGRAMA = ('precalculado', 'seaborn')
+
+# Celdas mínimas de la rejilla fina sobre la que se convoluciona la KDE
+PUNTOS_KDE = 512
+
+
+class Histogramas(NamedTuple):
+    columnas: List[str]
+    bordes: np.ndarray      # (variables, bins + 1)
+    conteos: np.ndarray     # (variables, bins)
+    x_kde: np.ndarray       # (variables, puntos)
+    kde: np.ndarray         # (variables, puntos), escalada a frecuencias del histograma
+
+
+def calcular_histogramas(df: pd.DataFrame, columns: list[str] = None, bins: int = 30,
+                         kde: bool = True) -> Histogramas:
     """
-    Genera histogramas estáticos para las columnas especificadas usando Seaborn.
-    
+    Histogramas y KDE de todas las columnas a la vez, sin pasar por seaborn.
+
+    Los conteos se obtienen con un único `np.bincount` sobre una rejilla fina (múltiplo de
+    `bins`) de todas las columnas; el histograma es la suma de grupos de celdas de esa rejilla y la
+    KDE gaussiana (ancho de banda de Scott, como `scipy.stats.gaussian_kde`) es la convolución de
+    la rejilla con el núcleo, hecha en el dominio de la frecuencia con una FFT para todas las
+    columnas. Igual que `sns.histplot(kde=True)`, la KDE se evalúa en el rango de los datos y
+    se escala a frecuencias. Los nulos e infinitos se ignoran.
+
     Args:
         df (pd.DataFrame): El DataFrame con los datos.
-        columns (list[str], optional): Lista de nombres de columnas a graficar. 
+        columns (list[str], optional): Columnas a calcular. Por defecto, todas las numéricas.
+        bins (int): Número de barras de cada histograma.
+        kde (bool): Si se calcula la KDE.
+
+    Returns:
+        Histogramas: Bordes, conteos y KDE de cada columna, como arrays (variables x celdas).
+    """
+    df = _como_dataframe(df)
+    if columns is None:
+        columns = df.select_dtypes(include=['number']).columns.tolist()
+    columns = list(columns)
+    p = len(columns)
+    factor = math.ceil(PUNTOS_KDE / bins) if kde else 1
+    n_celdas = bins * factor
+
+    X = df[columns].to_numpy(dtype=np.float64, na_value=np.nan)
+    finitos = np.isfinite(X)
+    X = np.where(finitos, X, np.nan)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)  # columnas sin valores finitos
+        minimo = np.nanmin(X, axis=0) if len(X) else np.full(p, np.nan)
+        maximo = np.nanmax(X, axis=0) if len(X) else np.full(p, np.nan)
+    vacias = np.isnan(minimo)
+    minimo[vacias], maximo[vacias] = 0.0, 1.0
+    # Columnas constantes: un intervalo de ancho 1 centrado en el valor (como np.histogram)
+    constantes = maximo == minimo
+    minimo[constantes] -= 0.5
+    maximo[constantes] += 0.5
+    ancho = (maximo - minimo) / n_celdas
+
+    celda = np.floor((X - minimo) / ancho)
+    np.clip(celda, 0, n_celdas - 1, out=celda)
+    desplazada = np.where(finitos, celda + np.arange(p) * n_celdas, -1).astype(np.int64).ravel()
+    finos = np.bincount(desplazada[desplazada >= 0], minlength=p * n_celdas).reshape(p, n_celdas)
+    finos = finos.astype(np.float64)
+
+    conteos = finos.reshape(p, bins, factor).sum(axis=2)
+    bordes = minimo[:, None] + (maximo - minimo)[:, None] * np.linspace(0, 1, bins + 1)
+    x_kde = minimo[:, None] + ancho[:, None] * (np.arange(n_celdas) + 0.5)
+
+    if not kde:
+        return Histogramas(columns, bordes, conteos, np.empty((p, 0)), np.empty((p, 0)))
+
+    # Ancho de banda de Scott en unidades de celda de la rejilla fina
+    n = finitos.sum(axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'), warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)  # columnas con menos de dos valores finitos
+        desviacion = np.nanstd(X, axis=0, ddof=1) if len(X) > 1 else np.zeros(p)
+        sigma = np.nan_to_num(desviacion * n ** (-1 / 5) / ancho)
+
+    # Convolución con el núcleo gaussiano: producto por su transformada (analítica) y relleno a
+    # 2x para que no haya solapamiento circular
+    longitud = 2 * n_celdas
+    frecuencias = np.fft.rfftfreq(longitud)
+    transferencia = np.exp(-2 * np.pi ** 2 * sigma[:, None] ** 2 * frecuencias ** 2)
+    suavizada = np.fft.irfft(np.fft.rfft(finos, n=longitud, axis=1) * transferencia, n=longitud, axis=1)
+    # Densidad por celda fina -> frecuencia por barra del histograma
+    curva = np.clip(suavizada[:, :n_celdas], 0, None) * factor
+    # Sin dispersión no hay KDE (seaborn tampoco la dibuja)
+    curva[~(desviacion > 0)] = np.nan
+
+    return Histogramas(columns, bordes, conteos, x_kde, curva)
+
+
+def _plot_histogramas_precalculados(h: Histogramas, ncols: int = 4):
+    """Rejilla de histogramas (small multiples) dibujada a partir de los arrays precalculados."""
+    num_plots = len(h.columnas)
+    ncols = min(ncols, num_plots)
+    rows = math.ceil(num_plots / ncols)
+
+    alto = 3 * rows
+    fig, axes = plt.subplots(rows, ncols, figsize=(4 * ncols, alto), squeeze=False)
+    axes = axes.flatten()
+
+    for i, col in enumerate(h.columnas):
+        ax = axes[i]
+        ax.stairs(h.conteos[i], h.bordes[i], fill=True, color='skyblue', alpha=0.8)
+        if h.kde.size:
+            ax.plot(h.x_kde[i], h.kde[i], color='steelblue', linewidth=1.5)
+        ax.set_title(f'Distribución de {col}', fontsize=10)
+        ax.locator_params(nbins=4)
+        ax.tick_params(labelsize=8)
+        ax.grid(True, alpha=0.3)
+
+    for j in range(num_plots, len(axes)):
+        fig.delaxes(axes[j])
+
+    # Márgenes fijos en lugar de tight_layout, que con decenas de ejes domina el tiempo de dibujo
+    fig.supxlabel('Valor')
+    fig.supylabel('Frecuencia')
+    fig.subplots_adjust(left=0.07, right=0.98, top=1 - 0.4 / alto, bottom=0.5 / alto, hspace=0.5, wspace=0.3)
+    return fig
+
+
+@instrumentar
+def plot_histograms(df: pd.DataFrame, columns: list[str] = None, modo: str = 'precalculado',
+                    bins: int = 30, kde: bool = True, ncols: int = 4):
+    """
+    Genera histogramas estáticos para las columnas especificadas.
+
+    En modo 'precalculado' (por defecto) los histogramas y las KDE de todas las columnas se
+    calculan a la vez con `calcular_histogramas` y se dibujan en una rejilla; así se pueden ver
+    todas las variables numéricas. El modo 'seaborn' mantiene el dibujo original con
+    `sns.histplot` (limitado a las 5 primeras columnas numéricas si no se indican columnas).
+
+    Args:
+        df (pd.DataFrame): El DataFrame con los datos.
+        columns (list[str], optional): Lista de nombres de columnas a graficar.
                                        Si es None, se grafican todas las numéricas.
+        modo (str, optional): 'precalculado' o 'seaborn'.
+        bins (int, optional): Número de barras en modo 'precalculado'.
+        kde (bool, optional): Si se dibuja la KDE.
+        ncols (int, optional): Columnas de la rejilla en modo 'precalculado'.
     """
+    df = _como_dataframe(df)
+    if modo not in MODOS_HISTOGRAMA:
+        raise ValueError(f"modo debe ser uno de {MODOS_HISTOGRAMA}: {modo}")
     if columns is None:
         # Seleccionamos solo columnas numéricas si no se especifican
         columns = df.select_dtypes(include=['number']).columns.tolist()
-        # Limitamos a las primeras 5 para no saturar si son muchas
-        if len(columns) > 5:
+        # En modo seaborn limitamos a las primeras 5 para no saturar si son muchas
+        if modo == 'seaborn' and len(columns) > 5:
             print("Nota: Se graficarán solo las primeras 5 columnas numéricas por defecto.")
             columns = columns[:5]
-            
+
     if not columns:
         print("Advertencia: No hay columnas numéricas para graficar.")
         return None
 
     try:
-        # Configurar el tamaño de la figura
-        plt.figure(figsize=(12, 8))
-        
-        # Usamos melt para facilitar el ploteo con FacetGrid o simplemente iteramos
-        # Para simplificar, si son pocas columnas, podemos usar subplots o un solo plot superpuesto
-        # Como el usuario quiere "simple", haremos un FacetGrid o subplots.
-        # Pero para mantenerlo muy simple y compatible con la idea de "ver distribuciones",
-        # haremos un loop para crear subplots.
-        
+        if modo == 'precalculado':
+            return _plot_histogramas_precalculados(calcular_histogramas(df, columns, bins, kde), ncols)
+
         num_plots = len(columns)
         rows = (num_plots // 2) + (num_plots % 2)
-        
+
         fig, axes = plt.subplots(rows, 2, figsize=(15, 5 * rows))
         axes = axes.flatten()
-        
+
         for i, col in enumerate(columns):
-            sns.histplot(data=df, x=col, kde=True, ax=axes[i], color='skyblue')
+            sns.histplot(data=df, x=col, kde=kde, ax=axes[i], color='skyblue')
             axes[i].set_title(f'Distribución de {col}')
             axes[i].set_xlabel('Valor')
             axes[i].set_ylabel('Frecuencia')
             axes[i].grid(True, alpha=0.3)
-            
+
         # Ocultar ejes vacíos si hay número impar de plots
         for j in range(i + 1, len(axes)):
             fig.delaxes(axes[j])
-            
+
         plt.tight_layout()
         return fig
     except Exception as e:
@@ -1,16 +1,24 @@
 import pandas as pd
 import plotly.graph_objects as go
 from typing import Optional
+from ._renderizado import trazas_dispersion
+from ..instrumentacion import instrumentar
 
+@instrumentar
 def plot_pca_2d_cufflinks(df_pca: pd.DataFrame, hue: Optional[str] = 'class', 
-                          explained_variance: Optional[list] = None) -> go.Figure:
+                          explained_variance: Optional[list] = None, modo: str = 'auto') -> go.Figure:
     """
     Genera un gráfico de dispersión 2D de los componentes principales.
+
+    Con modo='auto' el renderizado depende del número de puntos: SVG para pocos, WebGL
+    (`Scattergl`) a partir de 5.000 y, a partir de 200.000, un histograma 2D por clase calculado
+    en Python. La clase minoritaria (p. ej. empresas en quiebra) se dibuja siempre como puntos.
     
     Args:
         df_pca: DataFrame con columnas PC1, PC2 y opcionalmente la columna para colorear
         hue: Nombre de la columna para colorear los puntos
         explained_variance: Lista con la varianza explicada por cada componente
+        modo: 'auto' (por defecto), 'svg', 'webgl' o 'densidad'
         
     Returns:
         Figura de Plotly lista para mostrar
@@ -28,25 +36,9 @@ def plot_pca_2d_cufflinks(df_pca: pd.DataFrame, hue: Optional[str] = 'class',
     # Crear figura
     fig = go.Figure()
     
-    if hue and hue in df_pca.columns:
-        # Gráfico con categorías
-        for category in df_pca[hue].unique():
-            mask = df_pca[hue] == category
-            fig.add_trace(go.Scatter(
-                x=df_pca.loc[mask, 'PC1'],
-                y=df_pca.loc[mask, 'PC2'],
-                mode='markers',
-                name=str(category),
-                marker=dict(size=8, opacity=0.7)
-            ))
-    else:
-        # Gráfico sin categorías
-        fig.add_trace(go.Scatter(
-            x=df_pca['PC1'],
-            y=df_pca['PC2'],
-            mode='markers',
-            marker=dict(size=8, opacity=0.7, color='teal')
-        ))
+    etiquetas = df_pca[hue] if hue and hue in df_pca.columns else None
+    fig.add_traces(trazas_dispersion(df_pca['PC1'], df_pca['PC2'], etiquetas, modo=modo,
+                                     marker=dict(size=8, opacity=0.7)))
     
     # Configurar diseño
     fig.update_layout(
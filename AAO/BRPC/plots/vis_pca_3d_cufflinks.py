@@ -1,16 +1,31 @@
 import pandas as pd
 import plotly.graph_objects as go
+import numpy as np
 from typing import Optional
+from ._renderizado import clases_ordenadas, color_clase, muestra_estratificada
+from ..instrumentacion import instrumentar
 
+@instrumentar
 def plot_pca_3d_cufflinks(df_pca: pd.DataFrame, hue: Optional[str] = 'class',
-                          explained_variance: Optional[list] = None) -> go.Figure:
+                          explained_variance: Optional[list] = None,
+                          max_puntos: Optional[int] = None, semilla: int = 0) -> go.Figure:
     """
     Genera un gráfico de dispersión 3D de los componentes principales.
+
+    `Scatter3d` ya se dibuja con WebGL; las coordenadas se envían como float32 (codificación
+    binaria de Plotly) y la clase minoritaria se dibuja la última para que quede visible.
+
+    Con `max_puntos` se dibuja una muestra estratificada por `hue` (ver `muestra_estratificada`):
+    la clase minoritaria completa, si cabe, y una muestra aleatoria del resto hasta completar el
+    presupuesto, de modo que el tamaño de la figura no crece con el del dataset. El título indica
+    la proporción muestreada de cada clase.
     
     Args:
         df_pca: DataFrame con columnas PC1, PC2, PC3 y opcionalmente la columna para colorear
         hue: Nombre de la columna para colorear los puntos
         explained_variance: Lista con la varianza explicada por cada componente
+        max_puntos: Número máximo de puntos a dibujar (None para dibujarlos todos)
+        semilla: Semilla del muestreo
         
     Returns:
         Figura de Plotly 3D lista para mostrar
@@ -26,28 +41,49 @@ def plot_pca_3d_cufflinks(df_pca: pd.DataFrame, hue: Optional[str] = 'class',
                 f'PC3 ({explained_variance[2]*100:.2f}%)')
     else:
         title = 'PCA 3D - Componentes Principales'
+
+    con_hue = bool(hue) and hue in df_pca.columns
+    if con_hue:
+        # Orden y colores de las clases según el dataset completo: la muestra conserva entera
+        # la clase minoritaria y podría invertir las frecuencias
+        clases, _ = clases_ordenadas(df_pca[hue])
+    n_total = len(df_pca)
+    if max_puntos is not None and n_total > max_puntos:
+        posiciones = muestra_estratificada(df_pca[hue] if con_hue else None, n_total, max_puntos, semilla)
+        muestra = df_pca.iloc[posiciones]
+        title += f' - muestra de {len(muestra):,} de {n_total:,} puntos'
+        if con_hue:
+            originales = df_pca[hue].value_counts()
+            muestreados = muestra[hue].value_counts().reindex(originales.index, fill_value=0)
+            title += ' (' + ', '.join(f'{clase}: {muestreados[clase] / originales[clase]:.1%}'
+                                      for clase in clases) + ')'
+        else:
+            title += f' ({len(muestra) / n_total:.1%})'
+        df_pca = muestra
     
     # Crear figura 3D
     fig = go.Figure()
     
-    if hue and hue in df_pca.columns:
-        # Gráfico con categorías
-        for category in df_pca[hue].unique():
-            mask = df_pca[hue] == category
+    if con_hue:
+        # Gráfico con categorías (de la más frecuente a la menos, la minoritaria encima)
+        etiquetas = df_pca[hue].to_numpy()
+        coordenadas = df_pca[['PC1', 'PC2', 'PC3']].to_numpy(dtype=np.float32)
+        for i, category in enumerate(clases):
+            mask = etiquetas == category
             fig.add_trace(go.Scatter3d(
-                x=df_pca.loc[mask, 'PC1'],
-                y=df_pca.loc[mask, 'PC2'],
-                z=df_pca.loc[mask, 'PC3'],
+                x=coordenadas[mask, 0],
+                y=coordenadas[mask, 1],
+                z=coordenadas[mask, 2],
                 mode='markers',
                 name=str(category),
-                marker=dict(size=5, opacity=0.7)
+                marker=dict(size=5, opacity=0.7, color=color_clase(i))
             ))
     else:
         # Gráfico sin categorías
         fig.add_trace(go.Scatter3d(
-            x=df_pca['PC1'],
-            y=df_pca['PC2'],
-            z=df_pca['PC3'],
+            x=df_pca['PC1'].to_numpy(dtype=np.float32),
+            y=df_pca['PC2'].to_numpy(dtype=np.float32),
+            z=df_pca['PC3'].to_numpy(dtype=np.float32),
             mode='markers',
             marker=dict(size=5, opacity=0.7, color='teal')
         ))
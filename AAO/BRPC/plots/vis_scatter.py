@@ -1,18 +1,64 @@
 import pandas as pd
 import seaborn as sns
 import matplotlib.pyplot as plt
+import numpy as np
+from ..cargador import _como_dataframe
+from ._renderizado import clases_ordenadas
+from ..instrumentacion import instrumentar
 
-def plot_scatter(df: pd.DataFrame, x_col: str, y_col: str, hue: str = None):
+MODOS_SCATTER = ('auto', 'puntos', 'hexbin')
+
+# Con más filas que este umbral, modo='auto' agrega los puntos en hexágonos
+UMBRAL_HEXBIN = 20_000
+
+
+def _scatter_hexbin(df: pd.DataFrame, x_col: str, y_col: str, hue: str = None, gridsize: int = 80):
+    """
+    Densidad en hexágonos de las clases mayoritarias y puntos individuales de la minoritaria.
+    """
+    ax = plt.gca()
+    if hue:
+        clases, minoritarias = clases_ordenadas(df[hue])
+        es_minoria = df[hue].isin(minoritarias).to_numpy()
+    else:
+        clases, minoritarias = [], []
+        es_minoria = np.zeros(len(df), dtype=bool)
+
+    mayoria = df.loc[~es_minoria, [x_col, y_col]].dropna()
+    hb = ax.hexbin(mayoria[x_col], mayoria[y_col], gridsize=gridsize, bins='log', mincnt=1,
+                   cmap='Blues', linewidths=0)
+    etiqueta = ', '.join(str(c) for c in clases if c not in minoritarias) or 'Todos'
+    plt.colorbar(hb, ax=ax, label=f'Densidad (log) - {etiqueta}')
+
+    for clase in minoritarias:
+        puntos = df.loc[df[hue] == clase]
+        ax.scatter(puntos[x_col], puntos[y_col], s=25, color='#E74C3C', edgecolor='white',
+                   linewidth=0.5, label=str(clase), zorder=3)
+    if minoritarias:
+        ax.legend(title=hue, loc='upper right')
+    return ax
+
+
+@instrumentar
+def plot_scatter(df: pd.DataFrame, x_col: str, y_col: str, hue: str = None, modo: str = 'auto'):
     """
     Genera un gráfico de dispersión (scatter plot) estático usando Seaborn.
     Rediseñado con una estética moderna y limpia para mayor legibilidad.
+
+    Con muchas filas (más de 20.000 en modo 'auto') se dibuja la densidad en hexágonos en lugar
+    de cada punto, salvo la clase minoritaria de `hue`, que se mantiene como puntos individuales.
     
     Args:
         df (pd.DataFrame): El DataFrame con los datos.
         x_col (str): Nombre de la columna para el eje X.
         y_col (str): Nombre de la columna para el eje Y.
         hue (str, optional): Nombre de la columna para agrupar por colores (categoría).
+        modo (str, optional): 'auto' (por defecto), 'puntos' o 'hexbin'.
     """
+    df = _como_dataframe(df)
+    if modo not in MODOS_SCATTER:
+        raise ValueError(f"modo debe ser uno de {MODOS_SCATTER}: {modo}")
+    usar_hexbin = modo == 'hexbin' or (modo == 'auto' and len(df) > UMBRAL_HEXBIN)
     try:
         # Configurar tema moderno y limpio
         sns.set_theme(style="whitegrid", context="notebook", font_scale=1.1)
@@ -24,7 +70,10 @@ def plot_scatter(df: pd.DataFrame, x_col: str, y_col: str, hue: str = None):
         # Usamos 'edgecolor' blanco para separar puntos solapados ligeramente
         scatter_kws = {'alpha': 0.7, 's': 40, 'edgecolor': 'white', 'linewidth': 0.5}
         
-        if hue:
+        if usar_hexbin:
+            ax = _scatter_hexbin(df, x_col, y_col, hue)
+            plt.title(f'{x_col} vs {y_col}' + (f' por {hue}' if hue else ''), fontsize=16, fontweight='bold', pad=20)
+        elif hue:
             # Usar una paleta de alto contraste para categorías
             # 'deep' es buena por defecto, 'bright' si se quiere más intensidad.
             # Si hue es numérico, seaborn usará automáticamente una secuencial (e.g. rocket/mako)
@@ -1,10 +1,214 @@
+import warnings
 import pandas as pd
 import numpy as np
+from typing import Dict, List
 
+from .analisis_dataset import _es_numerica
+from .analisis_dataset_streaming import _tipo_combinado
+from .bosquejos import KLL
+from .cargador import _como_dataframe, _leer_trozos
+from .instrumentacion import instrumentar
+
+
+class Preprocessor:
+    """
+    Preprocesado reutilizable con fit/transform: `fit` calcula una vez las columnas a eliminar,
+    las medianas, las modas y los límites IQR; `transform` los aplica a cualquier lote de datos
+    (entrenamiento o scoring) sin recalcularlos.
+
+    Args:
+        umbral_nulos (float): Proporción máxima de nulos permitida por columna.
+        target (str): Variable objetivo, excluida del recorte de outliers.
+        factor_iqr (float): Multiplicador del IQR para los límites de recorte.
+
+    Attributes:
+        columnas_eliminadas_ (List[str]): Columnas con más de `umbral_nulos` de nulos.
+        medianas_ (pd.Series): Mediana de cada columna numérica.
+        modas_ (Dict[str, object]): Moda de cada columna no numérica.
+        limites_inferiores_ (pd.Series): Q1 - factor_iqr * IQR de cada columna recortada.
+        limites_superiores_ (pd.Series): Q3 + factor_iqr * IQR de cada columna recortada.
+    """
+
+    def __init__(self, umbral_nulos: float = 0.2, target: str = 'class', factor_iqr: float = 1.5):
+        self.umbral_nulos = umbral_nulos
+        self.target = target
+        self.factor_iqr = factor_iqr
+
+    @instrumentar
+    def fit(self, df: pd.DataFrame) -> 'Preprocessor':
+        """
+        Calcula los estadísticos de preprocesado.
+
+        Args:
+            df (pd.DataFrame): DataFrame de entrenamiento.
+
+        Returns:
+            Preprocessor: El propio objeto ajustado.
+        """
+        df = _como_dataframe(df)
+        # 1. Columnas con más del umbral de valores nulos
+        threshold = self.umbral_nulos * len(df)
+        self.columnas_eliminadas_: List[str] = list(df.columns[df.isnull().sum() > threshold])
+        df_restante = df.drop(columns=self.columnas_eliminadas_)
+
+        numeric_cols = df_restante.select_dtypes(include=[np.number]).columns
+        categorical_cols = df_restante.select_dtypes(exclude=[np.number]).columns
+
+        # 2. Medianas de todas las columnas numéricas con una sola llamada vectorizada
+        matriz = df_restante[numeric_cols].to_numpy(dtype=np.float64, na_value=np.nan)
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)  # columnas completamente nulas
+            medianas = np.nanquantile(matriz, 0.5, axis=0)
+        self.medianas_ = pd.Series(medianas, index=numeric_cols)
+
+        # Moda de las columnas no numéricas (mode() ordena, tomamos el primer valor)
+        self.modas_: Dict[str, object] = {}
+        for col in categorical_cols:
+            moda = df_restante[col].mode()
+            if len(moda) > 0:
+                self.modas_[col] = moda.iloc[0]
+
+        # 3. Límites IQR sobre los datos ya imputados, excluyendo la variable objetivo
+        recortadas = [col != self.target for col in numeric_cols]
+        imputada = np.where(np.isnan(matriz), medianas, matriz)[:, recortadas]
+        q1, q3 = np.quantile(imputada, [0.25, 0.75], axis=0) if len(imputada) else (np.nan, np.nan)
+        iqr = q3 - q1
+        columnas_recortadas = numeric_cols[recortadas]
+        self.limites_inferiores_ = pd.Series(q1 - self.factor_iqr * iqr, index=columnas_recortadas)
+        self.limites_superiores_ = pd.Series(q3 + self.factor_iqr * iqr, index=columnas_recortadas)
+
+        return self
+
+    @instrumentar
+    def fit_streaming(self, ruta: str, chunksize: int = 100_000, error: float = 0.01,
+                      **kwargs_csv) -> 'Preprocessor':
+        """
+        Versión por trozos de `fit` para CSV que no caben en memoria.
+
+        Recorre el archivo una vez acumulando nulos por columna, un bosquejo de cuantiles KLL por
+        columna numérica y el conteo de valores de las no numéricas. Las medianas y los límites
+        IQR salen de los bosquejos; los cuartiles se consultan añadiendo la mediana con el peso
+        de los nulos, igual que `fit` los calcula sobre los datos ya imputados.
+
+        Args:
+            ruta (str | DatasetCacheado): Ruta del archivo CSV o dataset de `cargar_dataset`.
+            chunksize (int): Filas por trozo.
+            error (float): Error de rango de los cuantiles (0.01 = 1% de las filas).
+            **kwargs_csv: Argumentos adicionales para `pd.read_csv`.
+
+        Returns:
+            Preprocessor: El propio objeto ajustado.
+        """
+        columnas = None
+        n = 0
+
+        for trozo in _leer_trozos(ruta, chunksize, **kwargs_csv):
+            if columnas is None:
+                columnas = trozo.columns
+                tipos = [None] * len(columnas)
+                nulos = np.zeros(len(columnas), dtype=np.int64)
+                bosquejos = {col: KLL(error) for col in columnas}
+                conteos: Dict[str, pd.Series] = {}
+
+            tipos = [_tipo_combinado(t, trozo[col].dtype) for t, col in zip(tipos, columnas)]
+            nulos += trozo.isnull().sum().to_numpy()
+            n += len(trozo)
+
+            for col in columnas:
+                if _es_numerica(trozo[col].dtype):
+                    bosquejos[col].actualizar(trozo[col].to_numpy(dtype=np.float64, na_value=np.nan))
+                else:
+                    conteo = trozo[col].value_counts()
+                    conteos[col] = conteo if col not in conteos else conteos[col].add(conteo, fill_value=0)
+
+        if columnas is None:
+            raise ValueError(f"El archivo {ruta} no contiene filas")
+
+        # 1. Columnas con más del umbral de valores nulos
+        eliminadas = nulos > self.umbral_nulos * n
+        self.columnas_eliminadas_ = list(columnas[eliminadas])
+        numericas = np.array([_es_numerica(t) for t in tipos], dtype=bool)
+        numeric_cols = columnas[numericas & ~eliminadas]
+        categorical_cols = columnas[~numericas & ~eliminadas]
+
+        # 2. Medianas y modas
+        self.medianas_ = pd.Series([bosquejos[col].cuantiles(0.5) for col in numeric_cols],
+                                   index=numeric_cols, dtype=np.float64)
+        self.modas_ = {}
+        for col in categorical_cols:
+            conteo = conteos.get(col)
+            if conteo is not None and len(conteo) > 0:
+                # Como Series.mode(): en caso de empate, el menor valor
+                self.modas_[col] = conteo[conteo == conteo.max()].index.sort_values()[0]
+
+        # 3. Límites IQR de los datos imputados: la mediana cuenta tantas veces como nulos
+        columnas_recortadas = pd.Index([col for col in numeric_cols if col != self.target])
+        nulos_columna = dict(zip(columnas, nulos))
+        cuartiles = np.array([
+            bosquejos[col].cuantiles([0.25, 0.75], self.medianas_[col], nulos_columna[col])
+            for col in columnas_recortadas
+        ]).reshape(-1, 2)
+        iqr = cuartiles[:, 1] - cuartiles[:, 0]
+        self.limites_inferiores_ = pd.Series(cuartiles[:, 0] - self.factor_iqr * iqr, index=columnas_recortadas)
+        self.limites_superiores_ = pd.Series(cuartiles[:, 1] + self.factor_iqr * iqr, index=columnas_recortadas)
+
+        return self
+
+    @instrumentar
+    def transform(self, df: pd.DataFrame, inplace: bool = False) -> pd.DataFrame:
+        """
+        Elimina columnas, imputa nulos y recorta outliers con los estadísticos de `fit`.
+
+        La imputación y el recorte de todas las columnas numéricas se hacen como una única
+        operación sobre la matriz numérica.
+
+        Args:
+            df (pd.DataFrame): DataFrame a procesar.
+            inplace (bool): Si es True se modifica `df` en lugar de una copia.
+
+        Returns:
+            pd.DataFrame: El DataFrame procesado.
+        """
+        df = _como_dataframe(df)
+        if not inplace:
+            df = df.copy()
+
+        df.drop(columns=[col for col in self.columnas_eliminadas_ if col in df.columns], inplace=True)
+
+        # Imputación + clipping vectorizados sobre el bloque numérico
+        numeric_cols = self.medianas_.index
+        tipos = df[numeric_cols].dtypes
+        matriz = df[numeric_cols].to_numpy(dtype=np.float64, na_value=np.nan)
+        nulos = np.isnan(matriz)
+        np.copyto(matriz, self.medianas_.to_numpy(), where=nulos)
+
+        recortadas = numeric_cols.get_indexer(self.limites_inferiores_.index)
+        matriz[:, recortadas] = np.clip(matriz[:, recortadas],
+                                        self.limites_inferiores_.to_numpy(),
+                                        self.limites_superiores_.to_numpy())
+        df[numeric_cols] = matriz
+
+        # Las columnas enteras conservan su tipo cuando los valores siguen siendo enteros
+        # (mismo comportamiento que Series.clip con límites enteros)
+        for j, col in enumerate(numeric_cols):
+            if pd.api.types.is_integer_dtype(tipos[col]) and np.all(np.mod(matriz[:, j], 1) == 0):
+                df[col] = df[col].astype(tipos[col])
+
+        for col, moda in self.modas_.items():
+            if col in df.columns and df[col].isnull().any():
+                df[col] = df[col].fillna(moda)
+
+        return df
+
+    def fit_transform(self, df: pd.DataFrame, inplace: bool = False) -> pd.DataFrame:
+        return self.fit(df).transform(df, inplace=inplace)
+
+
+@instrumentar
 def procesado_dataset(df_input: pd.DataFrame) -> pd.DataFrame:
     """
     Procesa los datos eliminando columnas con muchos nulos, imputando valores y tratando outliers.
-    
+
     Pasos realizados:
     1. Eliminar columnas con más del 20% de valores nulos.
     2. Imputar valores faltantes:
@@ -13,62 +217,19 @@ def procesado_dataset(df_input: pd.DataFrame) -> pd.DataFrame:
     3. Tratar valores atípicos (outliers) en columnas numéricas usando el método IQR (clipping).
        - Se limitan los valores al rango [Q1 - 1.5*IQR, Q3 + 1.5*IQR].
 
+    Para reaplicar los mismos estadísticos a nuevos lotes, usar `Preprocessor` directamente.
+
     Args:
         df_input (pd.DataFrame): El DataFrame de entrada.
 
     Returns:
         pd.DataFrame: El DataFrame procesado.
     """
-    # Hacemos una copia para no modificar el original
-    df = df_input.copy()
-    
-    # 1. Eliminar columnas con más del 20% de valores nulos
-    threshold = 0.2 * len(df)
-    # Identificamos columnas que superan el umbral de nulos
-    cols_to_drop = df.columns[df.isnull().sum() > threshold]
-    if len(cols_to_drop) > 0:
-        print(f"Eliminando columnas con > 20% nulos: {list(cols_to_drop)}")
-        df.drop(columns=cols_to_drop, inplace=True)
-    
-    # Separamos columnas numéricas y categóricas para aplicar diferentes estrategias
-    numeric_cols = df.select_dtypes(include=[np.number]).columns
-    categorical_cols = df.select_dtypes(exclude=[np.number]).columns
-    
-    # 2. Imputación de valores faltantes
-    
-    # Para numéricas: imputar con la mediana
-    for col in numeric_cols:
-        if df[col].isnull().any():
-            median_val = df[col].median()
-            df[col].fillna(median_val, inplace=True)
-            
-    # Para categóricas: imputar con la moda
-    for col in categorical_cols:
-        if df[col].isnull().any():
-            # mode() devuelve una Serie, tomamos el primer valor [0]
-            mode_val = df[col].mode()[0]
-            df[col].fillna(mode_val, inplace=True)
-            
-    # 3. Tratamiento de valores atípicos (Outliers) con IQR Clipping
-    # Solo aplicamos esto a columnas numéricas, EXCLUYENDO la variable objetivo
-    # IMPORTANTE: No aplicar clipping a 'class' porque es la variable objetivo binaria
-    target_col = 'class'
-    numeric_cols_for_outliers = [col for col in numeric_cols if col != target_col]
-    
-    for col in numeric_cols_for_outliers:
-        # Calculamos Q1 (percentil 25) y Q3 (percentil 75)
-        Q1 = df[col].quantile(0.25)
-        Q3 = df[col].quantile(0.75)
-        IQR = Q3 - Q1
-        
-        # Definimos los límites inferior y superior
-        lower_bound = Q1 - 1.5 * IQR
-        upper_bound = Q3 + 1.5 * IQR
-        
-        # Aplicamos clipping (recorte)
-        # Los valores menores al límite inferior se reemplazan por el límite inferior
-        # Los valores mayores al límite superior se reemplazan por el límite superior
-        df[col] = df[col].clip(lower=lower_bound, upper=upper_bound)
-        
-    return df
+    df_input = _como_dataframe(df_input)
+    preprocesador = Preprocessor().fit(df_input)
 
+    if len(preprocesador.columnas_eliminadas_) > 0:
+        print(f"Eliminando columnas con > 20% nulos: {preprocesador.columnas_eliminadas_}")
+
+    # Hacemos una copia para no modificar el original
+    return preprocesador.transform(df_input)
@@ -0,0 +1,36 @@
+from .cargador import _leer_trozos
+from .procesado_dataset import Preprocessor
+from .instrumentacion import instrumentar
+
+
+@instrumentar
+def procesado_dataset_streaming(ruta_entrada: str, ruta_salida: str, chunksize: int = 100_000,
+                                error: float = 0.01, **kwargs_csv) -> Preprocessor:
+    """
+    Versión por trozos de `procesado_dataset` para CSV que no caben en memoria.
+
+    Hace dos pasadas secuenciales sobre el archivo: la primera ajusta un `Preprocessor` con
+    bosquejos de cuantiles (`Preprocessor.fit_streaming`) y la segunda aplica la eliminación de
+    columnas, la imputación y el recorte IQR trozo a trozo, escribiendo el resultado en
+    `ruta_salida`. La memoria depende de `chunksize`, no del tamaño del archivo.
+
+    Args:
+        ruta_entrada (str | DatasetCacheado): Ruta del CSV original o dataset de `cargar_dataset`.
+        ruta_salida (str): Ruta del CSV procesado.
+        chunksize (int): Filas por trozo.
+        error (float): Error de rango de las medianas y cuartiles (0.01 = 1% de las filas).
+        **kwargs_csv: Argumentos adicionales para `pd.read_csv`.
+
+    Returns:
+        Preprocessor: El preprocesador ajustado, para reaplicarlo a otros lotes.
+    """
+    preprocesador = Preprocessor().fit_streaming(ruta_entrada, chunksize=chunksize, error=error, **kwargs_csv)
+
+    if len(preprocesador.columnas_eliminadas_) > 0:
+        print(f"Eliminando columnas con > 20% nulos: {preprocesador.columnas_eliminadas_}")
+
+    for i, trozo in enumerate(_leer_trozos(ruta_entrada, chunksize, **kwargs_csv)):
+        preprocesador.transform(trozo, inplace=True)
+        trozo.to_csv(ruta_salida, mode='w' if i == 0 else 'a', header=(i == 0), index=False)
+
+    return preprocesador
@@ -0,0 +1,435 @@
+import json
+import mmap
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+import pandas as pd
+import numpy as np
+from scipy import special
+from sklearn.linear_model import LogisticRegression
+
+from ._memoria_compartida import MatrizCompartida, adjuntar_matriz
+from .agrupador_optimo import AgrupadorOptimo
+from .cargador import DatasetCacheado, _como_dataframe
+from .instrumentacion import instrumentar
+from .woe_iv_multiple import _conteos_por_bin, _estadisticos_woe
+
+SALIDAS = ('probabilidad', 'logit', 'puntos')
+
+
+class TablaPuntuacion(NamedTuple):
+    """
+    Scorecard compilada en arrays planos.
+
+    Los cortes de cada variable terminan en +inf, de modo que `np.searchsorted(..., side='left')`
+    devuelve directamente la posición en su tramo de `puntos`: 0..n_cortes para los bins y
+    n_cortes + 1 para los nulos (NaN se ordena después de +inf). Cada posición de `puntos` es la
+    contribución del bin al logit (coeficiente x WoE).
+
+    Attributes:
+        cortes (np.ndarray): Cortes de todas las variables concatenados.
+        inicios_cortes (np.ndarray): Inicio del tramo de cada variable en `cortes` (p + 1 valores).
+        puntos (np.ndarray): Contribución al logit de cada bin de todas las variables, concatenadas.
+        inicios_puntos (np.ndarray): Inicio del tramo de cada variable en `puntos` (p + 1 valores).
+        intercepto (float): Término independiente de la regresión logística.
+    """
+    cortes: np.ndarray
+    inicios_cortes: np.ndarray
+    puntos: np.ndarray
+    inicios_puntos: np.ndarray
+    intercepto: float
+
+
+def _logit_bloque(bloque: np.ndarray, tabla: TablaPuntuacion,
+                  columnas: Optional[Sequence[int]] = None) -> np.ndarray:
+    """
+    Logit de cada fila de un bloque (filas x columnas): una búsqueda y un `take` por variable.
+
+    Args:
+        bloque (np.ndarray): Valores de las variables.
+        tabla (TablaPuntuacion): Scorecard compilada.
+        columnas (Sequence[int], optional): Columna del bloque de cada variable. Por defecto,
+            las variables ocupan las columnas en orden.
+    """
+    if columnas is None:
+        columnas = range(len(tabla.inicios_cortes) - 1)
+    logit = np.full(len(bloque), tabla.intercepto)
+    for j, columna in enumerate(columnas):
+        cortes = tabla.cortes[tabla.inicios_cortes[j]:tabla.inicios_cortes[j + 1]]
+        puntos = tabla.puntos[tabla.inicios_puntos[j]:tabla.inicios_puntos[j + 1]]
+        logit += puntos.take(np.searchsorted(cortes, bloque[:, columna], side='left'))
+    return logit
+
+
+# Estado de cada proceso del pool de puntuación (se inicializa una vez por proceso)
+_TABLA: Optional[TablaPuntuacion] = None
+_FUENTE: Optional[np.ndarray] = None
+_COLUMNAS: Optional[List[int]] = None
+_SHM = None
+
+
+def _abrir_fuente(descriptor: Optional[tuple]):
+    """Abre en el proceso actual la matriz descrita por `_descriptor_fuente`."""
+    if descriptor is None:
+        return None, None
+    tipo, *args = descriptor
+    if tipo == 'compartida':
+        return adjuntar_matriz(args[0])
+    ruta, offset, forma, dtype, orden = args
+    return None, np.memmap(ruta, dtype=np.dtype(dtype), mode='r', offset=offset, shape=forma, order=orden)
+
+
+def _inicializar_puntuacion(tabla: TablaPuntuacion, descriptor: Optional[tuple],
+                            columnas: Optional[List[int]]):
+    """Inicializador del pool: recibe la scorecard y abre la matriz de entrada una sola vez."""
+    global _TABLA, _FUENTE, _COLUMNAS, _SHM
+    _TABLA, _COLUMNAS = tabla, columnas
+    _SHM, _FUENTE = _abrir_fuente(descriptor)
+
+
+def _tarea_limites(limites: Tuple[int, int]) -> np.ndarray:
+    inicio, fin = limites
+    return _logit_bloque(_FUENTE[inicio:fin], _TABLA, _COLUMNAS)
+
+
+def _tarea_bloque(bloque: np.ndarray) -> np.ndarray:
+    return _logit_bloque(bloque, _TABLA)
+
+
+def _mapa_ordenado(executor: ProcessPoolExecutor, funcion, argumentos: Iterable,
+                   en_vuelo: int) -> Iterator[np.ndarray]:
+    """
+    Como `executor.map`, pero con como mucho `en_vuelo` tareas pendientes: los trozos se leen
+    a medida que se consumen los resultados y la memoria queda acotada.
+    """
+    pendientes = deque()
+    for argumento in argumentos:
+        pendientes.append(executor.submit(funcion, argumento))
+        if len(pendientes) >= en_vuelo:
+            yield pendientes.popleft().result()
+    while pendientes:
+        yield pendientes.popleft().result()
+
+
+class Scorecard:
+    """
+    Scorecard de regresión logística sobre el WoE de variables discretizadas, compilada en
+    arrays planos para puntuar grandes volúmenes.
+
+    `fit` discretiza las variables con `AgrupadorOptimo` (o reutiliza uno ya ajustado), sustituye
+    cada bin por su WoE y ajusta una regresión logística. Los cortes, el WoE y los coeficientes
+    se compilan en una `TablaPuntuacion`: puntuar una fila es, por variable, un `searchsorted`
+    sobre sus cortes y un `take` de la contribución del bin, sin Python por fila.
+
+    La salida 'puntos' usa el escalado habitual: `puntos_base` puntos para unas odds
+    (no evento : evento) de `odds_base`, y `pdo` puntos más cada vez que se doblan las odds.
+
+    Args:
+        agrupador (AgrupadorOptimo, optional): Agrupador ajustado cuyos cortes se reutilizan.
+        max_bins (int): Número máximo de bins (si no se indica `agrupador`).
+        min_bins (int): Número mínimo de bins (si no se indica `agrupador`).
+        metodo (str): Algoritmo de cortes, 'arbol' o 'dp' (ver `agrupamiento_optimo`).
+        monotonico (str, optional): Restricción de WoE monótono (solo con metodo='dp').
+        C (float): Inversa de la regularización L2 de la regresión logística.
+        puntos_base (float): Puntos asignados a las odds `odds_base`.
+        odds_base (float): Odds (no evento : evento) de referencia.
+        pdo (float): Puntos necesarios para doblar las odds.
+        n_jobs (int, optional): Procesos usados para ajustar los cortes.
+
+    Attributes:
+        features_ (List[str]): Variables de la scorecard, en orden.
+        agrupador_ (AgrupadorOptimo): Cortes y etiquetas de las variables.
+        woe_ (Dict[str, np.ndarray]): WoE de cada código de bin (posición 0 = 'Missing').
+        coeficientes_ (np.ndarray): Coeficiente de cada variable.
+        intercepto_ (float): Término independiente.
+        tabla_ (TablaPuntuacion): Scorecard compilada.
+    """
+
+    def __init__(self, agrupador: Optional[AgrupadorOptimo] = None, max_bins: int = 10, min_bins: int = 3,
+                 metodo: str = 'dp', monotonico: Optional[str] = None, C: float = 1.0,
+                 puntos_base: float = 600.0, odds_base: float = 50.0, pdo: float = 20.0,
+                 n_jobs: Optional[int] = None):
+        self.agrupador = agrupador
+        self.max_bins = max_bins
+        self.min_bins = min_bins
+        self.metodo = metodo
+        self.monotonico = monotonico
+        self.C = C
+        self.puntos_base = puntos_base
+        self.odds_base = odds_base
+        self.pdo = pdo
+        self.n_jobs = n_jobs
+
+    @instrumentar
+    def fit(self, df: pd.DataFrame, features: Sequence[str], target: str) -> 'Scorecard':
+        """
+        Ajusta la scorecard.
+
+        Args:
+            df (pd.DataFrame): DataFrame de entrenamiento.
+            features (Sequence[str]): Variables numéricas de la scorecard (p. ej. la salida de
+                `select_mejor_k(..., solo_nombres=True)`).
+            target (str): Nombre de la columna objetivo (0/1). Las filas con target nulo se ignoran.
+
+        Returns:
+            Scorecard: El propio objeto ajustado.
+        """
+        df = _como_dataframe(df)
+        features = [f for f in features if f != target]
+        if self.agrupador is None:
+            agrupador = AgrupadorOptimo(self.max_bins, self.min_bins, self.n_jobs, self.metodo,
+                                        self.monotonico).fit(df, features, target)
+        else:
+            agrupador = self.agrupador.seleccionar(features)
+
+        y = df[target].to_numpy(dtype=np.float64)
+        codigos = agrupador.transform_codigos(df)
+        validas = ~np.isnan(y)
+        if not validas.all():
+            codigos, y = codigos[validas], y[validas]
+
+        n_bins = max((len(c) + 2 for c in agrupador.cortes_.values()), default=1)
+        estadisticos = _estadisticos_woe(*_conteos_por_bin(codigos, y, n_bins))
+        if not estadisticos:
+            raise ValueError("El target debe tener eventos y no eventos para calcular el WoE")
+        woe = estadisticos['WoE']
+
+        X_woe = np.empty(codigos.shape)
+        for j in range(len(features)):
+            X_woe[:, j] = woe[j].take(codigos[:, j])
+        modelo = LogisticRegression(C=self.C, max_iter=1000).fit(X_woe, y)
+
+        self.target_ = target
+        self.features_ = features
+        self.agrupador_ = agrupador
+        self.woe_ = {f: woe[j, :len(agrupador.cortes_[f]) + 2].copy() for j, f in enumerate(features)}
+        self.coeficientes_ = modelo.coef_[0].copy()
+        self.intercepto_ = float(modelo.intercept_[0])
+        self.tabla_ = self._compilar()
+        return self
+
+    def _compilar(self) -> TablaPuntuacion:
+        cortes, puntos = [], []
+        for j, feature in enumerate(self.features_):
+            woe = self.woe_[feature]
+            cortes.append(np.append(self.agrupador_.cortes_[feature], np.inf))
+            # Bins en orden y 'Missing' (código 0) al final, donde cae el NaN en `searchsorted`
+            puntos.append(self.coeficientes_[j] * np.append(woe[1:], woe[0]))
+
+        def _inicios(tramos):
+            return np.concatenate([[0], np.cumsum([len(t) for t in tramos])]).astype(np.int64)
+
+        return TablaPuntuacion(
+            cortes=np.concatenate(cortes) if cortes else np.empty(0),
+            inicios_cortes=_inicios(cortes),
+            puntos=np.concatenate(puntos) if puntos else np.empty(0),
+            inicios_puntos=_inicios(puntos),
+            intercepto=self.intercepto_
+        )
+
+    @property
+    def _factor(self) -> float:
+        return self.pdo / np.log(2)
+
+    @property
+    def _desplazamiento(self) -> float:
+        return self.puntos_base - self._factor * np.log(self.odds_base)
+
+    def tabla(self) -> pd.DataFrame:
+        """
+        Scorecard legible: una fila por bin con su WoE, el coeficiente de la variable y los puntos.
+
+        La primera fila ('(Base)') lleva los puntos del intercepto; la puntuación de una fila es la
+        suma de los puntos base y los de sus bins.
+
+        Returns:
+            pd.DataFrame: Columnas 'Feature', 'Bin', 'WoE', 'Coeficiente' y 'Puntos'.
+        """
+        factor = self._factor
+        filas = [pd.DataFrame({'Feature': ['(Base)'], 'Bin': [None], 'WoE': [np.nan], 'Coeficiente': [np.nan],
+                               'Puntos': [self._desplazamiento - factor * self.intercepto_]})]
+        for j, feature in enumerate(self.features_):
+            woe = self.woe_[feature]
+            filas.append(pd.DataFrame({
+                'Feature': feature,
+                'Bin': self.agrupador_.etiquetas_[feature],
+                'WoE': woe,
+                'Coeficiente': self.coeficientes_[j],
+                'Puntos': -factor * self.coeficientes_[j] * woe
+            }))
+        return pd.concat(filas, ignore_index=True)
+
+    def _convertir(self, logit: np.ndarray, salida: str) -> np.ndarray:
+        if salida == 'probabilidad':
+            return special.expit(logit, out=logit)
+        if salida == 'puntos':
+            logit *= -self._factor
+            logit += self._desplazamiento
+        return logit
+
+    def _matriz(self, datos) -> Tuple[np.ndarray, Optional[List[int]]]:
+        """Matriz de entrada sin copiar cuando es posible, y columna de cada variable."""
+        if isinstance(datos, DatasetCacheado):
+            info = [datos._info[f] for f in self.features_]
+            if all(i['tipo'] == 'flotante' for i in info):
+                return datos._matriz_flotantes(), [i['indice'] for i in info]
+            return datos.matriz(self.features_), None
+        if isinstance(datos, str):
+            datos = np.load(datos, mmap_mode='r')
+        if datos.ndim != 2 or datos.shape[1] != len(self.features_):
+            raise ValueError(f"La matriz debe tener {len(self.features_)} columnas, en el orden de features_")
+        return datos, None
+
+    @staticmethod
+    def _descriptor_fuente(matriz: np.ndarray) -> Optional[tuple]:
+        """Cómo abrir la matriz desde otro proceso: el propio archivo si es un memmap completo."""
+        if isinstance(matriz, np.memmap) and isinstance(matriz.base, mmap.mmap) and matriz.filename:
+            orden = 'F' if matriz.flags.f_contiguous and not matriz.flags.c_contiguous else 'C'
+            return ('memmap', matriz.filename, matriz.offset, matriz.shape, matriz.dtype.str, orden)
+        return None
+
+    def puntuar_trozos(self, datos, salida: str = 'probabilidad', chunksize: int = 1_000_000,
+                       n_jobs: int = 1, **kwargs_csv) -> Iterator[np.ndarray]:
+        """
+        Puntúa `datos` por trozos de `chunksize` filas y devuelve la puntuación de cada trozo.
+
+        Args:
+            datos: Cualquiera de las entradas de `puntuar`.
+            salida (str): 'probabilidad' (de evento), 'logit' o 'puntos'.
+            chunksize (int): Filas por trozo.
+            n_jobs (int): Procesos de puntuación. Con 1 (por defecto) se puntúa en el proceso actual.
+            **kwargs_csv: Argumentos adicionales para `pd.read_csv` si `datos` es un CSV.
+
+        Yields:
+            np.ndarray: Puntuación de las filas de cada trozo, en orden.
+        """
+        if salida not in SALIDAS:
+            raise ValueError(f"salida debe ser uno de {SALIDAS}, no '{salida}'")
+
+        es_csv = isinstance(datos, str) and not datos.endswith('.npy')
+        if es_csv:
+            kwargs_csv.setdefault('usecols', self.features_)
+            bloques = (trozo[self.features_].to_numpy(dtype=np.float64)
+                       for trozo in pd.read_csv(datos, chunksize=chunksize, **kwargs_csv))
+        elif isinstance(datos, pd.DataFrame):
+            if n_jobs == 1:
+                bloques = (datos[self.features_].iloc[i:i + chunksize].to_numpy(dtype=np.float64)
+                           for i in range(0, len(datos), chunksize))
+            else:
+                datos = datos[self.features_].to_numpy(dtype=np.float64)
+
+        if n_jobs == 1:
+            if es_csv or isinstance(datos, pd.DataFrame):
+                for bloque in bloques:
+                    yield self._convertir(_logit_bloque(bloque, self.tabla_), salida)
+                return
+            matriz, columnas = self._matriz(datos)
+            for inicio in range(0, len(matriz), chunksize):
+                logit = _logit_bloque(matriz[inicio:inicio + chunksize], self.tabla_, columnas)
+                yield self._convertir(logit, salida)
+            return
+
+        n_jobs = n_jobs or os.cpu_count() or 1
+        if es_csv:
+            # El proceso actual lee el CSV; los procesos solo reciben cada bloque ya parseado
+            with ProcessPoolExecutor(max_workers=n_jobs, initializer=_inicializar_puntuacion,
+                                     initargs=(self.tabla_, None, None)) as executor:
+                for logit in _mapa_ordenado(executor, _tarea_bloque, bloques, 2 * n_jobs):
+                    yield self._convertir(logit, salida)
+            return
+
+        matriz, columnas = self._matriz(datos)
+        limites = [(i, min(i + chunksize, len(matriz))) for i in range(0, len(matriz), chunksize)]
+        descriptor = self._descriptor_fuente(matriz)
+        compartida = None
+        if descriptor is None:
+            # En memoria: se copia una vez a memoria compartida; un memmap se reabre en cada proceso
+            compartida = MatrizCompartida(matriz)
+            descriptor = ('compartida', compartida.descriptor)
+        try:
+            with ProcessPoolExecutor(max_workers=n_jobs, initializer=_inicializar_puntuacion,
+                                     initargs=(self.tabla_, descriptor, columnas)) as executor:
+                for logit in _mapa_ordenado(executor, _tarea_limites, limites, 2 * n_jobs):
+                    yield self._convertir(logit, salida)
+        finally:
+            if compartida is not None:
+                compartida.cerrar()
+
+    @instrumentar
+    def puntuar(self, datos: Union[pd.DataFrame, DatasetCacheado, np.ndarray, str], salida: str = 'probabilidad',
+                chunksize: int = 1_000_000, n_jobs: int = 1, **kwargs_csv) -> np.ndarray:
+        """
+        Puntúa un DataFrame, un dataset cacheado, una matriz (en memoria o memmap), un `.npy`
+        (se abre como memmap) o un CSV (se lee por trozos).
+
+        Las matrices deben tener las columnas en el orden de `features_`. Con `n_jobs` > 1 los
+        trozos se reparten entre procesos: un memmap o un `.npy` se reabre en cada proceso, una
+        matriz en memoria se copia una vez a memoria compartida y cada proceso recibe solo los
+        límites de su trozo.
+
+        Args:
+            datos: Datos a puntuar.
+            salida (str): 'probabilidad' (de evento), 'logit' o 'puntos'.
+            chunksize (int): Filas por trozo (acota la memoria temporal).
+            n_jobs (int): Procesos de puntuación. Con 1 (por defecto) se puntúa en el proceso actual.
+            **kwargs_csv: Argumentos adicionales para `pd.read_csv` si `datos` es un CSV.
+
+        Returns:
+            np.ndarray: Puntuación de cada fila, en el orden de entrada.
+        """
+        trozos = list(self.puntuar_trozos(datos, salida, chunksize, n_jobs, **kwargs_csv))
+        return np.concatenate(trozos) if trozos else np.empty(0)
+
+    def guardar(self, ruta: str):
+        """
+        Guarda la scorecard (cortes, etiquetas, WoE, coeficientes y escalado) en un `.npz` comprimido.
+
+        Args:
+            ruta (str): Ruta del archivo de salida.
+        """
+        arrays = self.agrupador_._a_arrays()
+        arrays['agrupador_meta'] = arrays.pop('meta')
+        meta = {'target': self.target_, 'C': self.C, 'puntos_base': self.puntos_base,
+                'odds_base': self.odds_base, 'pdo': self.pdo, 'intercepto': self.intercepto_}
+        np.savez_compressed(
+            ruta,
+            woe=np.concatenate([self.woe_[f] for f in self.features_]) if self.features_ else np.empty(0),
+            coeficientes=self.coeficientes_,
+            meta=np.asarray(json.dumps(meta)),
+            **arrays
+        )
+
+    @classmethod
+    def cargar(cls, ruta: str) -> 'Scorecard':
+        """
+        Carga una scorecard guardada con `guardar`.
+
+        Args:
+            ruta (str): Ruta del archivo `.npz`.
+
+        Returns:
+            Scorecard: Scorecard lista para `puntuar`.
+        """
+        with np.load(ruta, allow_pickle=False) as datos:
+            meta = json.loads(str(datos['meta']))
+            arrays = {k: datos[k] for k in ('features', 'cortes', 'n_cortes', 'etiquetas')}
+            agrupador = AgrupadorOptimo._desde_arrays({**arrays, 'meta': datos['agrupador_meta']})
+            woe, coeficientes = datos['woe'], datos['coeficientes']
+
+        scorecard = cls(agrupador, agrupador.max_bins, agrupador.min_bins, agrupador.metodo, agrupador.monotonico,
+                        meta['C'], meta['puntos_base'], meta['odds_base'], meta['pdo'])
+        scorecard.target_ = meta['target']
+        scorecard.features_ = list(agrupador.features_)
+        scorecard.agrupador_ = agrupador
+        scorecard.woe_ = {}
+        inicio = 0
+        for feature in scorecard.features_:
+            n = len(agrupador.cortes_[feature]) + 2
+            scorecard.woe_[feature] = woe[inicio:inicio + n].copy()
+            inicio += n
+        scorecard.coeficientes_ = coeficientes.copy()
+        scorecard.intercepto_ = float(meta['intercepto'])
+        scorecard.tabla_ = scorecard._compilar()
+        return scorecard
@@ -1,8 +1,12 @@
 import pandas as pd
-from sklearn.feature_selection import SelectKBest, f_classif
-from typing import List, Tuple
+from typing import List, Tuple, Union
+from .anova_f import AnovaF
+from .cargador import _como_dataframe
+from .instrumentacion import instrumentar
 
-def select_mejor_k(X: pd.DataFrame, y: pd.Series, k: int = 7) -> pd.DataFrame:
+@instrumentar
+def select_mejor_k(X: pd.DataFrame, y: pd.Series, k: Union[int, str] = 7,
+                   solo_nombres: bool = False) -> Union[pd.DataFrame, List[str]]:
 
     """
     Selecciona las 'K' mejores variables (features) de un DataFrame basándose en el criterio estadístico f_classif.
@@ -13,40 +17,39 @@ def select_mejor_k(X: pd.DataFrame, y: pd.Series, k: int = 7) -> pd.DataFrame:
     Args:
         X (pd.DataFrame): DataFrame que contiene las variables independientes (features).
         y (pd.Series): Serie que contiene la variable objetivo (target/clase).
-        k (int, optional): El número de mejores variables a seleccionar. Por defecto es 7.
+        k (int | str, optional): El número de mejores variables a seleccionar. Por defecto es 7.
+            Como en `SelectKBest`, 'all' selecciona todas y un k mayor que el número de
+            variables avisa y también las selecciona todas.
+        solo_nombres (bool, optional): Si es True devuelve solo los nombres de las variables, sin
+            copiar los datos. Para probar varios k, usar `AnovaF(...).tabla()` una sola vez.
     Returns:
-        pd.DataFrame: Un nuevo DataFrame que contiene solo las 'k' mejores variables seleccionadas.
+        pd.DataFrame: Un nuevo DataFrame que contiene solo las 'k' mejores variables seleccionadas
+            (o la lista de sus nombres con solo_nombres=True).
 
     """
+    X = _como_dataframe(X)
     
 
-    # Inicializar el selector SelectKBest con la función de puntuación f_classif y el número de features k
-    # f_classif calcula el valor F de ANOVA para la muestra proporcionada.
+    # Acumular los estadísticos suficientes del ANOVA (conteos, sumas y sumas de cuadrados por
+    # clase) en una sola pasada; el ranking completo sirve para cualquier k.
+    # Mismo criterio F de ANOVA que SelectKBest(f_classif), con el mismo desempate.
 
-    selector = SelectKBest(score_func=f_classif, k=k)
-    
-    # Ajustar el selector a los datos (X, y) y transformar X para reducirlo a las k mejores features
-    # fit_transform devuelve un array de numpy, por lo que perderemos los nombres de las columnas
-
-    X_new_array = selector.fit_transform(X, y)
-    
-    # Obtener los índices de las columnas seleccionadas (una máscara booleana)
+    anova = AnovaF(X.columns).actualizar(X, y)
 
-    selected_indices = selector.get_support(indices=True)
+    # Obtener los nombres de las columnas seleccionadas, en el orden original de X
 
-    # Obtener los nombres de las columnas seleccionadas usando los índices
-
-    selected_features = X.columns[selected_indices]
-    
-    # Crear un nuevo DataFrame con las features seleccionadas, preservando el índice original de X
+    selected_features = anova.mejores(k)
 
-    X_new = pd.DataFrame(X_new_array, columns=selected_features, index=X.index)
-    
     # Imprimir información sobre las variables seleccionadas para retroalimentación
 
-    print(f"Se han seleccionado las siguientes {k} variables usando f_classif:")
+    print(f"Se han seleccionado las siguientes {len(selected_features)} variables usando f_classif:")
     for feature in selected_features:
         print(f" - {feature}")
 
-    return X_new
+    if solo_nombres:
+        return selected_features
+
+    # Crear un nuevo DataFrame con las features seleccionadas, preservando el índice original de X
+
+    return X[selected_features].copy()
 
@@ -0,0 +1,265 @@
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import pandas as pd
+import numpy as np
+from scipy.linalg import eigh
+
+from .cargador import _como_dataframe
+from .correlaciones import _estandarizar
+from .instrumentacion import instrumentar
+
+
+class InfoCluster(NamedTuple):
+    variables: List[int]
+    eigval1: float
+    eigval2: float
+    eigvecs: np.ndarray
+    varprop: float
+
+
+def _quartimax(cargas: np.ndarray, max_iter: int = 500, tol: float = 1e-5) -> np.ndarray:
+    """
+    Rotación ortogonal quartimax por proyección del gradiente (GPA), con los mismos parámetros
+    que `factor_analyzer.Rotator(method='quartimax')` usado por VarClusHi.
+    """
+    rotacion = np.eye(cargas.shape[1])
+    alpha = 1.0
+    nuevas = cargas @ rotacion
+    criterio = -np.sum(nuevas ** 4) / 4
+    gradiente = cargas.T @ -nuevas ** 3
+
+    for _ in range(max_iter + 1):
+        m = rotacion.T @ gradiente
+        gradiente_proyectado = gradiente - rotacion @ ((m + m.T) / 2)
+        s = np.sqrt(np.sum(gradiente_proyectado ** 2))
+        if s < tol:
+            break
+
+        alpha *= 2
+        for _ in range(11):
+            u, _, vt = np.linalg.svd(rotacion - alpha * gradiente_proyectado)
+            nueva_rotacion = u @ vt
+            nuevas = cargas @ nueva_rotacion
+            nuevo_criterio = -np.sum(nuevas ** 4) / 4
+            if nuevo_criterio < criterio - 0.5 * s ** 2 * alpha:
+                break
+            alpha /= 2
+
+        rotacion = nueva_rotacion
+        criterio = nuevo_criterio
+        gradiente = cargas.T @ -nuevas ** 3
+
+    return nuevas
+
+
+class VarClus:
+    """
+    Clustering de variables (VarClus) calculado sobre la matriz de correlación.
+
+    Sigue el algoritmo de VarClusHi (divisiones por el segundo autovalor, rotación quartimax y
+    reasignación que maximiza la suma de primeros autovalores), pero la correlación se calcula una
+    sola vez y cada autodescomposición trabaja sobre la submatriz del clúster, por lo que el coste
+    de cada división depende del número de variables y no del número de filas. Los primeros
+    autovalores se guardan en caché por conjunto de variables (la reasignación evalúa muchas veces
+    los mismos conjuntos) y las divisiones de los clústeres candidatos se calculan en paralelo en
+    un pool de hilos.
+
+    Args:
+        max_eigval2 (float): Un clúster se divide mientras su segundo autovalor supere este umbral.
+        max_clusters (int, optional): Número máximo de clústeres.
+        n_jobs (int, optional): Hilos para evaluar divisiones. Por defecto, todos los núcleos.
+
+    Attributes:
+        variables_ (List[str]): Nombres de las variables.
+        corr_ (np.ndarray): Matriz de correlación.
+        clusters_ (List[InfoCluster]): Clústeres finales; su posición es el identificador.
+    """
+
+    def __init__(self, max_eigval2: float = 1.0, max_clusters: Optional[int] = None,
+                 n_jobs: Optional[int] = None):
+        self.max_eigval2 = max_eigval2
+        self.max_clusters = max_clusters
+        self.n_jobs = n_jobs or os.cpu_count() or 1
+
+    @instrumentar
+    def fit(self, df: pd.DataFrame) -> 'VarClus':
+        """
+        Calcula la correlación de las columnas de `df` y ajusta los clústeres.
+
+        Args:
+            df (pd.DataFrame): DataFrame con las variables numéricas a agrupar.
+
+        Returns:
+            VarClus: El propio objeto ajustado.
+        """
+        df = _como_dataframe(df)
+        z = _estandarizar(df.to_numpy(dtype=np.float64, na_value=np.nan), np.float64)
+        return self.fit_correlacion(z.T @ z, df.columns)
+
+    @instrumentar
+    def fit_correlacion(self, corr: np.ndarray, variables: Sequence[str]) -> 'VarClus':
+        """
+        Ajusta los clústeres a partir de una matriz de correlación ya calculada.
+
+        Args:
+            corr (np.ndarray): Matriz de correlación (variables x variables).
+            variables (Sequence[str]): Nombre de cada fila/columna de `corr`.
+
+        Returns:
+            VarClus: El propio objeto ajustado.
+        """
+        self.corr_ = np.asarray(corr, dtype=np.float64)
+        self.variables_ = list(variables)
+        self._cache_eigval1: Dict[frozenset, float] = {}
+
+        self.clusters_ = [self._info_cluster(list(range(len(self.variables_))))]
+        divisiones: Dict[Tuple[int, ...], Future] = {}
+
+        with ThreadPoolExecutor(max_workers=self.n_jobs) as pool:
+            while True:
+                if self.max_clusters is not None and len(self.clusters_) >= self.max_clusters:
+                    break
+
+                idx = max(range(len(self.clusters_)), key=lambda i: self.clusters_[i].eigval2)
+                if not self.clusters_[idx].eigval2 > self.max_eigval2:
+                    break
+
+                # La división de un clúster solo depende de sus variables: se lanzan todas las
+                # candidatas a la vez y las que no se usen ahora se reutilizan en pasos siguientes
+                candidatos = [idx] if self.n_jobs == 1 else [
+                    i for i, c in enumerate(self.clusters_) if c.eigval2 > self.max_eigval2]
+                for i in candidatos:
+                    clave = tuple(self.clusters_[i].variables)
+                    if clave not in divisiones:
+                        divisiones[clave] = pool.submit(self._dividir, self.clusters_[i])
+
+                division = divisiones.pop(tuple(self.clusters_[idx].variables)).result()
+                if division is None:
+                    break
+
+                clus1, clus2 = division
+                self.clusters_[idx] = self._info_cluster(clus1)
+                self.clusters_.append(self._info_cluster(clus2))
+
+            for futuro in divisiones.values():
+                futuro.cancel()
+
+        return self
+
+    def _submatriz(self, variables: List[int]) -> np.ndarray:
+        return self.corr_[np.ix_(variables, variables)]
+
+    def _info_cluster(self, variables: List[int]) -> InfoCluster:
+        """Dos primeros autovalores/autovectores y proporción de varianza de un clúster."""
+        n = len(variables)
+        if n <= 1:
+            return InfoCluster(variables, float(n), 0.0, np.array([[float(n)]]), float(n))
+        valores, vectores = np.linalg.eigh(self._submatriz(variables))
+        orden = np.argsort(valores)[::-1]
+        valores, vectores = valores[orden], vectores[:, orden]
+        return InfoCluster(variables, valores[0], valores[1], vectores[:, :2], valores[0] / valores.sum())
+
+    def _eigval1(self, variables: List[int]) -> float:
+        """Primer autovalor de un conjunto de variables, con caché (no depende del orden)."""
+        n = len(variables)
+        if n <= 1:
+            return float(n)
+        clave = frozenset(variables)
+        valor = self._cache_eigval1.get(clave)
+        if valor is None:
+            valor = eigh(self._submatriz(variables), eigvals_only=True, subset_by_index=[n - 1, n - 1])[0]
+            self._cache_eigval1[clave] = valor
+        return valor
+
+    def _reasignar(self, clus1: List[int], clus2: List[int]) -> Tuple[List[int], List[int]]:
+        """Mueve variables entre los dos clústeres mientras aumente la suma de primeros autovalores."""
+        variables = clus1 + clus2
+        mejor = self._eigval1(clus1) + self._eigval1(clus2)
+        fin1, fin2 = clus1[:], clus2[:]
+        maximo = mejor
+
+        while True:
+            for var in variables:
+                nuevo1, nuevo2 = fin1[:], fin2[:]
+                if var in nuevo1:
+                    nuevo1.remove(var)
+                    nuevo2.append(var)
+                else:
+                    nuevo2.remove(var)
+                    nuevo1.append(var)
+
+                total = self._eigval1(nuevo1) + self._eigval1(nuevo2)
+                if total > mejor:
+                    mejor = total
+                    fin1, fin2 = nuevo1, nuevo2
+
+            if maximo == mejor:
+                break
+            maximo = mejor
+
+        return fin1, fin2
+
+    def _dividir(self, cluster: InfoCluster) -> Optional[Tuple[List[int], List[int]]]:
+        """
+        Divide un clúster en dos según su correlación con las dos primeras componentes rotadas.
+        Devuelve None si el clúster no se puede dividir.
+        """
+        if not cluster.eigval2 > self.max_eigval2:
+            return None
+
+        sub = self._submatriz(cluster.variables)
+        rotados = _quartimax(cluster.eigvecs)
+        sigma = np.sqrt(np.einsum('ik,ij,jk->k', rotados, sub, rotados))
+        corr_pc = (sub @ rotados) / sigma
+
+        en_primero = np.abs(corr_pc[:, 0]) > np.abs(corr_pc[:, 1])
+        clus1 = [v for v, primero in zip(cluster.variables, en_primero) if primero]
+        clus2 = [v for v, primero in zip(cluster.variables, en_primero) if not primero]
+        return self._reasignar(clus1, clus2)
+
+    @property
+    def info(self) -> pd.DataFrame:
+        """Resumen por clúster: 'Cluster', 'N_Vars', 'Eigval1', 'Eigval2', 'VarProp'."""
+        return pd.DataFrame({
+            'Cluster': range(len(self.clusters_)),
+            'N_Vars': [len(c.variables) for c in self.clusters_],
+            'Eigval1': [c.eigval1 for c in self.clusters_],
+            'Eigval2': [c.eigval2 for c in self.clusters_],
+            'VarProp': [c.varprop for c in self.clusters_]
+        })
+
+    @property
+    def rsquare(self) -> pd.DataFrame:
+        """
+        R² de cada variable con la primera componente de su clúster y del clúster más cercano,
+        con las mismas columnas que `VarClusHi.rsquare`: 'Cluster', 'Variable', 'RS_Own',
+        'RS_NC' y 'RS_Ratio' = (1 - RS_Own) / (1 - RS_NC).
+        """
+        n_clusters = len(self.clusters_)
+        # rs[v, k]: correlación² de la variable v con la primera componente del clúster k
+        rs = np.empty((len(self.variables_), n_clusters))
+        for k, cluster in enumerate(self.clusters_):
+            vector = cluster.eigvecs[:, 0]
+            sigma = np.sqrt(vector @ self._submatriz(cluster.variables) @ vector)
+            rs[:, k] = (self.corr_[:, cluster.variables] @ vector / sigma) ** 2
+
+        filas = [(k, v) for k, cluster in enumerate(self.clusters_) for v in cluster.variables]
+        propio = np.array([k for k, _ in filas], dtype=np.int64)
+        variables = np.array([v for _, v in filas], dtype=np.int64)
+
+        rs_own = rs[variables, propio]
+        otros = rs[variables].copy()
+        otros[np.arange(len(filas)), propio] = -np.inf
+        rs_nc = otros.max(axis=1) if n_clusters > 1 else np.zeros(len(filas))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ratio = (1 - rs_own) / (1 - rs_nc)
+
+        return pd.DataFrame({
+            'Cluster': propio,
+            'Variable': [self.variables_[v] for v in variables],
+            'RS_Own': rs_own,
+            'RS_NC': rs_nc,
+            'RS_Ratio': ratio
+        })
@@ -1,21 +1,36 @@
 import pandas as pd
-from varclushi import VarClusHi
+from typing import Optional
+from .cargador import _como_dataframe
+from .varclus import VarClus
+from .instrumentacion import instrumentar
 
-def varclushi_analisis(df: pd.DataFrame, max_eigval2: float = 1.0, max_pca_components: int = 20) -> pd.DataFrame:
+MOTORES = ('nativo', 'varclushi')
+
+@instrumentar
+def varclushi_analisis(df: pd.DataFrame, max_eigval2: float = 1.0, max_pca_components: int = 20,
+                       motor: str = 'nativo', n_jobs: Optional[int] = None) -> pd.DataFrame:
     """
     Realiza un análisis VarClusHi para agrupar variables correlacionadas.
     
     VarClusHi requiere que solo se incluyan variables predictoras (features), no la variable objetivo
     ni identificadores. El algoritmo puede fallar si se incluyen columnas no apropiadas.
+
+    Por defecto se usa el motor nativo `VarClus`, que aplica el mismo algoritmo sobre la matriz de
+    correlación calculada una sola vez; motor='varclushi' usa la librería externa.
     
     Args:
         df (pd.DataFrame): DataFrame con variables numéricas.
         max_eigval2 (float): Umbral del segundo autovalor para detener la división (criterio de parada).
         max_pca_components (int): Número máximo de componentes principales a calcular.
+        motor (str): 'nativo' (por defecto) o 'varclushi'.
+        n_jobs (int, optional): Hilos para evaluar divisiones (solo motor nativo).
         
     Returns:
         pd.DataFrame: DataFrame con la información de los clústeres y métricas (RS_Ratio, etc.).
     """
+    if motor not in MOTORES:
+        raise ValueError(f"motor debe ser uno de {MOTORES}: {motor}")
+    df = _como_dataframe(df)
     # Filtrar solo columnas numéricas
     df_numeric = df.select_dtypes(include=['number']).copy()
     
@@ -30,13 +45,21 @@ def varclushi_analisis(df: pd.DataFrame, max_eigval2: float = 1.0, max_pca_compo
     
     print(f"Ejecutando VarClusHi con {df_numeric.shape[1]} variables...")
     
-    # Instanciar el modelo VarClusHi
-    # maxeigval2: criterio de parada (si el segundo autovalor es < maxeigval2, no se divide más)
-    # maxclus: número máximo de clústeres permitidos
-    demo_vc = VarClusHi(df_numeric, maxeigval2=max_eigval2, maxclus=max_pca_components)
-    
-    # Entrenar
-    demo_vc.varclus()
+    if motor == 'nativo':
+        # Misma salida que VarClusHi, trabajando sobre la matriz de correlación
+        demo_vc = VarClus(max_eigval2=max_eigval2, max_clusters=max_pca_components, n_jobs=n_jobs)
+        demo_vc.fit(df_numeric)
+    else:
+        # Importación diferida: la librería solo es necesaria con este motor
+        from varclushi import VarClusHi
+
+        # Instanciar el modelo VarClusHi
+        # maxeigval2: criterio de parada (si el segundo autovalor es < maxeigval2, no se divide más)
+        # maxclus: número máximo de clústeres permitidos
+        demo_vc = VarClusHi(df_numeric, maxeigval2=max_eigval2, maxclus=max_pca_components)
+
+        # Entrenar
+        demo_vc.varclus()
     
     # Obtener el resumen de información (rsquare)
     # Este dataframe contiene: Cluster, Variable, RS_Own, RS_NC, RS_Ratio
@@ -3,10 +3,43 @@ import numpy as np
 from typing import Tuple, Union
 from sklearn.tree import DecisionTreeClassifier
 from .agrupamiento_optimo import agrupamiento_optimo
+from .woe_iv_multiple import woe_iv_multiple
+from .cargador import _como_dataframe
+from .instrumentacion import instrumentar
 
+
+def _woe_iv_codigos(df: pd.DataFrame, feature: str, target: str) -> Tuple[pd.DataFrame, float]:
+    """
+    WoE/IV de una variable categórica o de códigos enteros pequeños mediante conteo vectorizado,
+    sin convertir los valores a cadenas ni agrupar por etiquetas.
+    """
+    serie = df[feature]
+
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        categorias = list(serie.cat.categories)
+        codigos = serie.cat.codes.to_numpy().astype(np.int64)
+        nulos = codigos < 0
+        if nulos.any():
+            # Igual que fillna('Missing'): los nulos van a la categoría 'Missing'
+            if 'Missing' not in categorias:
+                categorias.append('Missing')
+            codigos[nulos] = categorias.index('Missing')
+        etiquetas = {feature: categorias}
+    else:
+        codigos = serie.to_numpy()
+        etiquetas = None
+
+    tablas, resumen = woe_iv_multiple(codigos, df[target], [feature], etiquetas)
+    return tablas[feature], float(resumen['IV'].iloc[0])
+
+@instrumentar
 def woe_iv(df: pd.DataFrame, feature: str, target: str) -> Tuple[pd.DataFrame, float]:
     """
     Calcula el Peso de la Evidencia (WoE) y el Valor de Información (IV) para una variable categórica.
+
+    Si la variable es un `pd.Categorical` o un código entero pequeño (int8/int16 no negativo, como
+    los de `agrupamiento_optimo(formato='categorico')` o `agrupamiento_multiple(formato='codigos')`),
+    los conteos se calculan directamente sobre los códigos.
     
     Args:
         df (pd.DataFrame): El DataFrame que contiene los datos.
@@ -18,7 +51,13 @@ def woe_iv(df: pd.DataFrame, feature: str, target: str) -> Tuple[pd.DataFrame, f
             - Un DataFrame con las estadísticas detalladas por categoría (Count, Event, NonEvent, WoE, IV).
             - El valor total de IV de la variable.
     """
-    
+    df = _como_dataframe(df)
+    serie = df[feature]
+    es_codigo = (pd.api.types.is_integer_dtype(serie.dtype) and serie.dtype.itemsize <= 2
+                 and not isinstance(serie.dtype, pd.CategoricalDtype))
+    if isinstance(serie.dtype, pd.CategoricalDtype) or (es_codigo and (len(serie) == 0 or serie.min() >= 0)):
+        return _woe_iv_codigos(df, feature, target)
+
     # Asegurarse de que no haya nulos o tratarlos como una categoría
     df_temp = df[[feature, target]].copy()
     df_temp[feature] = df_temp[feature].fillna('Missing')
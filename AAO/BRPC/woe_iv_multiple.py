@@ -0,0 +1,140 @@
+import pandas as pd
+import numpy as np
+from typing import Dict, Optional, Sequence, Tuple
+from .instrumentacion import instrumentar
+
+# Mismo suavizado que `woe_iv` para evitar log(0)
+EPSILON = 0.0001
+
+
+def _conteos_por_bin(codigos: np.ndarray, y: np.ndarray,
+                     n_bins: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Cuenta eventos y no eventos de cada (variable, bin) con un único `np.bincount`.
+
+    Args:
+        codigos (np.ndarray): Matriz de códigos de bin no negativos (filas x variables).
+        y (np.ndarray): Target binario (0/1) sin nulos.
+        n_bins (int, optional): Número de bins de las matrices de salida. Por defecto, el mayor
+            código observado más uno; fijarlo permite sumar conteos de distintas particiones.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Matrices (variables x bins) de no eventos y eventos.
+    """
+    n, n_features = codigos.shape
+    if n_bins is None:
+        n_bins = int(codigos.max()) + 1 if codigos.size else 1
+
+    # Índice plano ((variable, bin), clase): la clase ocupa el bit menos significativo
+    plano = codigos.astype(np.int64)
+    plano += np.arange(n_features, dtype=np.int64) * n_bins
+    plano <<= 1
+    plano += y.astype(np.int64)[:, None]
+
+    conteos = np.bincount(plano.ravel(), minlength=2 * n_features * n_bins)
+    conteos = conteos.reshape(n_features, n_bins, 2)
+    return conteos[:, :, 0], conteos[:, :, 1]
+
+
+def _estadisticos_woe(no_eventos: np.ndarray, eventos: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Calcula DistEvent, DistNonEvent, WoE e IV_Group a partir de los conteos (variables x bins).
+    Devuelve un diccionario vacío si no hay eventos o no hay no eventos (IV = 0).
+    """
+    total_events = eventos.sum(axis=-1, keepdims=True)
+    total_non_events = no_eventos.sum(axis=-1, keepdims=True)
+
+    if np.any(total_events == 0) or np.any(total_non_events == 0):
+        return {}
+
+    dist_event = eventos / total_events
+    dist_non_event = no_eventos / total_non_events
+    woe = np.log((dist_event + EPSILON) / (dist_non_event + EPSILON))
+    return {
+        'DistEvent': dist_event,
+        'DistNonEvent': dist_non_event,
+        'WoE': woe,
+        'IV_Group': (dist_event - dist_non_event) * woe
+    }
+
+
+def _resultado_woe(no_eventos: np.ndarray, eventos: np.ndarray, features: Sequence[str],
+                   etiquetas: Optional[Dict[str, Sequence[str]]] = None,
+                   tablas: bool = True) -> Tuple[Dict[str, pd.DataFrame], pd.DataFrame]:
+    """
+    Construye las tablas de WoE y el resumen de IV de `woe_iv_multiple` a partir de las
+    matrices de conteos (variables x bins).
+    """
+    estadisticos = _estadisticos_woe(no_eventos, eventos)
+    if estadisticos:
+        iv = estadisticos['IV_Group'].sum(axis=1)
+    else:
+        iv = np.zeros(len(features))
+
+    resumen = (pd.DataFrame({'Feature': features, 'IV': iv})
+               .sort_values(by='IV', ascending=False)
+               .reset_index(drop=True))
+
+    resultado = {}
+    if tablas:
+        for j, feature in enumerate(features):
+            observados = np.flatnonzero(no_eventos[j] + eventos[j])
+            if etiquetas is not None and feature in etiquetas:
+                categorias = np.asarray(etiquetas[feature], dtype=object)[observados]
+            else:
+                categorias = observados
+
+            tabla = pd.DataFrame({
+                feature: categorias,
+                'NonEvent': no_eventos[j, observados],
+                'Event': eventos[j, observados]
+            })
+            for columna, valores in estadisticos.items():
+                tabla[columna] = valores[j, observados]
+            resultado[feature] = tabla
+
+    return resultado, resumen
+
+
+@instrumentar
+def woe_iv_multiple(codigos: np.ndarray, y, features: Optional[Sequence[str]] = None,
+                    etiquetas: Optional[Dict[str, Sequence[str]]] = None,
+                    tablas: bool = True) -> Tuple[Dict[str, pd.DataFrame], pd.DataFrame]:
+    """
+    Calcula el WoE y el IV de todas las variables a la vez a partir de sus códigos de bin.
+
+    Equivale a llamar a `woe_iv` para cada variable discretizada, pero todas las tablas de
+    eventos/no eventos salen de un único conteo vectorizado sobre la matriz de códigos.
+
+    Args:
+        codigos (np.ndarray): Matriz (filas x variables) de enteros no negativos, por ejemplo
+            la salida de `AgrupadorOptimo.transform_codigos` (0 = 'Missing').
+        y (array-like): Target binario (0/1). Las filas con target nulo se ignoran.
+        features (Sequence[str], optional): Nombres de las variables. Por defecto 'X0', 'X1', ...
+        etiquetas (Dict[str, Sequence[str]], optional): Etiqueta de cada código por variable
+            (p. ej. `AgrupadorOptimo.etiquetas_`). Si no se indica, se muestran los códigos.
+        tablas (bool): Si es False solo se calcula el resumen de IV, sin construir las tablas.
+
+    Returns:
+        Tuple[Dict[str, pd.DataFrame], pd.DataFrame]:
+            - Tabla por variable con las columnas de `woe_iv` (NonEvent, Event, DistEvent,
+              DistNonEvent, WoE, IV_Group), una fila por bin observado.
+            - Resumen con las columnas 'Feature' e 'IV', ordenado de mayor a menor IV.
+    """
+    codigos = np.asarray(codigos)
+    if codigos.ndim == 1:
+        codigos = codigos.reshape(-1, 1)
+    if codigos.size and codigos.min() < 0:
+        raise ValueError("Los códigos de bin deben ser enteros no negativos")
+
+    y = np.asarray(y, dtype=np.float64)
+    validos = ~np.isnan(y)
+    if not validos.all():
+        codigos, y = codigos[validos], y[validos]
+
+    if features is None:
+        features = [f'X{j}' for j in range(codigos.shape[1])]
+    features = list(features)
+
+    no_eventos, eventos = _conteos_por_bin(codigos, y)
+    return _resultado_woe(no_eventos, eventos, features, etiquetas, tablas)
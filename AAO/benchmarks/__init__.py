@@ -0,0 +1,11 @@
+"""
+Benchmarks de tiempo y memoria de BRPC sobre datos sintéticos con el esquema del dataset de
+quiebras de empresas polacas.
+
+Uso (desde AAO):
+    python -m benchmarks --escalas base filas_x10 --salida actual.json --referencia base.json
+"""
+from .datos_sinteticos import generar_dataset
+from .medicion import medir
+from .casos import CASOS, Contexto, caso
+from .ejecutar import ESCALAS, ejecutar_benchmarks, comparar_resultados, guardar_resultados, cargar_resultados
@@ -0,0 +1,285 @@
+import contextlib
+import io
+import os
+from functools import cached_property
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+import BRPC
+from BRPC import plots
+
+from .datos_sinteticos import generar_dataset
+
+TARGET = 'class'
+
+
+class Contexto:
+    """
+    Datos de entrada de los casos para una escala (filas x variables).
+
+    Cada dato derivado (dataset procesado, CSV en disco, códigos de bin, PCA...) se calcula la
+    primera vez que lo pide un caso y se reutiliza en los siguientes, fuera del tiempo medido.
+
+    Args:
+        n_filas (int): Filas del dataset sintético.
+        n_variables (int): Ratios del dataset sintético.
+        directorio (str): Carpeta para los archivos temporales (CSV, cachés).
+        semilla (int): Semilla del generador.
+    """
+
+    def __init__(self, n_filas: int, n_variables: int, directorio: str, semilla: int = 0):
+        self.n_filas = n_filas
+        self.n_variables = n_variables
+        self.directorio = directorio
+        self.semilla = semilla
+        os.makedirs(directorio, exist_ok=True)
+
+    @cached_property
+    def df(self) -> pd.DataFrame:
+        return generar_dataset(self.n_filas, self.n_variables, semilla=self.semilla)
+
+    @cached_property
+    def features(self) -> List[str]:
+        return [c for c in self.df.columns if c not in ('year', TARGET)]
+
+    @cached_property
+    def df_procesado(self) -> pd.DataFrame:
+        return BRPC.Preprocessor(target=TARGET).fit_transform(self.df)
+
+    @cached_property
+    def features_procesadas(self) -> List[str]:
+        return [c for c in self.df_procesado.columns if c not in ('year', TARGET)]
+
+    @cached_property
+    def ruta_csv(self) -> str:
+        ruta = os.path.join(self.directorio, f'sintetico_{self.n_filas}x{self.n_variables}.csv')
+        if not os.path.exists(ruta):
+            self.df.to_csv(ruta, index=False)
+        return ruta
+
+    @cached_property
+    def agrupador(self) -> BRPC.AgrupadorOptimo:
+        return BRPC.AgrupadorOptimo(metodo='dp').fit(self.df, self.features, TARGET)
+
+    @cached_property
+    def codigos(self) -> np.ndarray:
+        return self.agrupador.transform_codigos(self.df)
+
+    @cached_property
+    def scorecard(self) -> BRPC.Scorecard:
+        return BRPC.Scorecard(self.agrupador).fit(self.df, self.features[:7], TARGET)
+
+    @cached_property
+    def df_pca(self) -> pd.DataFrame:
+        with silencio():
+            df_pca, _, _ = BRPC.pca_analisis(self.df_procesado, n_components=3, metodo='aleatorio')
+        return df_pca
+
+    @cached_property
+    def rsquare(self) -> pd.DataFrame:
+        return BRPC.VarClus().fit(self.df_procesado[self.features_procesadas]).rsquare
+
+
+class Caso(NamedTuple):
+    nombre: str
+    funcion: Callable[[Contexto], object]
+    requiere: Tuple[str, ...] = ()
+    max_variables: Optional[int] = None
+
+
+CASOS: Dict[str, Caso] = {}
+
+
+def caso(nombre: str, requiere: Tuple[str, ...] = ('df',), max_variables: Optional[int] = None):
+    """
+    Registra un caso de benchmark.
+
+    `requiere` son los atributos del `Contexto` que usa el caso; se calculan antes de medir para
+    que su coste no cuente en el caso. `max_variables` omite el caso en escalas más anchas (para
+    algoritmos cuyo coste crece de forma superlineal con el número de variables).
+    """
+    def registrar(funcion: Callable[[Contexto], object]):
+        CASOS[nombre] = Caso(nombre, funcion, tuple(requiere), max_variables)
+        return funcion
+    return registrar
+
+
+@contextlib.contextmanager
+def silencio():
+    """Descarta los print de las funciones de BRPC."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+
+def _cerrar_figuras():
+    import matplotlib.pyplot as plt
+    plt.close('all')
+
+
+# --- Carga y análisis -------------------------------------------------------------------------
+
+@caso('cargar_dataset', requiere=('ruta_csv',))
+def _cargar_dataset(ctx: Contexto):
+    return BRPC.cargar_dataset(ctx.ruta_csv, directorio_cache=os.path.join(ctx.directorio, 'cache'),
+                               refrescar=True)
+
+
+@caso('analisis_dataset')
+def _analisis_dataset(ctx: Contexto):
+    return BRPC.analisis_dataset(ctx.df)
+
+
+@caso('analisis_dataset_streaming', requiere=('ruta_csv',))
+def _analisis_dataset_streaming(ctx: Contexto):
+    return BRPC.analisis_dataset_streaming(ctx.ruta_csv)
+
+
+@caso('candidatos_analizados')
+def _candidatos_analizados(ctx: Contexto):
+    return BRPC.candidatos_analizados(ctx.df)
+
+
+@caso('pares_correlacionados', requiere=('df', 'features'))
+def _pares_correlacionados(ctx: Contexto):
+    return BRPC.pares_correlacionados(ctx.df[ctx.features])
+
+
+# --- Preprocesado -----------------------------------------------------------------------------
+
+@caso('procesado_dataset')
+def _procesado_dataset(ctx: Contexto):
+    return BRPC.procesado_dataset(ctx.df)
+
+
+@caso('procesado_dataset_streaming', requiere=('ruta_csv',))
+def _procesado_dataset_streaming(ctx: Contexto):
+    return BRPC.procesado_dataset_streaming(ctx.ruta_csv, os.path.join(ctx.directorio, 'procesado.csv'))
+
+
+# --- Binning y WoE/IV -------------------------------------------------------------------------
+
+@caso('agrupamiento_optimo_arbol', requiere=('df', 'features'))
+def _agrupamiento_optimo_arbol(ctx: Contexto):
+    return BRPC.agrupamiento_optimo(ctx.df, ctx.features[0], TARGET)
+
+
+@caso('agrupamiento_optimo_dp', requiere=('df', 'features'))
+def _agrupamiento_optimo_dp(ctx: Contexto):
+    return BRPC.agrupamiento_optimo(ctx.df, ctx.features[0], TARGET, metodo='dp')
+
+
+@caso('agrupamiento_multiple', requiere=('df', 'features'))
+def _agrupamiento_multiple(ctx: Contexto):
+    return BRPC.agrupamiento_multiple(ctx.df, ctx.features, TARGET, metodo='dp')
+
+
+@caso('agrupador_optimo', requiere=('df', 'features'))
+def _agrupador_optimo(ctx: Contexto):
+    agrupador = BRPC.AgrupadorOptimo(metodo='dp').fit(ctx.df, ctx.features, TARGET)
+    return agrupador.transform_codigos(ctx.df)
+
+
+@caso('woe_iv', requiere=('df', 'features'))
+def _woe_iv(ctx: Contexto):
+    binned = BRPC.agrupamiento_optimo(ctx.df, ctx.features[0], TARGET, metodo='dp', formato='categorico')
+    return BRPC.woe_iv(pd.DataFrame({'bin': binned, TARGET: ctx.df[TARGET]}), 'bin', TARGET)
+
+
+@caso('woe_iv_multiple', requiere=('codigos',))
+def _woe_iv_multiple(ctx: Contexto):
+    return BRPC.woe_iv_multiple(ctx.codigos, ctx.df[TARGET], ctx.features, ctx.agrupador.etiquetas_)
+
+
+@caso('estabilidad_por_particion', requiere=('agrupador',))
+def _estabilidad_por_particion(ctx: Contexto):
+    return BRPC.estabilidad_por_particion(ctx.df, ctx.features, TARGET, agrupador=ctx.agrupador)
+
+
+@caso('scorecard_fit', requiere=('agrupador',))
+def _scorecard_fit(ctx: Contexto):
+    return BRPC.Scorecard(ctx.agrupador).fit(ctx.df, ctx.features[:7], TARGET)
+
+
+@caso('scorecard_puntuar', requiere=('scorecard',))
+def _scorecard_puntuar(ctx: Contexto):
+    return ctx.scorecard.puntuar(ctx.df)
+
+
+@caso('monitor_deriva', requiere=('agrupador',))
+def _monitor_deriva(ctx: Contexto):
+    monitor = BRPC.MonitorDeriva(ctx.agrupador).fijar_referencia(ctx.df)
+    for inicio in range(0, len(ctx.df), 10_000):
+        monitor.actualizar(ctx.df.iloc[inicio:inicio + 10_000])
+    return monitor.informe()
+
+
+# --- Selección de variables -------------------------------------------------------------------
+
+@caso('select_mejor_k', requiere=('features_procesadas',))
+def _select_mejor_k(ctx: Contexto):
+    return BRPC.select_mejor_k(ctx.df_procesado[ctx.features_procesadas], ctx.df_procesado[TARGET])
+
+
+@caso('anova_f_streaming', requiere=('ruta_csv', 'features'))
+def _anova_f_streaming(ctx: Contexto):
+    return BRPC.anova_f_streaming(ctx.ruta_csv, TARGET, ctx.features).tabla()
+
+
+@caso('varclushi_analisis', requiere=('features_procesadas',), max_variables=1000)
+def _varclushi_analisis(ctx: Contexto):
+    return BRPC.varclushi_analisis(ctx.df_procesado[ctx.features_procesadas])
+
+
+@caso('seleccionar_representantes_clustervers', requiere=('rsquare',), max_variables=1000)
+def _seleccionar_representantes(ctx: Contexto):
+    return BRPC.seleccionar_representantes_clustervers(ctx.rsquare)
+
+
+@caso('pca_analisis', requiere=('df_procesado',))
+def _pca_analisis(ctx: Contexto):
+    return BRPC.pca_analisis(ctx.df_procesado, n_components=3)
+
+
+@caso('pca_analisis_aleatorio', requiere=('df_procesado',))
+def _pca_analisis_aleatorio(ctx: Contexto):
+    return BRPC.pca_analisis(ctx.df_procesado, n_components=3, metodo='aleatorio')
+
+
+@caso('huella')
+def _huella(ctx: Contexto):
+    return BRPC.huella(ctx.df)
+
+
+# --- Gráficos ---------------------------------------------------------------------------------
+
+@caso('plot_histograms')
+def _plot_histograms(ctx: Contexto):
+    fig = plots.plot_histograms(ctx.df)
+    fig.canvas.draw()
+    _cerrar_figuras()
+
+
+@caso('plot_boxplots')
+def _plot_boxplots(ctx: Contexto):
+    ax = plots.plot_boxplots(ctx.df)
+    ax.figure.canvas.draw()
+    _cerrar_figuras()
+
+
+@caso('plot_scatter', requiere=('df', 'features'))
+def _plot_scatter(ctx: Contexto):
+    ax = plots.plot_scatter(ctx.df, ctx.features[0], ctx.features[1], hue=TARGET)
+    ax.figure.canvas.draw()
+    _cerrar_figuras()
+
+
+@caso('plot_pca_2d_cufflinks', requiere=('df_pca',))
+def _plot_pca_2d(ctx: Contexto):
+    return plots.plot_pca_2d_cufflinks(ctx.df_pca).to_json()
+
+
+@caso('plot_pca_3d_cufflinks', requiere=('df_pca',))
+def _plot_pca_3d(ctx: Contexto):
+    return plots.plot_pca_3d_cufflinks(ctx.df_pca, max_puntos=50_000).to_json()
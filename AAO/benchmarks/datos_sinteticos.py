@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+from typing import Dict
+
+# Filas del dataset original (Bankruptcy Polish Companies)
+FILAS_ORIGINAL = 43_405
+
+# Proporción de nulos de las variables con más faltantes en el dataset original ('Analisis del
+# Dataset.txt'). Las variables con la misma proporción comparten las filas nulas, como en el original.
+NULOS_ORIGINAL: Dict[int, float] = {
+    37: 0.4374, 21: 0.1349, 27: 0.0637, 60: 0.0496, 45: 0.0495, 24: 0.0212,
+    54: 0.0187, 28: 0.0187, 64: 0.0187, 53: 0.0187, 41: 0.0174, 32: 0.0085,
+    52: 0.0069, 47: 0.0068, 46: 0.0031, 4: 0.0031, 33: 0.0031, 63: 0.0031,
+    12: 0.0031, 40: 0.0031
+}
+# El resto de ratios también tiene algún nulo (64 de 64 en el original)
+NULOS_RESTO = 0.0002
+
+
+def tasa_nulos(i: int) -> float:
+    """Proporción de nulos de la variable A{i}; a partir de A64 se repite el patrón."""
+    return NULOS_ORIGINAL.get((i - 1) % 64 + 1, NULOS_RESTO)
+
+
+def generar_dataset(n_filas: int = FILAS_ORIGINAL, n_variables: int = 64, tasa_positivos: float = 0.048,
+                    semilla: int = 0, dtype=np.float64, tam_bloque: int = 64) -> pd.DataFrame:
+    """
+    Genera un dataset sintético con el esquema del de quiebras de empresas polacas.
+
+    Columnas 'year' (1-5), 'A1'...'A{n_variables}' y 'class' (~`tasa_positivos` de unos). Los
+    ratios salen de un modelo de factores latentes (grupos de variables correlacionadas, para que
+    VarClus y las correlaciones tengan estructura), con un desplazamiento por clase en parte de
+    ellos (para que binning, WoE/IV y ANOVA tengan señal), colas pesadas mediante `sinh` y escalas
+    de varios órdenes de magnitud. Los nulos siguen las proporciones del dataset original.
+
+    Las variables se generan por bloques de `tam_bloque` columnas directamente en la matriz final,
+    así que la memoria de trabajo es la de un bloque.
+
+    Args:
+        n_filas (int): Número de filas.
+        n_variables (int): Número de ratios financieros.
+        tasa_positivos (float): Proporción de la clase 1 (quiebra).
+        semilla (int): Semilla del generador aleatorio.
+        dtype: Tipo de los ratios (float64 o float32).
+        tam_bloque (int): Variables generadas por bloque.
+
+    Returns:
+        pd.DataFrame: El dataset sintético.
+    """
+    rng = np.random.default_rng(semilla)
+    year = rng.integers(1, 6, size=n_filas)
+    clase = (rng.random(n_filas) < tasa_positivos).astype(np.int64)
+
+    n_factores = max(4, n_variables // 8)
+    factores = rng.standard_normal((n_filas, n_factores)).astype(dtype)
+    grupo = rng.integers(0, n_factores, size=n_variables)
+    carga = rng.uniform(0.3, 0.9, size=n_variables)
+    efecto_clase = np.where(rng.random(n_variables) < 0.5, rng.uniform(0.1, 0.8, size=n_variables), 0.0)
+    cola = rng.uniform(0.5, 2.0, size=n_variables)
+    escala = 10.0 ** rng.uniform(-1, 3, size=n_variables)
+
+    ratios = np.empty((n_filas, n_variables), dtype=dtype, order='F')
+    uniformes_nulos: Dict[float, np.ndarray] = {}
+    for inicio in range(0, n_variables, tam_bloque):
+        fin = min(inicio + tam_bloque, n_variables)
+        j = np.arange(inicio, fin)
+        ruido = rng.standard_normal((n_filas, fin - inicio)).astype(dtype)
+        base = carga[j] * factores[:, grupo[j]] + np.sqrt(1 - carga[j] ** 2) * ruido
+        base -= clase[:, None] * efecto_clase[j]
+        ratios[:, inicio:fin] = np.sinh(base * cola[j]) * escala[j]
+
+        for k in j:
+            tasa = tasa_nulos(k + 1)
+            if tasa not in uniformes_nulos:
+                uniformes_nulos[tasa] = rng.random(n_filas)
+            ratios[uniformes_nulos[tasa] < tasa, k] = np.nan
+
+    nombres = [f'A{i}' for i in range(1, n_variables + 1)]
+    df = pd.DataFrame(ratios, columns=nombres, copy=False)
+    df.insert(0, 'year', year)
+    df['class'] = clase
+    return df
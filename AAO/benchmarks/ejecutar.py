@@ -0,0 +1,227 @@
+import argparse
+import datetime
+import json
+import os
+import platform
+import sys
+import tempfile
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from BRPC.instrumentacion import rss_maximo
+
+from .casos import CASOS, Contexto, silencio
+from .datos_sinteticos import FILAS_ORIGINAL
+from .medicion import medir
+
+VERSION_RESULTADOS = 1
+
+# Escalas: (filas, variables). Por filas, x1/x10/x100 el dataset original; por variables, hasta 5.000
+ESCALAS: Dict[str, Tuple[int, int]] = {
+    'base': (FILAS_ORIGINAL, 64),
+    'filas_x10': (FILAS_ORIGINAL * 10, 64),
+    'filas_x100': (FILAS_ORIGINAL * 100, 64),
+    'variables_500': (FILAS_ORIGINAL, 500),
+    'variables_5000': (FILAS_ORIGINAL, 5_000)
+}
+
+# Métricas comparadas con la referencia y diferencia absoluta mínima para contar como regresión
+# (por debajo, el ruido de medida domina en los casos rápidos)
+METRICAS: Dict[str, float] = {'segundos_min': 0.05, 'pico_bytes': 2 ** 20}
+
+
+def _entorno() -> Dict[str, str]:
+    import sklearn
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'sklearn': sklearn.__version__,
+        'plataforma': platform.platform(),
+        'cpus': os.cpu_count()
+    }
+
+
+def ejecutar_benchmarks(escalas: Sequence[str] = ('base',), casos: Optional[Sequence[str]] = None,
+                        repeticiones: int = 3, memoria: bool = True, directorio: Optional[str] = None,
+                        semilla: int = 0, verbose: bool = True) -> Dict:
+    """
+    Ejecuta los casos de benchmark en las escalas indicadas.
+
+    Por cada escala se genera un dataset sintético (`generar_dataset`) y cada caso se mide con
+    `medir`, después de preparar fuera de la medición los datos que requiere. Si un caso falla
+    (p. ej. por falta de memoria en las escalas grandes) se registra el error y se sigue con el
+    siguiente.
+
+    Args:
+        escalas (Sequence[str]): Nombres de `ESCALAS`.
+        casos (Sequence[str], optional): Nombres de `CASOS`. Por defecto, todos.
+        repeticiones (int): Ejecuciones cronometradas por caso.
+        memoria (bool): Si se mide el pico de memoria con `tracemalloc`.
+        directorio (str, optional): Carpeta de trabajo (CSV y cachés). Por defecto, una temporal.
+        semilla (int): Semilla del generador.
+        verbose (bool): Si se imprime el progreso.
+
+    Returns:
+        Dict: Resultados serializables a JSON: 'version', 'fecha', 'entorno' y 'resultados'
+        (una entrada por escala y caso). El pico de memoria residente ('rss_max_bytes') es el de
+        todo el proceso, así que va en 'entorno' y no en cada caso.
+    """
+    casos = list(casos) if casos is not None else list(CASOS)
+    desconocidos = [c for c in casos if c not in CASOS] + [e for e in escalas if e not in ESCALAS]
+    if desconocidos:
+        raise ValueError(f"Casos o escalas desconocidos: {desconocidos}")
+
+    import matplotlib
+    matplotlib.use('Agg')  # los gráficos se dibujan sin pantalla
+
+    resultados = []
+    with tempfile.TemporaryDirectory(prefix='brpc_bench_') as temporal:
+        for escala in escalas:
+            n_filas, n_variables = ESCALAS[escala]
+            ctx = Contexto(n_filas, n_variables, os.path.join(directorio or temporal, escala), semilla)
+            for nombre in casos:
+                caso = CASOS[nombre]
+                fila = {'escala': escala, 'filas': n_filas, 'variables': n_variables, 'caso': nombre}
+                if caso.max_variables is not None and n_variables > caso.max_variables:
+                    fila['omitido'] = f'más de {caso.max_variables} variables'
+                else:
+                    try:
+                        with silencio():
+                            for atributo in caso.requiere:
+                                getattr(ctx, atributo)
+                            fila.update(medir(lambda: caso.funcion(ctx), repeticiones, memoria))
+                    except Exception as e:
+                        fila['error'] = f'{type(e).__name__}: {e}'
+                resultados.append(fila)
+                if verbose:
+                    print(_linea(fila), flush=True)
+            del ctx
+
+    return {
+        'version': VERSION_RESULTADOS,
+        'fecha': datetime.datetime.now().isoformat(timespec='seconds'),
+        'entorno': {**_entorno(), 'rss_max_bytes': rss_maximo()},
+        'resultados': resultados
+    }
+
+
+def _linea(fila: Dict) -> str:
+    prefijo = f"{fila['escala']:<15} {fila['caso']:<40}"
+    if 'error' in fila:
+        return f"{prefijo} ERROR {fila['error']}"
+    if 'omitido' in fila:
+        return f"{prefijo} omitido ({fila['omitido']})"
+    pico = f"{fila['pico_bytes'] / 2 ** 20:10.1f} MiB" if fila.get('pico_bytes') is not None else ''
+    return f"{prefijo} {fila['segundos_min']:10.3f} s {pico}"
+
+
+def guardar_resultados(resultados: Dict, ruta: str):
+    with open(ruta, 'w', encoding='utf-8') as f:
+        json.dump(resultados, f, indent=2, ensure_ascii=False)
+
+
+def cargar_resultados(ruta: str) -> Dict:
+    with open(ruta, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _estado(fila: Optional[Dict]) -> str:
+    """'ok', 'error', 'omitido' o 'ausente' (el caso no está en la ejecución)."""
+    if fila is None:
+        return 'ausente'
+    if 'error' in fila:
+        return 'error'
+    return 'omitido' if 'omitido' in fila else 'ok'
+
+
+def comparar_resultados(actual: Dict, referencia: Dict, tolerancia: float = 0.25) -> pd.DataFrame:
+    """
+    Compara dos ejecuciones de benchmark caso a caso.
+
+    Un caso que en la referencia terminaba bien y ahora falla, se omite o no se ha ejecutado
+    cuenta como regresión, con una fila de métrica 'estado'.
+
+    Args:
+        actual (Dict): Resultados de `ejecutar_benchmarks`.
+        referencia (Dict): Resultados de referencia (línea base guardada).
+        tolerancia (float): Aumento relativo a partir del cual una métrica cuenta como regresión
+            (0.25 = un 25% peor), siempre que la diferencia absoluta supere la de `METRICAS`.
+
+    Returns:
+        pd.DataFrame: Columnas 'Escala', 'Caso', 'Metrica', 'Referencia', 'Actual', 'Cambio'
+        (relativo) y 'Regresion', una fila por métrica presente en ambas ejecuciones y otra por
+        cada caso que ha dejado de terminar bien.
+    """
+    ejecutados = {(r['escala'], r['caso']): r for r in actual['resultados']}
+    filas: List[Dict] = []
+    for anterior in referencia['resultados']:
+        clave = (anterior['escala'], anterior['caso'])
+        r = ejecutados.get(clave)
+        estado, estado_base = _estado(r), _estado(anterior)
+        if estado_base != 'ok':
+            continue
+        if estado != 'ok':
+            filas.append({
+                'Escala': clave[0],
+                'Caso': clave[1],
+                'Metrica': 'estado',
+                'Referencia': estado_base,
+                'Actual': f'{estado}: {r[estado]}' if r is not None else estado,
+                'Cambio': np.nan,
+                'Regresion': True
+            })
+            continue
+        for metrica, minimo in METRICAS.items():
+            valor, valor_base = r.get(metrica), anterior.get(metrica)
+            if valor is None or valor_base is None:
+                continue
+            cambio = (valor - valor_base) / valor_base if valor_base else 0.0
+            filas.append({
+                'Escala': clave[0],
+                'Caso': clave[1],
+                'Metrica': metrica,
+                'Referencia': valor_base,
+                'Actual': valor,
+                'Cambio': cambio,
+                'Regresion': cambio > tolerancia and valor - valor_base > minimo
+            })
+    return pd.DataFrame(filas, columns=['Escala', 'Caso', 'Metrica', 'Referencia', 'Actual', 'Cambio', 'Regresion'])
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks',
+                                     description='Benchmarks de tiempo y memoria de BRPC con datos sintéticos.')
+    parser.add_argument('--escalas', nargs='+', default=['base'], choices=list(ESCALAS))
+    parser.add_argument('--casos', nargs='+', default=None, choices=list(CASOS))
+    parser.add_argument('--repeticiones', type=int, default=3)
+    parser.add_argument('--sin-memoria', action='store_true', help='No medir el pico de memoria.')
+    parser.add_argument('--salida', default='resultados_benchmark.json')
+    parser.add_argument('--referencia', help='JSON de una ejecución anterior con la que comparar.')
+    parser.add_argument('--tolerancia', type=float, default=0.25)
+    parser.add_argument('--directorio', help='Carpeta de trabajo (por defecto, una temporal).')
+    args = parser.parse_args(argv)
+
+    resultados = ejecutar_benchmarks(args.escalas, args.casos, args.repeticiones, not args.sin_memoria,
+                                     args.directorio)
+    guardar_resultados(resultados, args.salida)
+    print(f"Resultados guardados en {args.salida}")
+
+    if args.referencia:
+        referencia = cargar_resultados(args.referencia)
+        # Solo se exigen los casos y escalas pedidos en esta ejecución
+        referencia['resultados'] = [r for r in referencia['resultados'] if r['escala'] in args.escalas
+                                    and (args.casos is None or r['caso'] in args.casos)]
+        comparacion = comparar_resultados(resultados, referencia, args.tolerancia)
+        regresiones = comparacion[comparacion['Regresion']]
+        print(comparacion.to_string(index=False))
+        if not regresiones.empty:
+            print(f"{len(regresiones)} regresiones por encima del {args.tolerancia:.0%}")
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
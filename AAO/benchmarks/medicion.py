@@ -0,0 +1,47 @@
+import gc
+import statistics
+import time
+import tracemalloc
+from typing import Callable, Dict
+
+
+def medir(funcion: Callable[[], object], repeticiones: int = 3, memoria: bool = True) -> Dict[str, float]:
+    """
+    Mide el tiempo y la memoria de `funcion()`.
+
+    Primero se hace una ejecución con `tracemalloc` activo (que además sirve de calentamiento)
+    para obtener el pico de memoria asignada por Python y NumPy; después, `repeticiones`
+    ejecuciones sin trazar para el tiempo, de las que se guardan el mínimo y la mediana.
+
+    Args:
+        funcion (Callable): Función sin argumentos a medir.
+        repeticiones (int): Ejecuciones cronometradas.
+        memoria (bool): Si se hace la ejecución con `tracemalloc`.
+
+    Returns:
+        Dict[str, float]: 'segundos_min', 'segundos_mediana', 'repeticiones' y 'pico_bytes'
+        (pico de memoria trazada, None sin `memoria`).
+    """
+    pico = None
+    if memoria:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            funcion()
+            _, pico = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    tiempos = []
+    for _ in range(repeticiones):
+        gc.collect()
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - inicio)
+
+    return {
+        'segundos_min': min(tiempos) if tiempos else None,
+        'segundos_mediana': statistics.median(tiempos) if tiempos else None,
+        'repeticiones': repeticiones,
+        'pico_bytes': pico
+    }